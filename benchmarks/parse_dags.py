@@ -0,0 +1,86 @@
+"""
+Time how long the scheduler spends parsing every DAG file.
+
+Loads the dags folder into a DagBag --repeat times, the way the DAG file processor does, and
+reports the median parse time of every file plus the number of metadata database queries it
+ran while being parsed (top-level Variable.get, Pool lookups, ...), which should be zero.
+
+    python benchmarks/parse_dags.py [--dags-folder dags] [--repeat 5] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_once(dags_folder):
+    from airflow import settings
+    from airflow.models import DagBag
+    from sqlalchemy import event
+
+    queries = []
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    durations = {}
+    query_counts = {}
+    event.listen(settings.engine, 'before_cursor_execute', count_query)
+    try:
+        dagbag = DagBag(dag_folder=dags_folder, include_examples=False, collect_dags=False)
+        for file_name in sorted(os.listdir(dags_folder)):
+            if not file_name.endswith('.py'):
+                continue
+            file_path = os.path.join(dags_folder, file_name)
+            queries.clear()
+            started_at = time.perf_counter()
+            dagbag.process_file(file_path, only_if_updated=False)
+            durations[file_name] = time.perf_counter() - started_at
+            query_counts[file_name] = len(queries)
+    finally:
+        event.remove(settings.engine, 'before_cursor_execute', count_query)
+    return durations, query_counts, dagbag.import_errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dags-folder', default=os.path.join(ROOT, 'dags'))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='print one json document instead of a table')
+    args = parser.parse_args()
+
+    sys.path.insert(0, args.dags_folder)
+    runs = [parse_once(args.dags_folder) for _ in range(args.repeat)]
+    files = sorted(runs[0][0])
+    report = {
+        'files': [
+            {
+                'file': file_name,
+                'median_seconds': statistics.median(run[0][file_name] for run in runs),
+                'metadata_db_queries': runs[-1][1][file_name],
+            }
+            for file_name in files
+        ],
+        'import_errors': {os.path.basename(path): error for path, error in runs[-1][2].items()},
+    }
+    report['files'].sort(key=lambda row: row['median_seconds'], reverse=True)
+    report['total_median_seconds'] = sum(row['median_seconds'] for row in report['files'])
+    report['total_metadata_db_queries'] = sum(row['metadata_db_queries'] for row in report['files'])
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for row in report['files']:
+        print(f"{row['median_seconds'] * 1000:9.1f} ms  {row['metadata_db_queries']:3d} queries  {row['file']}")
+    print(f"{report['total_median_seconds'] * 1000:9.1f} ms  {report['total_metadata_db_queries']:3d} queries  "
+          f"total for {len(files)} files")
+    for file_name, error in report['import_errors'].items():
+        print(f'import error in {file_name}: {error.splitlines()[-1]}')
+
+
+if __name__ == '__main__':
+    main()
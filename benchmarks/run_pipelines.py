@@ -0,0 +1,357 @@
+"""
+End-to-end benchmark of the heavy DAGs against synthetic source data.
+
+For every --scale the source database is filled with synthetic_data.SOURCE_TABLES at that
+scale, then every benchmarked DAG is run --repeat times, each time against a fresh result
+database, by executing its tasks in dependency order in this process: PostgresOperators run
+their SQL, PythonOperators their callables, mapped tasks once per expanded argument, and XComs
+are passed in memory. postgres_read_replica and postgres_result_db point at the two benchmark
+databases through AIRFLOW_CONN_* environment variables, and the metadata database is a
+throwaway sqlite file, so nothing outside the benchmark server is touched.
+
+The report has the median, min and max wall time of every DAG and task, and the rows, bytes and
+peak memory the tasks recorded in pipeline_run_stats (see utils.instrumentation), per scale.
+
+    python benchmarks/run_pipelines.py [--server postgresql://postgres@localhost:5432]
+        [--scale 1 10 100] [--repeat 3] [--dag lecture_time_data_dag ...] [--output results.json]
+
+Without --server a local cluster is started with the initdb and pg_ctl found on PATH (or in
+--pg-bin) and removed afterwards.
+"""
+import argparse
+import itertools
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import synthetic_data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DATABASE = 'benchmark_source'
+RESULT_DATABASE = 'benchmark_result'
+
+# DAG file (without .py) -> synthetic result tables it reads besides its own.
+BENCHMARKS = {
+    'lecture_time_data_dag': [],
+    'lecture_course_user_reports_limit_offset_dag': synthetic_data.RESULT_TABLES,
+    'users_table_dag': [],
+    'ADL_assignment_question_user_mapping_DAG': [],
+}
+
+
+class LocalPostgres:
+    """A throwaway Postgres cluster in a temporary directory, for runs without --server."""
+
+    def __init__(self, port, bin_dir=None):
+        self.port = port
+        self.bin_dir = bin_dir
+        self.directory = None
+
+    def _binary(self, name):
+        return os.path.join(self.bin_dir, name) if self.bin_dir else name
+
+    def __enter__(self):
+        self.directory = tempfile.mkdtemp(prefix='benchmark_postgres_')
+        data_directory = os.path.join(self.directory, 'data')
+        subprocess.run(
+            [self._binary('initdb'), '-D', data_directory, '-U', 'postgres', '--auth=trust', '-E', 'UTF8'],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        subprocess.run(
+            [self._binary('pg_ctl'), '-D', data_directory, '-l', os.path.join(self.directory, 'postgres.log'),
+             '-o', f'-p {self.port} -c listen_addresses=localhost -k {self.directory}', '-w', 'start'],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        return f'postgresql://postgres@localhost:{self.port}'
+
+    def __exit__(self, *exc_info):
+        subprocess.run(
+            [self._binary('pg_ctl'), '-D', os.path.join(self.directory, 'data'), '-m', 'fast', '-w', 'stop'],
+            stdout=subprocess.DEVNULL,
+        )
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def database_uri(server, database):
+    return urlsplit(server)._replace(path=f'/{database}').geturl()
+
+
+def recreate_database(server, database):
+    import psycopg2
+
+    admin_conn = psycopg2.connect(database_uri(server, 'postgres'))
+    admin_conn.autocommit = True
+    admin_cursor = admin_conn.cursor()
+    admin_cursor.execute(f'DROP DATABASE IF EXISTS {database};')
+    admin_cursor.execute(f'CREATE DATABASE {database};')
+    admin_conn.close()
+
+
+def generate_tables(server, database, tables, scale):
+    import psycopg2
+
+    pg_conn = psycopg2.connect(database_uri(server, database))
+    try:
+        return synthetic_data.generate(pg_conn, tables, scale)
+    finally:
+        pg_conn.close()
+
+
+def prepare_airflow(server, max_shards, replica_pool_slots):
+    """Point the DAGs' connections at the benchmark databases and set up a throwaway metadata DB."""
+    airflow_home = tempfile.mkdtemp(prefix='benchmark_airflow_')
+    os.environ['AIRFLOW_HOME'] = airflow_home
+    os.environ['AIRFLOW__DATABASE__SQL_ALCHEMY_CONN'] = f"sqlite:///{os.path.join(airflow_home, 'airflow.db')}"
+    os.environ['AIRFLOW__CORE__LOAD_EXAMPLES'] = 'False'
+    os.environ['AIRFLOW_CONN_POSTGRES_READ_REPLICA'] = database_uri(server, SOURCE_DATABASE)
+    os.environ['AIRFLOW_CONN_POSTGRES_RESULT_DB'] = database_uri(server, RESULT_DATABASE)
+    os.environ['AIRFLOW_VAR_MAX_SHARDS_PER_DAG'] = str(max_shards)
+
+    from airflow.models import Pool
+    from airflow.utils.db import initdb
+    from utils.pools import REPLICA_POOL
+
+    initdb()
+    Pool.create_or_update_pool(REPLICA_POOL, slots=replica_pool_slots, description='benchmark')
+    return airflow_home
+
+
+class BenchmarkTaskInstance:
+    """The parts of a TaskInstance the DAGs' callables use, with XComs kept in memory."""
+
+    def __init__(self, dag_id, task_id, run_id, xcoms, map_index=-1):
+        self.dag_id = dag_id
+        self.task_id = task_id
+        self.run_id = run_id
+        self.map_index = map_index
+        self.try_number = 1
+        self._xcoms = xcoms
+
+    def xcom_push(self, key, value, **kwargs):
+        self._xcoms[(self.task_id, key, self.map_index)] = value
+
+    def xcom_pull(self, task_ids=None, key='return_value', **kwargs):
+        if isinstance(task_ids, (list, tuple)):
+            return [self.xcom_pull(task_id, key) for task_id in task_ids]
+        values = sorted(
+            (map_index, value) for (task_id, xcom_key, map_index), value in self._xcoms.items()
+            if task_id == task_ids and xcom_key == key
+        )
+        if not values:
+            return None
+        if values[0][0] == -1:
+            return values[0][1]
+        return [value for _, value in values]
+
+
+def task_context(dag, task, task_instance):
+    from airflow.utils.context import ConnectionAccessor, VariableAccessor
+
+    logical_date = datetime.now(timezone.utc)
+    return {
+        'dag': dag,
+        'task': task,
+        'ti': task_instance,
+        'task_instance': task_instance,
+        'run_id': task_instance.run_id,
+        'logical_date': logical_date,
+        'data_interval_start': logical_date,
+        'data_interval_end': logical_date,
+        'ds': logical_date.strftime('%Y-%m-%d'),
+        'ts': logical_date.isoformat(),
+        'params': {},
+        'var': {'value': VariableAccessor(deserialize_json=False), 'json': VariableAccessor(deserialize_json=True)},
+        'conn': ConnectionAccessor(),
+    }
+
+
+def execute(dag, task, run_id, xcoms, map_index=-1):
+    task_instance = BenchmarkTaskInstance(dag.dag_id, task.task_id, run_id, xcoms, map_index)
+    context = task_context(dag, task, task_instance)
+    task.render_template_fields(context)
+    return_value = task.execute(context)
+    if return_value is not None and task.do_xcom_push:
+        task_instance.xcom_push('return_value', return_value)
+
+
+def run_task(dag, task, run_id, xcoms):
+    """Execute task, or every expansion of a mapped task. Returns (wall seconds, number of executions)."""
+    from airflow.models.mappedoperator import MappedOperator
+    from airflow.models.xcom_arg import XComArg
+
+    started_at = time.perf_counter()
+    if isinstance(task, MappedOperator):
+        expand_kwargs = {}
+        for name, value in task.expand_input.value.items():
+            if isinstance(value, XComArg):
+                value = BenchmarkTaskInstance(dag.dag_id, task.task_id, run_id, xcoms).xcom_pull(
+                    value.operator.task_id, value.key)
+            expand_kwargs[name] = value or []
+        expansions = [dict(zip(expand_kwargs, values)) for values in itertools.product(*expand_kwargs.values())]
+        for map_index, mapped_kwargs in enumerate(expansions):
+            execute(dag, task.unmap(mapped_kwargs), run_id, xcoms, map_index)
+        executions = len(expansions)
+    else:
+        execute(dag, task, run_id, xcoms)
+        executions = 1
+    return time.perf_counter() - started_at, executions
+
+
+def load_dag(dag_file):
+    import importlib.util
+
+    from airflow import DAG
+
+    spec = importlib.util.spec_from_file_location(dag_file, os.path.join(ROOT, 'dags', f'{dag_file}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return next(value for value in vars(module).values() if isinstance(value, DAG))
+
+
+def run_dag(dag):
+    """Run every task of dag once, in dependency order. Returns the run id and per-task timings."""
+    run_id = f'benchmark__{uuid.uuid4().hex}'
+    xcoms = {}
+    tasks = []
+    for task in dag.topological_sort():
+        seconds, executions = run_task(dag, task, run_id, xcoms)
+        tasks.append({'task_id': task.task_id, 'seconds': seconds, 'executions': executions})
+    return run_id, tasks
+
+
+def recorded_stats(run_id):
+    from utils.connections import pg_connection
+    from utils.instrumentation import STATS_CONN_ID, STATS_TABLE, create_stats_table
+
+    with pg_connection(STATS_CONN_ID) as pg_conn:
+        pg_cursor = pg_conn.cursor()
+        create_stats_table(pg_cursor)
+        pg_cursor.execute(
+            f'select coalesce(sum(rows_read), 0), coalesce(sum(rows_written), 0), coalesce(sum(payload_bytes), 0), '
+            f'coalesce(max(peak_rss_bytes), 0) from {STATS_TABLE} where run_id = %s;',
+            (run_id,)
+        )
+        rows_read, rows_written, payload_bytes, peak_rss_bytes = pg_cursor.fetchone()
+        pg_cursor.close()
+    return {
+        'rows_read': int(rows_read),
+        'rows_written': int(rows_written),
+        'payload_bytes': int(payload_bytes),
+        'peak_rss_bytes': int(peak_rss_bytes),
+    }
+
+
+def benchmark_dag(server, dag_file, scale, repeat):
+    dag = load_dag(dag_file)
+    runs = []
+    for _ in range(repeat):
+        recreate_database(server, RESULT_DATABASE)
+        generate_tables(server, RESULT_DATABASE, BENCHMARKS[dag_file], scale)
+        started_at = time.perf_counter()
+        run_id, tasks = run_dag(dag)
+        seconds = time.perf_counter() - started_at
+        runs.append({'seconds': seconds, 'tasks': tasks, **recorded_stats(run_id)})
+
+    median_seconds = statistics.median(run['seconds'] for run in runs)
+    rows_written = runs[-1]['rows_written']
+    return {
+        'dag_id': dag.dag_id,
+        'dag_file': f'{dag_file}.py',
+        'scale': scale,
+        'runs': len(runs),
+        'median_seconds': median_seconds,
+        'min_seconds': min(run['seconds'] for run in runs),
+        'max_seconds': max(run['seconds'] for run in runs),
+        'rows_read': runs[-1]['rows_read'],
+        'rows_written': rows_written,
+        'rows_per_second': rows_written / median_seconds if median_seconds else None,
+        'payload_bytes': runs[-1]['payload_bytes'],
+        'peak_rss_bytes': max(run['peak_rss_bytes'] for run in runs),
+        'tasks': [
+            {
+                'task_id': task['task_id'],
+                'executions': task['executions'],
+                'median_seconds': statistics.median(run['tasks'][position]['seconds'] for run in runs),
+            }
+            for position, task in enumerate(runs[0]['tasks'])
+        ],
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(server, args):
+    prepare_airflow(server, args.max_shards, args.replica_pool_slots)
+    report = {
+        'commit': git_commit(),
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'scales': args.scale,
+        'repeat': args.repeat,
+        'source_rows': {},
+        'results': [],
+    }
+    for scale in args.scale:
+        recreate_database(server, SOURCE_DATABASE)
+        started_at = time.perf_counter()
+        report['source_rows'][str(scale)] = generate_tables(server, SOURCE_DATABASE, synthetic_data.SOURCE_TABLES, scale)
+        print(f'{scale}x source data generated in {time.perf_counter() - started_at:.1f}s', file=sys.stderr)
+        for dag_file in args.dag:
+            result = benchmark_dag(server, dag_file, scale, args.repeat)
+            print(f"{scale}x {dag_file}: {result['median_seconds']:.1f}s", file=sys.stderr)
+            report['results'].append(result)
+    return report
+
+
+def print_report(report):
+    for result in report['results']:
+        rows_per_second = result['rows_per_second'] or 0
+        print(f"{result['scale']:4d}x  {result['median_seconds']:9.2f}s  {result['rows_written']:10d} rows  "
+              f"{rows_per_second:10.0f} rows/s  {result['peak_rss_bytes'] / 2 ** 20:7.0f} MiB  {result['dag_file']}")
+        for task in result['tasks']:
+            executions = f" x{task['executions']}" if task['executions'] != 1 else ''
+            print(f"       {task['median_seconds']:9.2f}s  {task['task_id']}{executions}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', help='postgres server uri; a local cluster is started when omitted')
+    parser.add_argument('--pg-bin', help='directory of initdb and pg_ctl for the local cluster')
+    parser.add_argument('--port', type=int, default=54329, help='port of the local cluster')
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--dag', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--max-shards', type=int, default=8)
+    parser.add_argument('--replica-pool-slots', type=int, default=16)
+    parser.add_argument('--output', help='write the json report to this file instead of printing a table')
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.join(ROOT, 'dags'))
+    if args.server:
+        report = run_benchmarks(args.server, args)
+    else:
+        with LocalPostgres(args.port, args.pg_bin) as server:
+            report = run_benchmarks(server, args)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+        return
+    print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,605 @@
+"""
+Synthetic, scalable stand-ins for the source tables the benchmarked DAGs read.
+
+Every table is a (name, create statement, insert statement) triple. The inserts generate the
+rows inside Postgres with generate_series, so a 100x dataset is built without shipping rows
+from Python. Users and everything that fans out from them (course user mappings, lecture
+attendance, assignment submissions, feedback) grow linearly with the scale; courses, lectures
+per course and assignments per course stay fixed, so the output of every DAG grows linearly too.
+
+SOURCE_TABLES live in the database behind postgres_read_replica, RESULT_TABLES in the one
+behind postgres_result_db (the tables lecture_course_user_reports_limit_offset_dag reads).
+"""
+USERS_PER_SCALE = 2000
+COURSES = 20
+LECTURES_PER_COURSE = 30
+ASSIGNMENTS_PER_COURSE = 10
+QUESTIONS_PER_ASSIGNMENT = 3
+CITIES = 100
+STATES = 30
+DEGREES = 20
+FIELDS_OF_STUDY = 30
+
+# course_structure_id values every benchmarked query accepts.
+COURSE_STRUCTURES = '1,6,8,11,12,14,18,19,20,22,23,26'
+TOPIC_TEMPLATES = '102,103,119,334,336,338,339,340,341,342,344,410,208,209,367,447,489,544,555,577'
+
+
+def sizes(scale):
+    return {
+        'users': USERS_PER_SCALE * scale,
+        'courses': COURSES,
+        'lectures_per_course': LECTURES_PER_COURSE,
+        'assignments_per_course': ASSIGNMENTS_PER_COURSE,
+        'questions_per_assignment': QUESTIONS_PER_ASSIGNMENT,
+        'cities': CITIES,
+        'states': STATES,
+        'degrees': DEGREES,
+        'fields_of_study': FIELDS_OF_STUDY,
+        'course_structures': COURSE_STRUCTURES,
+        'topic_templates': TOPIC_TEMPLATES,
+    }
+
+
+SOURCE_TABLES = [
+    (
+        'auth_user',
+        '''CREATE TABLE auth_user (
+            id bigint PRIMARY KEY,
+            first_name text,
+            last_name text,
+            username text,
+            email text,
+            date_joined timestamp,
+            last_login timestamp
+        );''',
+        '''INSERT INTO auth_user
+        select g, 'First' || g, 'Last' || g, 'user' || g, 'user' || g || '@example.com',
+            timestamp '2022-01-01' + g * interval '1 minute',
+            timestamp '2023-10-01' + random() * interval '30 days'
+        from generate_series(1, {users}) g;''',
+    ),
+    (
+        'courses_course',
+        '''CREATE TABLE courses_course (
+            id bigint PRIMARY KEY,
+            title text,
+            start_timestamp timestamp,
+            end_timestamp timestamp,
+            course_type int,
+            course_structure_id int,
+            unit_type text
+        );''',
+        '''INSERT INTO courses_course
+        select g, 'Batch ' || g,
+            timestamp '2023-01-01' + g * interval '7 days',
+            timestamp '2024-06-01' + g * interval '7 days',
+            case when g % 4 = 0 then 6 else 1 end,
+            (array[{course_structures}])[1 + g % array_length(array[{course_structures}], 1)],
+            'LEARNING'
+        from generate_series(1, {courses}) g;''',
+    ),
+    (
+        # One learning mapping per user, plus a cancelled mapping to a second course for every
+        # tenth user so the deferred lead type is exercised.
+        'courses_courseusermapping',
+        '''CREATE TABLE courses_courseusermapping (
+            id bigint PRIMARY KEY,
+            user_id bigint,
+            course_id bigint,
+            status int
+        );''',
+        '''INSERT INTO courses_courseusermapping
+        select g, g, 1 + g % {courses}, (array[8,8,8,9,5,11,12,30])[1 + g % 8]
+        from generate_series(1, {users}) g
+        union all
+        select {users} + g, g, 1 + (g + 1) % {courses}, 11
+        from generate_series(1, {users}) g
+        where g % 10 = 0;''',
+    ),
+    (
+        'internationalization_state',
+        '''CREATE TABLE internationalization_state (id int PRIMARY KEY, name text);''',
+        '''INSERT INTO internationalization_state select g, 'State ' || g from generate_series(1, {states}) g;''',
+    ),
+    (
+        'internationalization_city',
+        '''CREATE TABLE internationalization_city (id int PRIMARY KEY, name text, state_id int);''',
+        '''INSERT INTO internationalization_city
+        select g, 'City ' || g, 1 + g % {states} from generate_series(1, {cities}) g;''',
+    ),
+    (
+        'users_userprofile',
+        '''CREATE TABLE users_userprofile (
+            user_id bigint PRIMARY KEY,
+            phone text,
+            gender int,
+            date_of_birth date,
+            city_id int,
+            utm_param_json jsonb
+        );''',
+        '''INSERT INTO users_userprofile
+        select g, '9' || lpad(g::text, 9, '0'), 1 + g % 3, date '1995-01-01' + g % 3650, 1 + g % {cities},
+            jsonb_build_object(
+                'utm_source', 'google',
+                'utm_medium', 'cpc',
+                'utm_campaign', 'campaign_' || g % 50,
+                'course_structure_slug', 'full-stack',
+                'marketing_url_structure_slug', 'full-stack-landing'
+            )
+        from generate_series(1, {users}) g;''',
+    ),
+    (
+        'users_extendeduserprofile',
+        '''CREATE TABLE users_extendeduserprofile (user_id bigint PRIMARY KEY, graduation_year int);''',
+        '''INSERT INTO users_extendeduserprofile select g, 2015 + g % 10 from generate_series(1, {users}) g;''',
+    ),
+    (
+        'users_userentrylog',
+        '''CREATE TABLE users_userentrylog (user_id bigint, utm_param_json jsonb);''',
+        '''INSERT INTO users_userentrylog
+        select g, jsonb_build_object('utm_hash', md5(g::text)) from generate_series(1, {users}) g;''',
+    ),
+    (
+        'education_degree',
+        '''CREATE TABLE education_degree (id int PRIMARY KEY, name text);''',
+        '''INSERT INTO education_degree select g, 'Degree ' || g from generate_series(1, {degrees}) g;''',
+    ),
+    (
+        'education_fieldofstudy',
+        '''CREATE TABLE education_fieldofstudy (id int PRIMARY KEY, name text);''',
+        '''INSERT INTO education_fieldofstudy
+        select g, 'Field of study ' || g from generate_series(1, {fields_of_study}) g;''',
+    ),
+    (
+        # Tenth, twelfth and bachelors records for everyone, masters for every fifth user.
+        'users_education',
+        '''CREATE TABLE users_education (
+            id bigserial PRIMARY KEY,
+            user_id bigint,
+            education_type int,
+            grade text,
+            end_date date,
+            degree_id int,
+            field_of_study_id int
+        );''',
+        '''INSERT INTO users_education (user_id, education_type, grade, end_date, degree_id, field_of_study_id)
+        select g, t, (60 + random() * 40)::int::text, (date '2010-06-01' + (2 * t + g % 5) * interval '1 year')::date,
+            1 + g % {degrees}, 1 + g % {fields_of_study}
+        from generate_series(1, {users}) g
+        cross join generate_series(1, 4) t
+        where t < 4 or g % 5 = 0;''',
+    ),
+    (
+        # Users 1..courses are the instructors, each of the course their own mapping points at.
+        'trainers_instructor',
+        '''CREATE TABLE trainers_instructor (id bigint PRIMARY KEY, user_id bigint);''',
+        '''INSERT INTO trainers_instructor select g, g from generate_series(1, {courses}) g;''',
+    ),
+    (
+        'trainers_courseinstructormapping',
+        '''CREATE TABLE trainers_courseinstructormapping (id bigint PRIMARY KEY, course_id bigint, instructor_id bigint);''',
+        '''INSERT INTO trainers_courseinstructormapping
+        select g, 1 + g % {courses}, g from generate_series(1, {courses}) g;''',
+    ),
+    (
+        'video_sessions_lecture',
+        '''CREATE TABLE video_sessions_lecture (id bigint PRIMARY KEY, course_id bigint, start_timestamp timestamp);''',
+        '''INSERT INTO video_sessions_lecture
+        select g, 1 + (g - 1) / {lectures_per_course},
+            timestamp '2023-09-01 19:00' + ((g - 1) % {lectures_per_course}) * interval '1 day'
+        from generate_series(1, {courses} * {lectures_per_course}) g;''',
+    ),
+    (
+        # Seven in ten course users attend a lecture of their course, in one to three sessions.
+        'video_sessions_lecturecourseuserreport',
+        '''CREATE TABLE video_sessions_lecturecourseuserreport (
+            id bigserial PRIMARY KEY,
+            lecture_id bigint,
+            course_user_mapping_id bigint,
+            join_time timestamp,
+            leave_time timestamp,
+            duration int,
+            report_type int
+        );''',
+        '''INSERT INTO video_sessions_lecturecourseuserreport
+            (lecture_id, course_user_mapping_id, join_time, leave_time, duration, report_type)
+        select lecture_id, course_user_mapping_id, join_time, join_time + minutes * interval '1 minute', minutes * 60, 4
+        from (
+            select l.id as lecture_id, cum.id as course_user_mapping_id,
+                l.start_timestamp + (s * 25 + random() * 20) * interval '1 minute' as join_time,
+                (5 + random() * 40)::int as minutes
+            from video_sessions_lecture l
+            join courses_courseusermapping cum on cum.course_id = l.course_id
+            cross join generate_series(1, 1 + ((l.id + cum.id) % 3)::int) s
+            where (l.id * 7 + cum.id * 13) % 10 < 7
+        ) sessions;''',
+    ),
+    (
+        # Every tenth assignment of a course is a project (assignment_sub_type 6).
+        'assignments_assignment',
+        '''CREATE TABLE assignments_assignment (id bigint PRIMARY KEY, course_id bigint, assignment_sub_type int);''',
+        '''INSERT INTO assignments_assignment
+        select g, 1 + (g - 1) / {assignments_per_course}, case when g % 10 = 0 then 6 else 1 end
+        from generate_series(1, {courses} * {assignments_per_course}) g;''',
+    ),
+    (
+        'assignments_assignmentcourseusermapping',
+        '''CREATE TABLE assignments_assignmentcourseusermapping (
+            id bigserial PRIMARY KEY,
+            course_user_mapping_id bigint,
+            assignment_id bigint,
+            started_at timestamp,
+            completed_at timestamp,
+            cheated_marked_at timestamp,
+            cheated boolean,
+            marks int,
+            end_timestamp timestamp
+        );''',
+        '''INSERT INTO assignments_assignmentcourseusermapping
+            (course_user_mapping_id, assignment_id, started_at, completed_at, cheated_marked_at, cheated, marks, end_timestamp)
+        select course_user_mapping_id, assignment_id, started_at, started_at + random() * interval '3 days',
+            case when course_user_mapping_id % 50 = 0 then started_at + interval '4 days' end,
+            course_user_mapping_id % 50 = 0, (random() * 100)::int, started_at + interval '7 days'
+        from (
+            select cum.id as course_user_mapping_id, a.id as assignment_id,
+                timestamp '2023-09-01' + a.id * interval '1 day' as started_at
+            from courses_courseusermapping cum
+            join assignments_assignment a on a.course_id = cum.course_id
+            where (cum.id * 3 + a.id) % 5 < 4
+        ) pairs;''',
+    ),
+    (
+        # The playground of a question is a coding, frontend, game or project playground or a
+        # subjective answer, by question id; its playground id is the question mapping id.
+        'assignments_assignmentcourseuserquestionmapping',
+        '''CREATE TABLE assignments_assignmentcourseuserquestionmapping (
+            id bigint PRIMARY KEY,
+            assignment_course_user_mapping_id bigint,
+            assignment_question_id bigint,
+            started_at timestamp,
+            completed_at timestamp,
+            completed boolean,
+            all_test_case_passed boolean,
+            coding_playground_id bigint,
+            front_end_playground_id bigint,
+            game_playground_id bigint,
+            project_playground_id bigint,
+            subjective_id bigint,
+            hash text,
+            latest_assignment_question_hint_mapping_id bigint,
+            late_submission boolean,
+            max_test_case_passed int,
+            max_test_case_passed_during_contest int
+        );''',
+        '''INSERT INTO assignments_assignmentcourseuserquestionmapping
+        select id, acum_id, question_id, started_at, started_at + interval '2 hours', id % 3 > 0, id % 4 = 0,
+            case when id % 5 = 0 then id end,
+            case when id % 5 = 1 then id end,
+            case when id % 5 = 2 then id end,
+            case when id % 5 = 3 then id end,
+            case when id % 5 = 4 then id end,
+            md5(id::text), null, id % 7 = 0, id % 10, id % 10
+        from (
+            select (acum.id - 1) * {questions_per_assignment} + q as id, acum.id as acum_id,
+                acum.assignment_id * 100 + q as question_id, acum.started_at
+            from assignments_assignmentcourseusermapping acum
+            cross join generate_series(1, {questions_per_assignment}) q
+        ) questions;''',
+    ),
+    (
+        'playgrounds_codingplayground',
+        '''CREATE TABLE playgrounds_codingplayground (id bigint PRIMARY KEY, hash text);''',
+        '''INSERT INTO playgrounds_codingplayground
+        select coding_playground_id, md5('coding' || coding_playground_id)
+        from assignments_assignmentcourseuserquestionmapping where coding_playground_id is not null;''',
+    ),
+    (
+        'playgrounds_frontendplayground',
+        '''CREATE TABLE playgrounds_frontendplayground (id bigint PRIMARY KEY, hash text);''',
+        '''INSERT INTO playgrounds_frontendplayground
+        select front_end_playground_id, md5('frontend' || front_end_playground_id)
+        from assignments_assignmentcourseuserquestionmapping where front_end_playground_id is not null;''',
+    ),
+    (
+        'playgrounds_gameplayground',
+        '''CREATE TABLE playgrounds_gameplayground (id bigint PRIMARY KEY, hash text);''',
+        '''INSERT INTO playgrounds_gameplayground
+        select game_playground_id, md5('game' || game_playground_id)
+        from assignments_assignmentcourseuserquestionmapping where game_playground_id is not null;''',
+    ),
+    (
+        'playgrounds_projectplayground',
+        '''CREATE TABLE playgrounds_projectplayground (id bigint PRIMARY KEY, hash text);''',
+        '''INSERT INTO playgrounds_projectplayground
+        select project_playground_id, md5('project' || project_playground_id)
+        from assignments_assignmentcourseuserquestionmapping where project_playground_id is not null;''',
+    ),
+    (
+        'playgrounds_codingplaygroundsubmission',
+        '''CREATE TABLE playgrounds_codingplaygroundsubmission (
+            id bigserial PRIMARY KEY,
+            coding_playground_id bigint,
+            current_status int
+        );''',
+        '''INSERT INTO playgrounds_codingplaygroundsubmission (coding_playground_id, current_status)
+        select p.id, (p.id + s) % 4 from playgrounds_codingplayground p
+        cross join generate_series(1, 1 + (p.id % 3)::int) s;''',
+    ),
+    (
+        'playgrounds_frontendplaygroundsubmission',
+        '''CREATE TABLE playgrounds_frontendplaygroundsubmission (
+            id bigserial PRIMARY KEY,
+            front_end_playground_id bigint,
+            build_status int
+        );''',
+        '''INSERT INTO playgrounds_frontendplaygroundsubmission (front_end_playground_id, build_status)
+        select p.id, (p.id + s) % 4 from playgrounds_frontendplayground p
+        cross join generate_series(1, 1 + (p.id % 3)::int) s;''',
+    ),
+    (
+        'playgrounds_gameplaygroundsubmission',
+        '''CREATE TABLE playgrounds_gameplaygroundsubmission (id bigserial PRIMARY KEY, game_playground_id bigint);''',
+        '''INSERT INTO playgrounds_gameplaygroundsubmission (game_playground_id)
+        select p.id from playgrounds_gameplayground p cross join generate_series(1, 1 + (p.id % 3)::int) s;''',
+    ),
+    (
+        'playgrounds_projectplaygroundsubmission',
+        '''CREATE TABLE playgrounds_projectplaygroundsubmission (id bigserial PRIMARY KEY, project_playground_id bigint);''',
+        '''INSERT INTO playgrounds_projectplaygroundsubmission (project_playground_id)
+        select p.id from playgrounds_projectplayground p cross join generate_series(1, 1 + (p.id % 3)::int) s;''',
+    ),
+    (
+        'playgrounds_playgroundplagiarismreport',
+        '''CREATE TABLE playgrounds_playgroundplagiarismreport (
+            id bigserial PRIMARY KEY,
+            object_id bigint,
+            content_type_id int,
+            plagiarism_report jsonb
+        );''',
+        '''INSERT INTO playgrounds_playgroundplagiarismreport (object_id, content_type_id, plagiarism_report)
+        select object_id, content_type_id, jsonb_build_object(
+            'plagiarism_submission_id', object_id + 1,
+            'plagiarism_score', round(random()::numeric, 2),
+            'solution_length', 100 + object_id % 400
+        )
+        from (
+            select id as object_id, 70 as content_type_id from playgrounds_codingplaygroundsubmission
+            union all select id, 160 from playgrounds_frontendplaygroundsubmission
+            union all select id, 165 from playgrounds_projectplaygroundsubmission
+            union all select id, 179 from playgrounds_gameplaygroundsubmission
+        ) submissions;''',
+    ),
+    (
+        'feedback_feedbackanswer',
+        '''CREATE TABLE feedback_feedbackanswer (id bigint PRIMARY KEY, text text);''',
+        '''INSERT INTO feedback_feedbackanswer select g, g::text from generate_series(1, 5) g;''',
+    ),
+    (
+        # One project review form per project playground.
+        'feedback_feedbackformusermapping',
+        '''CREATE TABLE feedback_feedbackformusermapping (
+            id bigint PRIMARY KEY,
+            entity_content_type_id int,
+            entity_object_id bigint,
+            feedback_form_id int
+        );''',
+        '''INSERT INTO feedback_feedbackformusermapping
+        select id, 81, id, case when id % 2 = 0 then 4458 else 4383 end from playgrounds_projectplayground;''',
+    ),
+    (
+        # A rating question (answered through the m2m table) and a free text question per form.
+        'feedback_feedbackformuserquestionanswermapping',
+        '''CREATE TABLE feedback_feedbackformuserquestionanswermapping (
+            id bigint PRIMARY KEY,
+            feedback_form_user_mapping_id bigint,
+            other_answer text
+        );''',
+        '''INSERT INTO feedback_feedbackformuserquestionanswermapping
+        select id * 2 + k, id, case when k = 1 then 'Reviewed submission ' || id end
+        from feedback_feedbackformusermapping cross join generate_series(0, 1) k;''',
+    ),
+    (
+        'feedback_feedbackformuserquestionanswerm2m',
+        '''CREATE TABLE feedback_feedbackformuserquestionanswerm2m (
+            id bigserial PRIMARY KEY,
+            feedback_form_user_question_answer_mapping_id bigint,
+            feedback_answer_id bigint
+        );''',
+        '''INSERT INTO feedback_feedbackformuserquestionanswerm2m
+            (feedback_form_user_question_answer_mapping_id, feedback_answer_id)
+        select id, 1 + id % 5 from feedback_feedbackformuserquestionanswermapping where other_answer is null;''',
+    ),
+]
+
+RESULT_TABLES = [
+    (
+        'courses',
+        '''CREATE TABLE courses (
+            course_id bigint PRIMARY KEY,
+            course_name text,
+            course_structure_id int,
+            course_structure_class text
+        );''',
+        '''INSERT INTO courses
+        select g, 'Batch ' || g,
+            (array[{course_structures}])[1 + g % array_length(array[{course_structures}], 1)],
+            case when g % 2 = 0 then 'PAY_AFTER_PLACEMENT' else 'UPFRONT' end
+        from generate_series(1, {courses}) g;''',
+    ),
+    (
+        'wow_active_batches',
+        '''CREATE TABLE wow_active_batches (lu_course_id bigint);''',
+        '''INSERT INTO wow_active_batches select g from generate_series(1, {courses}) g;''',
+    ),
+    (
+        'course_user_mapping',
+        '''CREATE TABLE course_user_mapping (
+            course_user_mapping_id bigint PRIMARY KEY,
+            user_id bigint,
+            course_id bigint,
+            status int,
+            label_id bigint,
+            user_placement_status text,
+            admin_course_id int,
+            admin_unit_name text
+        );''',
+        '''INSERT INTO course_user_mapping
+        select g, g, 1 + g % {courses}, (array[8,8,8,9,5,11,12,30])[1 + g % 8],
+            case when g % 25 = 0 then g % 7 end,
+            case when g % 9 = 0 then 'Placed' else 'Active' end,
+            1 + g % {courses}, 'Unit ' || (1 + g % 4)
+        from generate_series(1, {users}) g;''',
+    ),
+    (
+        'users_info',
+        '''CREATE TABLE users_info (user_id bigint PRIMARY KEY, first_name text, last_name text, lead_type text);''',
+        '''INSERT INTO users_info
+        select g, 'First' || g, 'Last' || g, case when g % 10 = 0 then 'Deferred' else 'Fresh' end
+        from generate_series(1, {users}) g;''',
+    ),
+    (
+        'course_user_category_mapping',
+        '''CREATE TABLE course_user_category_mapping (user_id bigint, course_id bigint, student_category text);''',
+        '''INSERT INTO course_user_category_mapping
+        select g, 1 + g % {courses}, (array['A','B','C'])[1 + g % 3] from generate_series(1, {users}) g;''',
+    ),
+    (
+        'user_activity_status_mapping',
+        '''CREATE TABLE user_activity_status_mapping (
+            user_id bigint PRIMARY KEY,
+            activity_status_7_days text,
+            activity_status_14_days text,
+            activity_status_30_days text
+        );''',
+        '''INSERT INTO user_activity_status_mapping
+        select g,
+            case when g % 3 = 0 then 'Inactive' else 'Active' end,
+            case when g % 5 = 0 then 'Inactive' else 'Active' end,
+            case when g % 7 = 0 then 'Inactive' else 'Active' end
+        from generate_series(1, {users}) g;''',
+    ),
+    (
+        'lectures',
+        '''CREATE TABLE lectures (
+            lecture_id bigint PRIMARY KEY,
+            course_id bigint,
+            lecture_title text,
+            lecture_type text,
+            mandatory boolean,
+            start_timestamp timestamp,
+            child_video_session boolean
+        );''',
+        '''INSERT INTO lectures
+        select g, 1 + (g - 1) / {lectures_per_course}, 'Lecture ' || g,
+            case when g % 6 = 0 then 'Contest' else 'Lecture' end, g % 6 <> 0,
+            timestamp '2023-09-01 19:00' + ((g - 1) % {lectures_per_course}) * interval '1 day', g % 15 = 0
+        from generate_series(1, {courses} * {lectures_per_course}) g;''',
+    ),
+    (
+        'topics',
+        '''CREATE TABLE topics (topic_id bigint PRIMARY KEY, topic_template_id int, template_name text);''',
+        '''INSERT INTO topics
+        select g, (array[{topic_templates}])[g], 'Template ' || (array[{topic_templates}])[g]
+        from generate_series(1, array_length(array[{topic_templates}], 1)) g;''',
+    ),
+    (
+        'lecture_topic_mapping',
+        '''CREATE TABLE lecture_topic_mapping (lecture_id bigint, topic_id bigint, completed boolean);''',
+        '''INSERT INTO lecture_topic_mapping
+        select lecture_id, 1 + lecture_id % array_length(array[{topic_templates}], 1), lecture_id % 10 <> 0
+        from lectures;''',
+    ),
+    (
+        # Mirrors video_sessions_lecturecourseuserreport after lecture_time_dag has processed it;
+        # users 1..courses are the instructors, as in the source tables.
+        'lecture_engagement_time',
+        '''CREATE TABLE lecture_engagement_time (
+            id serial not null PRIMARY KEY,
+            lecture_id bigint,
+            course_user_mapping_id bigint,
+            join_time timestamp,
+            leave_time timestamp,
+            user_type varchar(32),
+            overlapping_time_seconds real,
+            overlapping_time_minutes real
+        );''',
+        '''INSERT INTO lecture_engagement_time
+            (lecture_id, course_user_mapping_id, join_time, leave_time, user_type,
+             overlapping_time_seconds, overlapping_time_minutes)
+        select lecture_id, course_user_mapping_id, join_time, join_time + minutes * interval '1 minute',
+            case when course_user_mapping_id <= {courses} then 'Instructor' else 'User' end,
+            minutes * 60 * 0.9, minutes * 0.9
+        from (
+            select l.lecture_id, cum.course_user_mapping_id,
+                l.start_timestamp + (s * 25 + random() * 20) * interval '1 minute' as join_time,
+                (5 + random() * 40)::int as minutes
+            from lectures l
+            join course_user_mapping cum on cum.course_id = l.course_id
+            cross join generate_series(1, 1 + ((l.lecture_id + cum.course_user_mapping_id) % 3)::int) s
+            where (l.lecture_id * 7 + cum.course_user_mapping_id * 13) % 10 < 7
+        ) sessions;''',
+    ),
+    (
+        'recorded_lectures_course_user_reports',
+        '''CREATE TABLE recorded_lectures_course_user_reports (
+            id bigserial PRIMARY KEY,
+            lecture_id bigint,
+            course_user_mapping_id bigint
+        );''',
+        '''INSERT INTO recorded_lectures_course_user_reports (lecture_id, course_user_mapping_id)
+        select l.lecture_id, cum.course_user_mapping_id
+        from lectures l
+        join course_user_mapping cum on cum.course_id = l.course_id
+        where (l.lecture_id * 7 + cum.course_user_mapping_id * 13) % 10 >= 8;''',
+    ),
+    (
+        # A lecture rating (form 4377, question 348) and understanding answer (question 331)
+        # from three in ten attendees.
+        'feedback_form_all_responses_new',
+        '''CREATE TABLE feedback_form_all_responses_new (
+            id bigserial PRIMARY KEY,
+            user_id bigint,
+            feedback_form_id int,
+            feedback_question_id int,
+            feedback_answer_id int,
+            feedback_answer text,
+            entity_object_id bigint
+        );''',
+        '''INSERT INTO feedback_form_all_responses_new
+            (user_id, feedback_form_id, feedback_question_id, feedback_answer_id, feedback_answer, entity_object_id)
+        select cum.user_id, 4377, 348, null,
+            (array['Awesome','Good','Average','Poor','Very Poor'])[1 + (l.lecture_id + cum.user_id) % 5], l.lecture_id
+        from lectures l
+        join course_user_mapping cum on cum.course_id = l.course_id
+        where (l.lecture_id + cum.course_user_mapping_id) % 10 < 3
+        union all
+        select cum.user_id, 4377, 331, 179 + (l.lecture_id + cum.user_id) % 3,
+            (array['Yes','Somewhat','No'])[1 + (l.lecture_id + cum.user_id) % 3], l.lecture_id
+        from lectures l
+        join course_user_mapping cum on cum.course_id = l.course_id
+        where (l.lecture_id + cum.course_user_mapping_id) % 10 < 3;''',
+    ),
+]
+
+
+def generate(pg_conn, tables, scale, seed=0.42):
+    """
+    Drop, create and fill tables at scale in the database of pg_conn, then analyze them.
+
+    random() is seeded first, so the same scale always yields the same rows. Returns the number
+    of rows generated per table.
+    """
+    parameters = sizes(scale)
+    row_counts = {}
+    pg_cursor = pg_conn.cursor()
+    pg_cursor.execute(f'select setseed({float(seed)});')
+    for table, create_statement, insert_statement in tables:
+        pg_cursor.execute(f'DROP TABLE IF EXISTS {table} CASCADE;')
+        pg_cursor.execute(create_statement)
+        pg_cursor.execute(insert_statement.format(**parameters))
+        row_counts[table] = pg_cursor.rowcount
+        pg_cursor.execute(f'ANALYZE {table};')
+    pg_conn.commit()
+    pg_cursor.close()
+    return row_counts
@@ -12,9 +12,6 @@ default_args = {
     'start_date': datetime(2024, 3, 18),
 }
 
-SLACK_CHANNEL = Variable.get("CONTENT_EYE_SLACK_CHANNEL", default_var="#social-media-eye")
-
-
 def send_to_slack(message, channel, icon_url=None, bot_name=None):
     token = Variable.get("NEWTON_SCHOOL_HQ_SLACK_BOT_TOKEN")
     if not token:
@@ -53,9 +50,7 @@ def get_posts(instagram_username):
     if response and response.status_code != 200:
         return [], None, "Failed to fetch data from Instagram. Please check the username."
 
-    print("Response", response, response.text)
     data = response.json().get('data')
-    print("Data", data)
     if not data:
         return [], None, "Failed to fetch data from Instagram. Please check the username."
     user = data.get('user')
@@ -103,7 +98,6 @@ def extract_recent_posts(**kwargs):
             deserialize_json=True,
             default_var=[]
     )
-    print(instagram_pages_configuration)
     slack_messages = []
     for instagram_page_configuration in instagram_pages_configuration:
         page_username = instagram_page_configuration['username']
@@ -123,6 +117,7 @@ def extract_recent_posts(**kwargs):
 def post_on_slack(**kwargs):
     ti = kwargs['ti']
     slack_messages = ti.xcom_pull(task_ids='extract_instagram_data')
+    slack_channel = Variable.get("CONTENT_EYE_SLACK_CHANNEL", default_var="#social-media-eye")
     for slack_message in slack_messages:
         message = f"*{slack_message['bot_name']}* has a new post on Instagram\n" \
                     f"{slack_message['text']} \n" \
@@ -130,7 +125,7 @@ def post_on_slack(**kwargs):
                   f"[Display]({slack_message['display_url']})"
         send_to_slack(
                 message,
-                SLACK_CHANNEL,
+                slack_channel,
                 slack_message['icon_url'],
                 slack_message['bot_name']
         )
@@ -1,8 +1,10 @@
 from airflow import DAG
-from airflow.operators.python import PythonOperator
 from airflow.providers.postgres.operators.postgres import PostgresOperator
-from airflow.providers.postgres.hooks.postgres import PostgresHook
 from datetime import datetime
+from utils.datasets import result_table
+from utils.indexes import index_migrations
+from utils.loader import fingerprint_column_statement
+from utils.streaming import StreamingExtractOperator
 
 default_args = {
     'owner': 'airflow',
@@ -11,110 +13,6 @@ default_args = {
 }
 
 
-def extract_data_to_nested(**kwargs):
-    def clean_input(data_type, data_value):
-        if data_type == 'string':
-            return 'null' if not data_value else f'\"{data_value}\"'
-        elif data_type == 'datetime':
-            return 'null' if not data_value else f'CAST(\'{data_value}\' As TIMESTAMP)'
-        else:
-            return data_value
-
-    pg_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    pg_conn = pg_hook.get_conn()
-    pg_cursor = pg_conn.cursor()
-    ti = kwargs['ti']
-    transform_data_output = ti.xcom_pull(task_ids='transform_data')
-    for transform_row in transform_data_output:
-        pg_cursor.execute(
-            'INSERT INTO lsq_leads_x_activities (table_unique_key,prospect_id,activity_id,email_address,lead_created_on,'
-            'event,modified_on,prospect_stage,lead_owner,lead_sub_status,lead_last_call_status,'
-            'lead_last_call_sub_status,lead_last_call_connection_status,'
-            'mid_funnel_count,mid_funnel_buckets,'
-            'reactivation_bucket,reactivation_date,source_intended_course,intended_course,created_by_name,event_name,'
-            'notable_event_description,previous_stage,current_stage,call_type,caller,duration,call_notes,'
-            'previous_owner,current_owner,has_attachments,mx_custom_1,mx_custom_2,mx_custom_status,'
-            'mx_custom_3,mx_custom_4,mx_custom_5,mx_custom_6,mx_custom_7,mx_custom_8,mx_custom_9,'
-            'mx_custom_10,mx_custom_11,mx_custom_12,mx_custom_13,mx_custom_14,mx_custom_15,'
-            'mx_custom_16,mx_custom_17,mx_priority_status,mx_rfd_date,'
-            'mx_total_fees, mx_total_revenue, mx_doc_approved, mx_doc_collected, mx_cibil_check,mx_bucket)'
-            'VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,'
-            '%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)'
-            'on conflict (table_unique_key) do update set prospect_stage=EXCLUDED.prospect_stage,'
-            'lead_owner = EXCLUDED.lead_owner,'
-            'lead_sub_status=EXCLUDED.lead_sub_status,lead_last_call_status=EXCLUDED.lead_last_call_status,'
-            'lead_last_call_sub_status=EXCLUDED.lead_last_call_sub_status,'
-            'lead_last_call_connection_status=EXCLUDED.lead_last_call_connection_status,'
-            'mx_priority_status = EXCLUDED.mx_priority_status,'
-            'mx_rfd_date=EXCLUDED.mx_rfd_date, mx_total_fees=EXCLUDED.mx_total_fees, '
-            'mx_total_revenue=EXCLUDED.mx_total_revenue,'
-            'mx_doc_approved = EXCLUDED.mx_doc_approved,'
-            'mx_doc_collected=EXCLUDED.mx_doc_collected,'
-            'mx_cibil_check=EXCLUDED.mx_cibil_check,'
-            'mx_bucket=EXCLUDED.mx_bucket;',
-            (
-                transform_row[0],
-                transform_row[1],
-                transform_row[2],
-                transform_row[3],
-                transform_row[4],
-                transform_row[5],
-                transform_row[6],
-                transform_row[7],
-                transform_row[8],
-                transform_row[9],
-                transform_row[10],
-                transform_row[11],
-                transform_row[12],
-                transform_row[13],
-                transform_row[14],
-                transform_row[15],
-                transform_row[16],
-                transform_row[17],
-                transform_row[18],
-                transform_row[19],
-                transform_row[20],
-                transform_row[21],
-                transform_row[22],
-                transform_row[23],
-                transform_row[24],
-                transform_row[25],
-                transform_row[26],
-                transform_row[27],
-                transform_row[28],
-                transform_row[29],
-                transform_row[30],
-                transform_row[31],
-                transform_row[32],
-                transform_row[33],
-                transform_row[34],
-                transform_row[35],
-                transform_row[36],
-                transform_row[37],
-                transform_row[38],
-                transform_row[39],
-                transform_row[40],
-                transform_row[41],
-                transform_row[42],
-                transform_row[43],
-                transform_row[44],
-                transform_row[45],
-                transform_row[46],
-                transform_row[47],
-                transform_row[48],
-                transform_row[49],
-                transform_row[50],
-                transform_row[51],
-                transform_row[52],
-                transform_row[53],
-                transform_row[54],
-                transform_row[55],
-                transform_row[56],
-            )
-        )
-    pg_conn.commit()
-
-
 dag = DAG(
     'LSQ_Leads_and_activities',
     default_args=default_args,
@@ -126,7 +24,8 @@ dag = DAG(
 create_table = PostgresOperator(
     task_id='create_table',
     postgres_conn_id='postgres_result_db',
-    sql='''CREATE TABLE IF NOT EXISTS lsq_leads_x_activities (
+    autocommit=True,
+    sql=['''CREATE TABLE IF NOT EXISTS lsq_leads_x_activities (
             id serial,
             table_unique_key varchar(512) not null PRIMARY KEY,
             prospect_id varchar(512),
@@ -186,13 +85,92 @@ create_table = PostgresOperator(
             mx_cibil_check varchar(512),
             mx_bucket varchar(512)
         );
-    ''',
+    ''', fingerprint_column_statement('lsq_leads_x_activities'), *index_migrations('lsq_leads_x_activities')],
     dag=dag
 )
 
-transform_data = PostgresOperator(
-    task_id='transform_data',
-    postgres_conn_id='postgres_lsq_leads',
+extract_and_load_data = StreamingExtractOperator(
+    task_id='extract_and_load_data',
+    source_conn_id='postgres_lsq_leads',
+    table='lsq_leads_x_activities',
+    columns=[
+        'table_unique_key',
+        'prospect_id',
+        'activity_id',
+        'email_address',
+        'lead_created_on',
+        'event',
+        'modified_on',
+        'prospect_stage',
+        'lead_owner',
+        'lead_sub_status',
+        'lead_last_call_status',
+        'lead_last_call_sub_status',
+        'lead_last_call_connection_status',
+        'mid_funnel_count',
+        'mid_funnel_buckets',
+        'reactivation_bucket',
+        'reactivation_date',
+        'source_intended_course',
+        'intended_course',
+        'created_by_name',
+        'event_name',
+        'notable_event_description',
+        'previous_stage',
+        'current_stage',
+        'call_type',
+        'caller',
+        'duration',
+        'call_notes',
+        'previous_owner',
+        'current_owner',
+        'has_attachments',
+        'mx_custom_1',
+        'mx_custom_2',
+        'mx_custom_status',
+        'mx_custom_3',
+        'mx_custom_4',
+        'mx_custom_5',
+        'mx_custom_6',
+        'mx_custom_7',
+        'mx_custom_8',
+        'mx_custom_9',
+        'mx_custom_10',
+        'mx_custom_11',
+        'mx_custom_12',
+        'mx_custom_13',
+        'mx_custom_14',
+        'mx_custom_15',
+        'mx_custom_16',
+        'mx_custom_17',
+        'mx_priority_status',
+        'mx_rfd_date',
+        'mx_total_fees',
+        'mx_total_revenue',
+        'mx_doc_approved',
+        'mx_doc_collected',
+        'mx_cibil_check',
+        'mx_bucket',
+    ],
+    conflict_columns=['table_unique_key'],
+    update_columns=[
+        'prospect_stage',
+        'lead_owner',
+        'lead_sub_status',
+        'lead_last_call_status',
+        'lead_last_call_sub_status',
+        'lead_last_call_connection_status',
+        'mx_priority_status',
+        'mx_rfd_date',
+        'mx_total_fees',
+        'mx_total_revenue',
+        'mx_doc_approved',
+        'mx_doc_collected',
+        'mx_cibil_check',
+        'mx_bucket',
+    ],
+    fingerprint=True,
+    outlets=[result_table('lsq_leads_x_activities')],
     sql='''select
             distinct 
             concat(l2.prospectid,l.activityid) as table_unique_key,
@@ -396,11 +374,4 @@ delete_table = PostgresOperator(
     ''',
     dag=dag
 )
-extract_python_data = PythonOperator(
-    task_id='extract_python_data',
-    python_callable=extract_data_to_nested,
-    provide_context=True,
-    dag=dag
-)
-
-delete_table >> create_table >> transform_data >> extract_python_data
\ No newline at end of file
+delete_table >> create_table >> extract_and_load_data
\ No newline at end of file
@@ -1,86 +1,38 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
-from airflow.providers.postgres.operators.postgres import PostgresOperator
-from airflow.providers.postgres.hooks.postgres import PostgresHook
 from datetime import datetime
-import pandas as pd
-import numpy as np
+from utils.connections import pg_connection
+from utils.instrumentation import task_metrics
+from utils.loader import bulk_upsert, delete_keys
+from utils.partitions import create_partitioned_table
+from utils.watermarks import LATE_ROW_LOOKBACK, SINCE, advance_watermark, get_watermark
+from utils.datasets import result_table
+from utils.pools import create_replica_pool, replica_pool
 
 default_args = {
     'owner': 'airflow',
     'max_active_tasks': 6,
-    'max_active_runs': 6,
+    'max_active_runs': 1,
     'concurrency': 4,
     'depends_on_past': False,
     'start_date': datetime(2023, 3, 16),
 }
 
 
-# DATA CLEANING FUNCTION
-def remove_redundant_rows(df):
-    df = df.copy()
-    df = df.reset_index()  # Create a copy of the DataFrame to avoid modifying the original data
-    try:
-        join_time = df.iloc[0]["join_time"]
-    except:
-        print(df)
-    leave_time = df.iloc[0]["leave_time"]
-    primary_index = 0
-
-    rows_to_drop = []  # Maintain a list of rows to drop
-
-    for i, row in df.iterrows():
-        if join_time < row['join_time'] and row["join_time"] < leave_time:
-            if row["leave_time"] > leave_time:
-                leave_time = row["leave_time"]
-                df.at[primary_index, "leave_time"] = leave_time
-            rows_to_drop.append(i)  # Add the row index to the list of rows to drop
-        elif leave_time < row["join_time"]:
-            primary_index = i
-            join_time = row["join_time"]
-            leave_time = row["leave_time"]
-
-    df.drop(rows_to_drop, inplace=True)  # Drop the redundant rows from the DataFrame
-
-    return df
-
-
-# OVERLAPPING TIME FUNCTION
-def calculate_student_expert_overlapping_time(student_join_time, student_leave_time, expert_times):
-    overlapping_time = 0
-    for expert_time in expert_times:
-        expert_join_time = pd.Timestamp(expert_time[0])
-        expert_leave_time = pd.Timestamp(expert_time[1])
-
-        # Check for overlap between student and expert times
-        if student_join_time <= expert_leave_time and student_leave_time >= expert_join_time:
-            overlap_start = max(student_join_time, expert_join_time)
-            overlap_end = min(student_leave_time, expert_leave_time)
-            overlapping_time += (overlap_end - overlap_start).total_seconds()
-
-    return overlapping_time
-
-
 def fetch_data_and_preprocess(**kwargs):
-    # Fetch data from the query
-    pg_hook = PostgresHook(postgres_conn_id='postgres_read_replica')
-    pg_conn = pg_hook.get_conn()
-    pg_cursor = pg_conn.cursor()
+    import pandas as pd
+    from utils.intervals import iter_session_frames, session_overlap
 
-    result_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    result_conn = result_hook.get_conn()
-    result_cursor = result_conn.cursor()
-
-    result_cursor.execute("""
-    select distinct one_to_one_id from video_sessions_one_to_one_course_user_reports;
-        """)
-
-    inserted_one_to_one_id = list(result_cursor.fetchall())
-    new_inserted_one_to_one_id = []
-    for insert_oto_id in inserted_one_to_one_id:
-        new_inserted_one_to_one_id.append(insert_oto_id[0])
+    ti = kwargs['ti']
+    with pg_connection('postgres_result_db') as result_conn:
+        watermark = get_watermark(
+            result_conn, ti.dag_id, 'join_time',
+            bootstrap_query='select max(join_time) from video_sessions_one_to_one_course_user_reports;',
+        )
 
-    query = """
+    # Every session with report rows past the watermark is extracted in full, as its overlaps
+    # depend on all of its rows, and replaces the rows loaded for it before.
+    query = f"""
         with raw_data as 
             (select 
                 one_to_one_id,
@@ -95,6 +47,9 @@ def fetch_data_and_preprocess(**kwargs):
                 on video_sessions_onetoone.id = video_sessions_onetoonecourseuserreport.one_to_one_id
             where report_type = 4
             and video_sessions_onetoone.id > 509162
+            and video_sessions_onetoone.id in
+                (select one_to_one_id from video_sessions_onetoonecourseuserreport
+                where report_type = 4 and join_time >= {SINCE})
             group by 1,2,3,4,5,6),
         
         booked_with_mapping as
@@ -148,89 +103,56 @@ def fetch_data_and_preprocess(**kwargs):
             select * from booked_by_mapping)
         
         select * from final_data
-        where one_to_one_id not in %s;
+        order by 1;
     """
 
-    pg_cursor.execute(query, (tuple(inserted_one_to_one_id),))
-
-    rows = pg_cursor.fetchall()
-    column_names = ['one_to_one_id', 'user_id', 'stakeholder_name', 'course_user_mapping_id',
-                    'join_time', 'leave_time', 'report_type', 'one_to_one_type', 'stakeholder_type']
-    df = pd.DataFrame(rows, columns=column_names)
-
-    # MAIN CODE AND CALLING OF FUNCTIONS
-    new_df = pd.DataFrame()  # copy of the original df
-    for i, row in df.groupby('one_to_one_id'):
-        expert_dataframe = row[row['stakeholder_type'] == 'Expert']
-        expert_dataframe = expert_dataframe.sort_values('join_time')
-        if expert_dataframe.shape[0] == 0:
-            continue
-        expert_dataframe = remove_redundant_rows(expert_dataframe)
-        expert_times = np.array(expert_dataframe[['join_time', 'leave_time']].values.tolist())
-        # concat_instructor_dataframe
-        new_df = pd.concat([new_df, expert_dataframe])
-        for j, row2 in row.groupby('course_user_mapping_id'):
-            stakeholder_type = row2['stakeholder_type'].values[0]
-            if stakeholder_type == 'User':
-                row2 = row2.sort_values('join_time')
-                student_dataframe = remove_redundant_rows(row2)
-                for k, row3 in student_dataframe.iterrows():
-                    student_join_time = row3['join_time']
-                    student_leave_time = row3['leave_time']
-
-                    # Get the index of the row in the original dataframe (df)
-                    original_index = row3.name
+    with task_metrics(ti) as metrics, pg_connection('postgres_read_replica') as pg_conn:
+        # Server-side cursor, so rows are streamed to the preprocessing one batch of sessions at a time.
+        pg_cursor = pg_conn.cursor(name='one_to_one_course_user_report_rows')
+        with metrics.query():
+            pg_cursor.execute(query, {'watermark': watermark, 'lookback': LATE_ROW_LOOKBACK})
+
+        column_names = ['one_to_one_id', 'user_id', 'stakeholder_name', 'course_user_mapping_id',
+                        'join_time', 'leave_time', 'report_type', 'one_to_one_type', 'stakeholder_type']
+        frames = []
+        high_watermark = None
+        for df in iter_session_frames(pg_cursor, column_names, 'one_to_one_id', metrics=metrics):
+            latest_join_time = df['join_time'].max()
+            if pd.notna(latest_join_time):
+                high_watermark = max(high_watermark, latest_join_time) if high_watermark is not None else latest_join_time
+            frames.append(session_overlap(df, 'one_to_one_id', 'stakeholder_type', host_role='Expert', participant_role='User'))
+        new_df = pd.concat(frames) if frames else pd.DataFrame(columns=column_names)
 
-                    # Check if the row is redundant based on its index
-                    is_redundant = original_index != k
-
-                    # Set user_type to None for redundant rows
-                    stakeholder_type = row3['stakeholder_type'] if not is_redundant else None
-
-                    overlapping_time_seconds = calculate_student_expert_overlapping_time(student_join_time, student_leave_time, expert_times)
-                    student_dataframe.at[original_index, 'overlapping_time_seconds'] = round(overlapping_time_seconds, 0)
-                    student_dataframe.at[original_index, 'overlapping_time_minutes'] = round(overlapping_time_seconds/60, 2)
-                new_df = pd.concat([new_df, student_dataframe])
     column_positioning = ['one_to_one_id', 'user_id', 'stakeholder_name', 'course_user_mapping_id', 'join_time',
                           'leave_time', 'report_type', 'one_to_one_type', 'stakeholder_type',
                           'overlapping_time_seconds', 'overlapping_time_minutes']
     new_df = new_df.reindex(columns=column_positioning)
 
-    ti = kwargs['ti']
     ti.xcom_push(key='preprocessed_data_df', value=new_df)
+    ti.xcom_push(key='high_watermark', value=None if high_watermark is None else str(high_watermark))
 
 
 def insert_preprocessed_data(**kwargs):
-    pg_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    pg_conn = pg_hook.get_conn()
-    pg_cursor = pg_conn.cursor()
-
     ti = kwargs['ti']
     df_cleaned = ti.xcom_pull(task_ids='fetch_data_and_preprocess', key='preprocessed_data_df')
-
-    for _, row in df_cleaned.iterrows():
-        print("Insert Pre Processed Data", row)
-        pg_cursor.execute(
-        'INSERT INTO video_sessions_one_to_one_course_user_reports (one_to_one_id, user_id, stakeholder_name,'
-        'course_user_mapping_id, join_time, leave_time, report_type, one_to_one_type,'
-        'stakeholder_type, overlapping_time_seconds, overlapping_time_minutes)'
-        'VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s);',
-        (
-            row['one_to_one_id'],
-            row['user_id'],
-            row['stakeholder_name'],
-            row['course_user_mapping_id'],
-            row['join_time'],
-            row['leave_time'],
-            row['report_type'],
-            row['one_to_one_type'],
-            row['stakeholder_type'],
-            row['overlapping_time_seconds'],
-            row['overlapping_time_minutes']
+    high_watermark = ti.xcom_pull(task_ids='fetch_data_and_preprocess', key='high_watermark')
+
+    columns = ['one_to_one_id', 'user_id', 'stakeholder_name', 'course_user_mapping_id', 'join_time',
+               'leave_time', 'report_type', 'one_to_one_type', 'stakeholder_type',
+               'overlapping_time_seconds', 'overlapping_time_minutes']
+    with task_metrics(ti) as metrics, metrics.load(), pg_connection('postgres_result_db') as pg_conn:
+        pg_cursor = pg_conn.cursor()
+        # The extracted sessions are reloaded in full, replacing the rows loaded for them by earlier runs.
+        delete_keys(pg_conn, 'video_sessions_one_to_one_course_user_reports', 'one_to_one_id', ((int(key),) for key in df_cleaned['one_to_one_id'].unique()))
+        metrics.rows_written = bulk_upsert(
+            pg_conn,
+            'video_sessions_one_to_one_course_user_reports',
+            columns=columns,
+            rows=df_cleaned[columns].itertuples(index=False, name=None),
+            metrics=metrics,
         )
-    )
-
-    pg_conn.commit()
+        # Advanced in the same transaction as the load, so a failed load is retried from the old watermark.
+        advance_watermark(pg_cursor, ti.dag_id, 'join_time', high_watermark, cast='timestamp')
 
 
 dag = DAG(
@@ -238,18 +160,34 @@ dag = DAG(
     default_args=default_args,
     concurrency=4,
     max_active_tasks=6,
-    max_active_runs=6,
+    # One run at a time, as every run reads and advances the same watermark.
+    max_active_runs=1,
     description='Video sessions one to one Engagement time data with overlapping time calculation',
     schedule_interval='30 0 * * *',
     catchup=False
 )
 
-create_table = PostgresOperator(
+ensure_replica_pool = PythonOperator(
+    task_id='ensure_replica_pool',
+    python_callable=create_replica_pool,
+    dag=dag
+)
+
+# Append-only: one partition per join_time month, so loads touch only the newest partition and
+# date-filtered readers prune the rest; rows without a join_time stay in the default partition.
+# A primary key or unique index of a partitioned table must include join_time, so nothing enforces
+# unique ids: they stay unique only because the load never writes id and every row takes the next
+# value of the serial sequence. The (id, join_time) index serves lookups by id and rejects only a
+# repeated (id, join_time) pair, not the same id with another or a null join_time.
+create_table = PythonOperator(
     task_id='create_table',
-    postgres_conn_id='postgres_result_db',
-    sql="""
+    python_callable=create_partitioned_table,
+    op_kwargs={
+        'postgres_conn_id': 'postgres_result_db',
+        'table': 'video_sessions_one_to_one_course_user_reports',
+        'create_table_sql': '''
     CREATE TABLE IF NOT EXISTS video_sessions_one_to_one_course_user_reports (
-        id serial not null PRIMARY KEY,
+        id serial not null,
         one_to_one_id bigint,
         user_id bigint,
         stakeholder_name text,
@@ -261,13 +199,16 @@ create_table = PostgresOperator(
         stakeholder_type text,
         overlapping_time_seconds real,
         overlapping_time_minutes real
-    )
-    """,
+    ) PARTITION BY RANGE (join_time);
+    CREATE UNIQUE INDEX IF NOT EXISTS video_sessions_one_to_one_course_user_reports_id_join_time_idx ON video_sessions_one_to_one_course_user_reports (id, join_time);
+    ''',
+    },
     dag=dag
 )
 
 fetch_data = PythonOperator(
     task_id='fetch_data_and_preprocess',
+    **replica_pool('heavy'),
     python_callable=fetch_data_and_preprocess,
     provide_context=True,
     dag=dag
@@ -277,7 +218,8 @@ insert_data = PythonOperator(
     task_id='insert_preprocessed_data',
     python_callable=insert_preprocessed_data,
     provide_context=True,
+    outlets=[result_table('video_sessions_one_to_one_course_user_reports')],
     dag=dag
 )
 
-create_table >> fetch_data >> insert_data
\ No newline at end of file
+ensure_replica_pool >> create_table >> fetch_data >> insert_data
\ No newline at end of file
@@ -1,46 +1,21 @@
 from airflow import DAG
 # from airflow.decorators import dag
+from airflow.operators.empty import EmptyOperator
 from airflow.operators.python import PythonOperator
 from airflow.providers.postgres.operators.postgres import PostgresOperator
-from airflow.providers.postgres.hooks.postgres import PostgresHook
-from airflow.models import Variable
-from airflow.utils.task_group import TaskGroup
 from datetime import datetime
-from sqlalchemy_utils.types.enriched_datetime.pendulum_date import pendulum
+from utils.datasets import result_table
+from utils.indexes import index_migrations
+from utils.loader import fingerprint_column_statement
+from utils.sharding import plan_id_ranges
+from utils.streaming import StreamingExtractOperator
+from utils.pools import COST_CLASSES, REPLICA_POOL, create_replica_pool, replica_pool
 
 default_args = {
     'owner': 'airflow',
     'depends_on_past': False,
     'start_date': datetime(2023, 3, 16),
 }
-assignment_per_dags = Variable.get("assignment_per_dag", 40)
-total_number_of_sub_dags = Variable.get("total_number_of_sub_dags", 15)
-
-
-def extract_data_to_nested(**kwargs):
-    pg_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    pg_conn = pg_hook.get_conn()
-    pg_cursor = pg_conn.cursor()
-    ti = kwargs['ti']
-    current_task_index = kwargs['current_task_index']
-    transform_data_output = ti.xcom_pull(task_ids=f'transforming_data_{current_task_index}.transform_data')
-    for transform_row in transform_data_output:
-        print(transform_row)
-        pg_cursor.execute(
-            'INSERT INTO assignment_random_question_mapping (table_unique_key,user_id,course_id,assignment_id,question_id)'
-            'VALUES (%s,%s,%s,%s,%s)'
-            'on conflict (table_unique_key) do update set course_id = EXCLUDED.course_id,'
-            'assignment_id=EXCLUDED.assignment_id,question_id=EXCLUDED.question_id,user_id=EXCLUDED.user_id ;',
-            (
-                transform_row[0],
-                transform_row[1],
-                transform_row[2],
-                transform_row[3],
-                transform_row[4],
-            )
-        )
-    pg_conn.commit()
-
 
 dag = DAG(
     'assignment_random_questions_released_DAG',
@@ -51,12 +26,71 @@ dag = DAG(
 )
 
 
-def transform_data_per_query(start_assignment_id, end_assignment_id):
-    return PostgresOperator(
-        task_id='transform_data',
-        postgres_conn_id='postgres_read_replica',
-        dag=dag,
-        sql='''select distinct cast(concat(assignments_assignment.id, courses_courseusermapping.user_id, assignments_assignmentcourseuserrandomassignedquestionmapping.assignment_question_id) as double precision) as table_unique_key,
+ensure_replica_pool = PythonOperator(
+    task_id='ensure_replica_pool',
+    python_callable=create_replica_pool,
+    dag=dag
+)
+
+create_table = PostgresOperator(
+    task_id='create_table',
+    postgres_conn_id='postgres_result_db',
+    autocommit=True,
+    sql=['''CREATE TABLE IF NOT EXISTS assignment_random_question_mapping (
+            id serial not null,
+            table_unique_key double precision not null PRIMARY KEY,
+            user_id bigint,
+            course_id bigint,
+            assignment_id bigint,
+            question_id bigint
+        );
+    ''', fingerprint_column_statement('assignment_random_question_mapping'), *index_migrations('assignment_random_question_mapping')],
+    dag=dag
+)
+publish_result_table = EmptyOperator(
+    task_id='publish_result_table',
+    outlets=[result_table('assignment_random_question_mapping')],
+    dag=dag
+)
+
+plan_shards = PythonOperator(
+    task_id='plan_shards',
+    **replica_pool('light'),
+    python_callable=plan_id_ranges,
+    op_kwargs={
+        'postgres_conn_id': 'postgres_read_replica',
+        'pool': REPLICA_POOL,
+        'pool_slots': COST_CLASSES['medium']['pool_slots'],
+        'cost_query': '''select assignment_id, count(*)
+                          from assignments_assignmentcourseuserrandomassignedquestionmapping
+                          group by 1''',
+        'max_shards': "{{ var.value.get('max_shards_per_dag', 50) }}",
+    },
+    dag=dag,
+)
+
+extract_and_load_data = StreamingExtractOperator.partial(
+    task_id='extract_and_load_data',
+    source_conn_id='postgres_read_replica',
+    **replica_pool('medium'),
+    table='assignment_random_question_mapping',
+    columns=[
+        'table_unique_key',
+        'user_id',
+        'course_id',
+        'assignment_id',
+        'question_id',
+    ],
+    conflict_columns=['table_unique_key'],
+    update_columns=[
+        'course_id',
+        'assignment_id',
+        'question_id',
+        'user_id',
+    ],
+    fingerprint=True,
+    dag=dag,
+    sql='''select distinct cast(concat(assignments_assignment.id, courses_courseusermapping.user_id, assignments_assignmentcourseuserrandomassignedquestionmapping.assignment_question_id) as double precision) as table_unique_key,
                     courses_courseusermapping.user_id,
                     courses_course.id as course_id,
                     assignments_assignment.id  as assignment_id,
@@ -71,35 +105,9 @@ def transform_data_per_query(start_assignment_id, end_assignment_id):
                     on assignments_assignmentcourseuserrandomassignedquestionmapping.course_user_mapping_id = courses_courseusermapping.id
                         and assignments_assignmentcourseuserrandomassignedquestionmapping.assignment_id = assignments_assignment.id
 
-                where (assignments_assignment.id between %d and %d)
+                where (assignments_assignment.id between %(start_id)s and %(end_id)s)
         ;
-            ''' % (start_assignment_id, end_assignment_id),
-    )
+            ''',
+).expand(parameters=plan_shards.output)
 
-
-create_table = PostgresOperator(
-    task_id='create_table',
-    postgres_conn_id='postgres_result_db',
-    sql='''CREATE TABLE IF NOT EXISTS assignment_random_question_mapping (
-            id serial not null,
-            table_unique_key double precision not null PRIMARY KEY,
-            user_id bigint,
-            course_id bigint,
-            assignment_id bigint,
-            question_id bigint
-        );
-    ''',
-    dag=dag
-)
-for i in range(int(total_number_of_sub_dags)):
-    with TaskGroup(group_id=f"transforming_data_{i}", dag=dag) as sub_dag_task_group:
-        transform_data = transform_data_per_query(i * int(assignment_per_dags) + 1, (i + 1) * int(assignment_per_dags))
-        extract_python_data = PythonOperator(
-            task_id='extract_python_data',
-            python_callable=extract_data_to_nested,
-            provide_context=True,
-            op_kwargs={'current_task_index': i},
-            dag=dag,
-        )
-        transform_data >> extract_python_data
-    create_table >> sub_dag_task_group
\ No newline at end of file
+ensure_replica_pool >> create_table >> plan_shards >> extract_and_load_data >> publish_result_table
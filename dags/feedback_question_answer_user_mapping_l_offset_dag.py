@@ -1,11 +1,14 @@
 from airflow import DAG
+from airflow.operators.empty import EmptyOperator
 from airflow.operators.python import PythonOperator
 from airflow.providers.postgres.operators.postgres import PostgresOperator
-from airflow.providers.postgres.hooks.postgres import PostgresHook
-from airflow.models import Variable
-from airflow.utils.task_group import TaskGroup
 from datetime import datetime
-
+from utils.datasets import result_table
+from utils.indexes import index_migrations
+from utils.loader import fingerprint_column_statement
+from utils.sharding import plan_id_ranges
+from utils.streaming import StreamingExtractOperator
+from utils.pools import COST_CLASSES, REPLICA_POOL, create_replica_pool, replica_pool
 
 default_args = {
     'owner': 'airflow',
@@ -16,12 +19,6 @@ default_args = {
     'start_date': datetime(2023, 3, 16),
 }
 
-assignment_per_dags = Variable.get("assignment_per_dag", 4000)
-
-total_number_of_sub_dags = Variable.get("total_number_of_sub_dags", 5)
-
-total_number_of_extraction_cps_dags = Variable.get("total_number_of_extraction_cps_dags", 10)
-
 dag = DAG(
     'feedback_question_answer_user_mapping_limit_offset_dag',
     default_args=default_args,
@@ -33,11 +30,18 @@ dag = DAG(
     catchup=False
 )
 
+ensure_replica_pool = PythonOperator(
+    task_id='ensure_replica_pool',
+    python_callable=create_replica_pool,
+    dag=dag
+)
+
 # Root Level Create Table
 create_table = PostgresOperator(
     task_id='create_table',
     postgres_conn_id='postgres_result_db',
-    sql='''CREATE TABLE IF NOT EXISTS feedback_form_all_responses_new (
+    autocommit=True,
+    sql=['''CREATE TABLE IF NOT EXISTS feedback_form_all_responses_new (
             table_unique_key text not null PRIMARY KEY,
             fuqam_id bigint,
             m2m_id bigint,
@@ -55,152 +59,75 @@ create_table = PostgresOperator(
             feedback_form_user_question_answer_mapping_id bigint,
             feedback_answer text
         );
-    ''',
+    ''', fingerprint_column_statement('feedback_form_all_responses_new'), *index_migrations('feedback_form_all_responses_new')],
     dag=dag
 )
 
 
-# Leaf Level Abstraction
-def extract_data_to_nested(**kwargs):
-    pg_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    pg_conn = pg_hook.get_conn()
-    ti = kwargs['ti']
-    current_assignment_sub_dag_id = kwargs['current_assignment_sub_dag_id']
-    current_cps_sub_dag_id = kwargs['current_cps_sub_dag_id']
-    transform_data_output = ti.xcom_pull(
-        task_ids=f'transforming_data_{current_assignment_sub_dag_id}.extract_and_transform_individual_assignment_sub_dag_{current_assignment_sub_dag_id}_cps_sub_dag_{current_cps_sub_dag_id}.transform_data')
-    for transform_row in transform_data_output:
-        pg_cursor = pg_conn.cursor()
-        pg_cursor.execute(
-            'INSERT INTO feedback_form_all_responses_new (table_unique_key,'
-            'fuqam_id,m2m_id,feedback_form_user_mapping_id,feedback_form_user_mapping_hash,user_id,feedback_form_id,'
-            'course_id,feedback_question_id, created_at, completed_at,'
-            'entity_content_type_id,entity_object_id,feedback_answer_id,'
-            'feedback_form_user_question_answer_mapping_id,feedback_answer)'
-            'VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)'
-            'on conflict (table_unique_key) do update set feedback_form_user_mapping_id = EXCLUDED.feedback_form_user_mapping_id,'
-            'fuqam_id = EXCLUDED.fuqam_id,'
-            'm2m_id = EXCLUDED.m2m_id,'
-            'user_id = EXCLUDED.user_id,'
-            'feedback_form_id = EXCLUDED.feedback_form_id,'
-            'feedback_form_user_mapping_hash = EXCLUDED.feedback_form_user_mapping_hash,'
-            'course_id = EXCLUDED.course_id,'
-            'feedback_question_id = EXCLUDED.feedback_question_id,'
-            'created_at = EXCLUDED.created_at,'
-            'completed_at = EXCLUDED.completed_at,'
-            'entity_content_type_id = EXCLUDED.entity_content_type_id,'
-            'entity_object_id = EXCLUDED.entity_object_id,'
-            'feedback_answer_id = EXCLUDED.feedback_answer_id,'
-            'feedback_form_user_question_answer_mapping_id = EXCLUDED.feedback_form_user_question_answer_mapping_id,'
-            'feedback_answer = EXCLUDED.feedback_answer;',
-            (
-                transform_row[0],
-                transform_row[1],
-                transform_row[2],
-                transform_row[3],
-                transform_row[4],
-                transform_row[5],
-                transform_row[6],
-                transform_row[7],
-                transform_row[8],
-                transform_row[9],
-                transform_row[10],
-                transform_row[11],
-                transform_row[12],
-                transform_row[13],
-                transform_row[14],
-                transform_row[15],
-            )
-        )
-        pg_conn.commit()
-        pg_cursor.close()
-    pg_conn.close()
-
-
-def number_of_rows_per_assignment_sub_dag_func(start_assignment_id, end_assignment_id):
-    return PostgresOperator(
-        task_id='number_of_rows_per_assignment_sub_dag',
-        postgres_conn_id='postgres_read_replica',
-        dag=dag,
-        sql='''select count(table_unique_key) from 
-        (with raw as
-            (Select
-                feedback_feedbackformuserquestionanswermapping.id as fuqam_id,
-                feedback_feedbackformuserquestionanswerm2m.id as m2m_id,
-                feedback_feedbackformusermapping.id as feedback_form_user_mapping_id,
-                feedback_feedbackformusermapping.hash as feedback_form_user_mapping_hash,
-                feedback_feedbackformusermapping.filled_by_id as user_id,
-                feedback_feedbackform.id as feedback_form_id,
-                feedback_feedbackformusermapping.course_id,
-                feedback_feedbackquestion.id as feedback_question_id,
-                feedback_feedbackformusermapping.created_at,
-                feedback_feedbackformusermapping.completed_at,
-                feedback_feedbackformusermapping.entity_content_type_id,
-                feedback_feedbackformusermapping.entity_object_id,
-                feedback_feedbackanswer.id as feedback_answer_id,
-                feedback_feedbackformuserquestionanswermapping.id as feedback_form_user_question_answer_mapping_id,
-                case
-                    when feedback_feedbackanswer.text is null then feedback_feedbackformuserquestionanswermapping.other_answer
-                    else feedback_feedbackanswer.text 
-                end as feedback_answer
-                
-            from
-                feedback_feedbackformusermapping
-            
-            join feedback_feedbackform
-                on feedback_feedbackform.id = feedback_feedbackformusermapping.feedback_form_id
-                    and (feedback_feedbackform.id between %d and %d)
-            
-            join feedback_feedbackformuserquestionanswermapping
-                on feedback_feedbackformusermapping.id = feedback_feedbackformuserquestionanswermapping.feedback_form_user_mapping_id
-            
-            left join feedback_feedbackformuserquestionanswerm2m
-                on feedback_feedbackformuserquestionanswermapping.id = feedback_feedbackformuserquestionanswerm2m.feedback_form_user_question_answer_mapping_id
-            
-            left join feedback_feedbackanswer
-                on feedback_feedbackformuserquestionanswerm2m.feedback_answer_id = feedback_feedbackanswer.id
-                
-            left join feedback_feedbackquestion
-                on feedback_feedbackformuserquestionanswermapping.feedback_question_id = feedback_feedbackquestion.id)
-        select
-            (case 
-                    when m2m_id is null then concat(feedback_form_user_mapping_id,1,fuqam_id)
-                    else concat(feedback_form_user_mapping_id,2,m2m_id) 
-                end) as table_unique_key,
-            raw.*
-        from
-            raw) query_rows;
-            ''' % (start_assignment_id, end_assignment_id),
-    )
-
-
-# Python Limit Offset generator
-def limit_offset_generator_func(**kwargs):
-    ti = kwargs['ti']
-    current_assignment_sub_dag_id = kwargs['current_assignment_sub_dag_id']
-    current_cps_sub_dag_id = kwargs['current_cps_sub_dag_id']
-    count_cps_rows = ti.xcom_pull(
-        task_ids=f'transforming_data_{current_assignment_sub_dag_id}.number_of_rows_per_assignment_sub_dag')
-    print(count_cps_rows)
-    total_count_rows = count_cps_rows[0][0]
-    return {
-        "limit": total_count_rows // total_number_of_extraction_cps_dags,
-        "offset": current_cps_sub_dag_id * (total_count_rows // total_number_of_extraction_cps_dags) + 1,
-    }
+publish_result_table = EmptyOperator(
+    task_id='publish_result_table',
+    outlets=[result_table('feedback_form_all_responses_new')],
+    dag=dag
+)
 
+plan_shards = PythonOperator(
+    task_id='plan_shards',
+    **replica_pool('light'),
+    python_callable=plan_id_ranges,
+    op_kwargs={
+        'postgres_conn_id': 'postgres_read_replica',
+        'pool': REPLICA_POOL,
+        'pool_slots': COST_CLASSES['medium']['pool_slots'],
+        'cost_query': 'select feedback_form_id, count(*) from feedback_feedbackformusermapping group by 1',
+        'max_shards': "{{ var.value.get('max_shards_per_dag', 50) }}",
+    },
+    dag=dag,
+)
 
-# TODO: Add Count Logic
-def transform_data_per_query(start_assignment_id, end_assignment_id, cps_sub_dag_id, current_assignment_sub_dag_id):
-    return PostgresOperator(
-        task_id='transform_data',
-        postgres_conn_id='postgres_read_replica',
-        dag=dag,
-        params={
-            'current_cps_sub_dag_id': cps_sub_dag_id,
-            'current_assignment_sub_dag_id': current_assignment_sub_dag_id,
-            'task_key': f'transforming_data_{current_assignment_sub_dag_id}.extract_and_transform_individual_assignment_sub_dag_{current_assignment_sub_dag_id}_cps_sub_dag_{cps_sub_dag_id}.limit_offset_generator'
-        },
-        sql='''with raw as
+extract_and_load_data = StreamingExtractOperator.partial(
+    task_id='extract_and_load_data',
+    source_conn_id='postgres_read_replica',
+    **replica_pool('medium'),
+    table='feedback_form_all_responses_new',
+    columns=[
+        'table_unique_key',
+        'fuqam_id',
+        'm2m_id',
+        'feedback_form_user_mapping_id',
+        'feedback_form_user_mapping_hash',
+        'user_id',
+        'feedback_form_id',
+        'course_id',
+        'feedback_question_id',
+        'created_at',
+        'completed_at',
+        'entity_content_type_id',
+        'entity_object_id',
+        'feedback_answer_id',
+        'feedback_form_user_question_answer_mapping_id',
+        'feedback_answer',
+    ],
+    conflict_columns=['table_unique_key'],
+    update_columns=[
+        'feedback_form_user_mapping_id',
+        'fuqam_id',
+        'm2m_id',
+        'user_id',
+        'feedback_form_id',
+        'feedback_form_user_mapping_hash',
+        'course_id',
+        'feedback_question_id',
+        'created_at',
+        'completed_at',
+        'entity_content_type_id',
+        'entity_object_id',
+        'feedback_answer_id',
+        'feedback_form_user_question_answer_mapping_id',
+        'feedback_answer',
+    ],
+    fingerprint=True,
+    dag=dag,
+    sql='''with raw as
             (Select
                 feedback_feedbackformuserquestionanswermapping.id as fuqam_id,
                 feedback_feedbackformuserquestionanswerm2m.id as m2m_id,
@@ -226,7 +153,7 @@ def transform_data_per_query(start_assignment_id, end_assignment_id, cps_sub_dag
             
             join feedback_feedbackform
                 on feedback_feedbackform.id = feedback_feedbackformusermapping.feedback_form_id
-                    and (feedback_feedbackform.id between %d and %d)
+                    and (feedback_feedbackform.id between %(start_id)s and %(end_id)s)
             
             join feedback_feedbackformuserquestionanswermapping
                 on feedback_feedbackformusermapping.id = feedback_feedbackformuserquestionanswermapping.feedback_form_user_mapping_id
@@ -246,52 +173,8 @@ def transform_data_per_query(start_assignment_id, end_assignment_id, cps_sub_dag
                 end) as table_unique_key,
             raw.*
         from
-            raw
-        limit {{ ti.xcom_pull(task_ids=params.task_key, key='return_value').limit }} 
-        offset {{ ti.xcom_pull(task_ids=params.task_key, key='return_value').offset }}
-        ;
-            ''' % (start_assignment_id, end_assignment_id),
-    )
-
-
-for assignment_sub_dag_id in range(int(total_number_of_sub_dags)):
-    with TaskGroup(group_id=f"transforming_data_{assignment_sub_dag_id}", dag=dag) as assignment_sub_dag_task_group:
-        assignment_start_id = assignment_sub_dag_id * int(assignment_per_dags) + 1
-        assignment_end_id = (assignment_sub_dag_id + 1) * int(assignment_per_dags)
-        number_of_rows_per_assignment_sub_dag = number_of_rows_per_assignment_sub_dag_func(assignment_start_id,
-                                                                                           assignment_end_id)
-
-        for cps_sub_dag_id in range(int(total_number_of_extraction_cps_dags)):
-            with TaskGroup(
-                    group_id=f"extract_and_transform_individual_assignment_sub_dag_{assignment_sub_dag_id}_cps_sub_dag_{cps_sub_dag_id}",
-                    dag=dag) as cps_sub_dag:
-                limit_offset_generator = PythonOperator(
-                    task_id='limit_offset_generator',
-                    python_callable=limit_offset_generator_func,
-                    provide_context=True,
-                    op_kwargs={
-                        'current_assignment_sub_dag_id': assignment_sub_dag_id,
-                        'current_cps_sub_dag_id': cps_sub_dag_id,
-                    },
-                    dag=dag,
-                )
-
-                transform_data = transform_data_per_query(assignment_start_id, assignment_end_id, cps_sub_dag_id,
-                                                          assignment_sub_dag_id)
-
-                extract_python_data = PythonOperator(
-                    task_id='extract_python_data',
-                    python_callable=extract_data_to_nested,
-                    provide_context=True,
-                    op_kwargs={
-                        'current_assignment_sub_dag_id': assignment_sub_dag_id,
-                        'current_cps_sub_dag_id': cps_sub_dag_id
-                    },
-                    dag=dag,
-                )
-
-                limit_offset_generator >> transform_data >> extract_python_data
-
-            number_of_rows_per_assignment_sub_dag >> cps_sub_dag
+            raw;
+            ''',
+).expand(parameters=plan_shards.output)
 
-    create_table >> assignment_sub_dag_task_group
\ No newline at end of file
+ensure_replica_pool >> create_table >> plan_shards >> extract_and_load_data >> publish_result_table
@@ -0,0 +1,7 @@
+-- Indexes of assessment_question_user_mapping, applied by its create_table task (utils.indexes).
+-- arl_assessments_x_user.yaml, growth_dashboard_DAG.py, master_class_dashboard.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS assessment_question_user_mapping_assessment_id_cou_5dfae6a4_idx ON assessment_question_user_mapping (assessment_id, course_user_mapping_id);
+-- user_activity_status_mapping_dag.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS assessment_question_user_mapping_option_marked_at_idx ON assessment_question_user_mapping (option_marked_at);
+-- growth_dashboard_DAG.py, master_class_dashboard.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS assessment_question_user_mapping_user_id_idx ON assessment_question_user_mapping (user_id);
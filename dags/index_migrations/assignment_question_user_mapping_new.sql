@@ -0,0 +1,7 @@
+-- Indexes of assignment_question_user_mapping_new, applied by its create_table task (utils.indexes).
+-- ARL_assign_x_users_ques_started_at_dag_limit_offset.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS assignment_question_user_mapping_new_assignment_id_5fc39173_idx ON assignment_question_user_mapping_new (assignment_id, user_id, question_id);
+-- arl_contests_x_users.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS assignment_question_user_mapping_new_question_id_idx ON assignment_question_user_mapping_new (question_id);
+-- user_activity_status_mapping_dag.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS assignment_question_user_mapping_new_question_started_at_idx ON assignment_question_user_mapping_new (question_started_at);
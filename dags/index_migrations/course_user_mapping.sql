@@ -0,0 +1,11 @@
+-- Indexes of course_user_mapping, applied by its create_table task (utils.indexes).
+-- arl_group_sessions_x_users.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS course_user_mapping_course_id_status_user_id_idx ON course_user_mapping (course_id, status, user_id);
+-- master_class_dashboard.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS course_user_mapping_course_user_mapping_id_user_id_idx ON course_user_mapping (course_user_mapping_id, user_id);
+-- arl_assignment_reported_question.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS course_user_mapping_status_idx ON course_user_mapping (status);
+-- arl_policy_based_module_clearance.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS course_user_mapping_user_id_course_name_idx ON course_user_mapping (user_id, course_name);
+-- arl_nps_info.yaml, arl_user_ratings.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS course_user_mapping_user_id_status_idx ON course_user_mapping (user_id, status);
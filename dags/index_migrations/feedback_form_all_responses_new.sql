@@ -0,0 +1,7 @@
+-- Indexes of feedback_form_all_responses_new, applied by its create_table task (utils.indexes).
+-- arl_assignment_reported_question.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS feedback_form_all_responses_new_entity_object_id_idx ON feedback_form_all_responses_new (entity_object_id);
+-- arl_assignment_reported_question.yaml, arl_mocks_x_user.yaml, arl_nps_info.yaml, lecture_course_user_reports_limit_offset_dag.py, lecture_course_user_reports_limit_offset_dag_new.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS feedback_form_all_responses_new_feedback_form_id_f_ff32f677_idx ON feedback_form_all_responses_new (feedback_form_id, feedback_question_id);
+-- arl_nps_info.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS feedback_form_all_responses_new_user_id_idx ON feedback_form_all_responses_new (user_id);
@@ -0,0 +1,5 @@
+-- Indexes of group_session_course_user_reports, applied by its create_table task (utils.indexes).
+-- user_activity_status_mapping_dag.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS group_session_course_user_reports_course_user_mapping_id_idx ON group_session_course_user_reports (course_user_mapping_id);
+-- user_activity_status_mapping_dag.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS group_session_course_user_reports_join_time_idx ON group_session_course_user_reports (join_time);
@@ -0,0 +1,7 @@
+-- Indexes of lecture_engagement_time, applied by its create_table task (utils.indexes).
+-- lecture_course_user_reports_limit_offset_dag.py, lecture_course_user_reports_limit_offset_dag_new.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS lecture_engagement_time_course_user_mapping_id_idx ON lecture_engagement_time (course_user_mapping_id);
+-- user_activity_status_mapping_dag.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS lecture_engagement_time_join_time_idx ON lecture_engagement_time (join_time);
+-- master_class_dashboard.yaml
+CREATE INDEX CONCURRENTLY IF NOT EXISTS lecture_engagement_time_lecture_id_course_user_mapping_id_idx ON lecture_engagement_time (lecture_id, course_user_mapping_id);
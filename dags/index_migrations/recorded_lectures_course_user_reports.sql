@@ -0,0 +1,7 @@
+-- Indexes of recorded_lectures_course_user_reports, applied by its create_table task (utils.indexes).
+-- user_activity_status_mapping_dag.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS recorded_lectures_course_user_reports_course_user__c712b1be_idx ON recorded_lectures_course_user_reports (course_user_mapping_id);
+-- lecture_course_user_reports_limit_offset_dag.py, lecture_course_user_reports_limit_offset_dag_new.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS recorded_lectures_course_user_reports_lecture_id_c_dbb735eb_idx ON recorded_lectures_course_user_reports (lecture_id, course_user_mapping_id);
+-- user_activity_status_mapping_dag.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS recorded_lectures_course_user_reports_lecture_watch_date_idx ON recorded_lectures_course_user_reports (lecture_watch_date);
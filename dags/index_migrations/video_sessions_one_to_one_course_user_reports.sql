@@ -0,0 +1,5 @@
+-- Indexes of video_sessions_one_to_one_course_user_reports, applied by its create_table task (utils.indexes).
+-- user_activity_status_mapping_dag.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS video_sessions_one_to_one_course_user_reports_join_time_idx ON video_sessions_one_to_one_course_user_reports (join_time);
+-- user_activity_status_mapping_dag.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS video_sessions_one_to_one_course_user_reports_one__e4263b3a_idx ON video_sessions_one_to_one_course_user_reports (one_to_one_type, join_time);
@@ -1,12 +1,13 @@
 from airflow import DAG
+from airflow.operators.empty import EmptyOperator
 from airflow.operators.python import PythonOperator
 from airflow.providers.postgres.operators.postgres import PostgresOperator
-from airflow.providers.postgres.hooks.postgres import PostgresHook
 from datetime import datetime
-from airflow.models import Variable
-from airflow.utils.task_group import TaskGroup
-import json
-import math
+from utils.datasets import result_table
+from utils.indexes import index_migrations
+from utils.loader import fingerprint_column_statement
+from utils.sharding import plan_key_ranges
+from utils.streaming import StreamingExtractOperator
 
 default_args = {
     'owner': 'airflow',
@@ -14,8 +15,6 @@ default_args = {
     'start_date': datetime(2023, 3, 16),
 }
 
-total_number_of_sub_dags = Variable.get("total_number_of_sub_dags_job_posting", 20)
-
 dag = DAG(
     'Job_Posting_limit_offset_DAG',
     default_args=default_args,
@@ -25,67 +24,11 @@ dag = DAG(
 )
 
 
-def extract_data_to_nested(**kwargs):
-    pg_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    pg_conn = pg_hook.get_conn()
-    pg_cursor = pg_conn.cursor()
-    ti = kwargs['ti']
-    curr_itr = kwargs['current_iterator']
-    transform_data_output = ti.xcom_pull(f"job_posting_sub_dag_{curr_itr}.transform_data_{curr_itr}")
-    print("Drumil", transform_data_output, f"job_posting_sub_dag_{curr_itr}.transform_data_{curr_itr}")
-    for transform_row in transform_data_output:
-        pg_cursor.execute(
-            'INSERT INTO job_postings_v2 (other_skills,company,max_ctc,min_ctc,job_role,job_type,job_title,'
-            'department,job_source,is_duplicate,job_location,preferred_skills,max_experience,min_experience,'
-            'relevancy_score,job_description_url,job_description_raw_text,job_description_url_without_job_id,'
-            '_airbyte_ab_id,_airbyte_emitted_at,_airbyte_normalized_at,_airbyte_job_openings_hashid,'
-            '_airbyte_unique_key,number_of_openings)'
-            'VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)'
-            'on conflict (job_description_url_without_job_id) do update set other_skills=EXCLUDED.other_skills,company=EXCLUDED.company,'
-            'max_ctc=EXCLUDED.max_ctc,min_ctc=EXCLUDED.min_ctc,job_role=EXCLUDED.job_role,'
-            'job_type=EXCLUDED.job_type,job_title=EXCLUDED.job_title,department=EXCLUDED.department,'
-            'job_source=EXCLUDED.job_source,is_duplicate=EXCLUDED.is_duplicate,job_location=EXCLUDED.job_location,'
-            'preferred_skills=EXCLUDED.preferred_skills,max_experience=EXCLUDED.max_experience,'
-            'min_experience=EXCLUDED.min_experience,relevancy_score=EXCLUDED.relevancy_score,'
-            'job_description_url=EXCLUDED.job_description_url,job_description_raw_text=EXCLUDED.job_description_raw_text,'
-            '_airbyte_ab_id=EXCLUDED._airbyte_ab_id,_airbyte_emitted_at=EXCLUDED._airbyte_emitted_at,'
-            '_airbyte_normalized_at=EXCLUDED._airbyte_normalized_at,'
-            '_airbyte_job_openings_hashid=EXCLUDED._airbyte_job_openings_hashid,'
-            '_airbyte_unique_key=EXCLUDED._airbyte_unique_key,number_of_openings=EXCLUDED.number_of_openings ;',
-            (
-                transform_row[0],
-                transform_row[1],
-                transform_row[2],
-                transform_row[3],
-                transform_row[4],
-                transform_row[5],
-                transform_row[6],
-                transform_row[7],
-                transform_row[8],
-                transform_row[9],
-                transform_row[10],
-                transform_row[11],
-                transform_row[12],
-                transform_row[13],
-                transform_row[14],
-                transform_row[15],
-                transform_row[16],
-                transform_row[17],
-                transform_row[18],
-                transform_row[19],
-                transform_row[20],
-                transform_row[21],
-                transform_row[22],
-                transform_row[23],
-            )
-        )
-    pg_conn.commit()
-
-
 create_table = PostgresOperator(
     task_id='create_table',
     postgres_conn_id='postgres_result_db',
-    sql='''CREATE TABLE IF NOT EXISTS job_postings_v2 (
+    autocommit=True,
+    sql=['''CREATE TABLE IF NOT EXISTS job_postings_v2 (
             id serial,
             other_skills text[],
             company varchar(1000),
@@ -112,15 +55,87 @@ create_table = PostgresOperator(
             _airbyte_unique_key varchar(1000),
             number_of_openings real
         );
-    ''',
+    ''', fingerprint_column_statement('job_postings_v2'), *index_migrations('job_postings_v2')],
+    dag=dag
+)
+
+publish_result_table = EmptyOperator(
+    task_id='publish_result_table',
+    outlets=[result_table('job_postings_v2')],
     dag=dag
 )
 
-def get_postgres_job_posting_operator(task_iterator):
-    return PostgresOperator(
-        task_id=f'transform_data_{task_iterator}',
-        postgres_conn_id='postgres_job_posting',
-        sql=f'''select
+# Shards are contiguous ranges of the upsert key, so all versions of a posting land in the same shard
+plan_shards = PythonOperator(
+    task_id='plan_shards',
+    python_callable=plan_key_ranges,
+    op_kwargs={
+        'postgres_conn_id': 'postgres_job_posting',
+        'key_query': 'select job_description_url_without_job_id from job_openings',
+        'max_shards': "{{ var.value.get('total_number_of_sub_dags_job_posting', 20) }}",
+    },
+    dag=dag,
+)
+
+extract_and_load_data = StreamingExtractOperator.partial(
+    task_id='extract_and_load_data',
+    source_conn_id='postgres_job_posting',
+    table='job_postings_v2',
+    columns=[
+        'other_skills',
+        'company',
+        'max_ctc',
+        'min_ctc',
+        'job_role',
+        'job_type',
+        'job_title',
+        'department',
+        'job_source',
+        'is_duplicate',
+        'job_location',
+        'preferred_skills',
+        'max_experience',
+        'min_experience',
+        'relevancy_score',
+        'job_description_url',
+        'job_description_raw_text',
+        'job_description_url_without_job_id',
+        '_airbyte_ab_id',
+        '_airbyte_emitted_at',
+        '_airbyte_normalized_at',
+        '_airbyte_job_openings_hashid',
+        '_airbyte_unique_key',
+        'number_of_openings',
+    ],
+    conflict_columns=['job_description_url_without_job_id'],
+    update_columns=[
+        'other_skills',
+        'company',
+        'max_ctc',
+        'min_ctc',
+        'job_role',
+        'job_type',
+        'job_title',
+        'department',
+        'job_source',
+        'is_duplicate',
+        'job_location',
+        'preferred_skills',
+        'max_experience',
+        'min_experience',
+        'relevancy_score',
+        'job_description_url',
+        'job_description_raw_text',
+        '_airbyte_ab_id',
+        '_airbyte_emitted_at',
+        '_airbyte_normalized_at',
+        '_airbyte_job_openings_hashid',
+        '_airbyte_unique_key',
+        'number_of_openings',
+    ],
+    fingerprint=True,
+    dag=dag,
+    sql='''select
                 distinct
                 skills -> 'otherSkills' as other_skills,
                 job_openings.company,
@@ -146,67 +161,12 @@ def get_postgres_job_posting_operator(task_iterator):
                 job_openings._airbyte_job_openings_hashid,
                 job_openings._airbyte_unique_key,
                 raw_response -> 'vacancy' as number_of_openings
-                from job_openings limit {{{{ti.xcom_pull(task_ids='job_posting_sub_dag_{task_iterator}.transform_limit_offset_{task_iterator}', key='query_limit_job_posting_{task_iterator}') }}}} offset {{{{ ti.xcom_pull(task_ids='job_posting_sub_dag_{task_iterator}.transform_limit_offset_{task_iterator}', key='query_offset_job_posting_{task_iterator}') }}}};
+                from job_openings
+                where (case when %(null_keys)s then job_openings.job_description_url_without_job_id is null
+                        else job_openings.job_description_url_without_job_id is not null end)
+                    and (%(lower_key)s::text is null or job_openings.job_description_url_without_job_id > %(lower_key)s)
+                    and (%(upper_key)s::text is null or job_openings.job_description_url_without_job_id <= %(upper_key)s);
             ''',
-        params={
-            "limit": f"{{{{ti.xcom_pull(task_ids='job_posting_sub_dag_{task_iterator}.transform_limit_offset_{task_iterator}', key='query_limit_job_posting_{task_iterator}')}}}}",
-            "offset": f"{{{{ti.xcom_pull(task_ids='job_posting_sub_dag_{task_iterator}.transform_limit_offset_{task_iterator}', key='query_offset_job_posting_{task_iterator}')}}}}",
-        },
-        dag=dag
-    )
-
-
-# extract_python_data = PythonOperator(
-#     task_id='extract_python_data',
-#     python_callable=extract_data_to_nested,
-#     provide_context=True,
-#     dag=dag
-# )
-
-extract_total_job_posting = PostgresOperator(
-    task_id='extract_total_job_posting',
-    postgres_conn_id='postgres_job_posting',
-    sql='''select count(job_description_url_without_job_id) from job_openings;''',
-    dag=dag
-)
-
-for itr in range(int(total_number_of_sub_dags)):
-    job_postings_sub_dag_id = itr
-    with TaskGroup(group_id=f"job_posting_sub_dag_{job_postings_sub_dag_id}", dag=dag) as job_posting_sub_dag_task_group:
-        def transform_data(**kwargs):
-            curr_itr = kwargs["current_iterator"]
-            ti = kwargs['ti']
-            extract_total_job_posting = ti.xcom_pull("extract_total_job_posting")[0][0]
-            individual_total_job_posting = extract_total_job_posting / total_number_of_sub_dags
-            query_limit = math.floor(individual_total_job_posting)
-            query_offset = individual_total_job_posting * kwargs["current_iterator"]
-
-            ti.xcom_push(key=f"query_limit_job_posting_{curr_itr}", value=query_limit)
-            ti.xcom_push(key=f"query_offset_job_posting_{curr_itr}", value=query_offset)
-
-
-        transform_limit_offset = PythonOperator(
-            task_id=f"transform_limit_offset_{job_postings_sub_dag_id}",
-            python_callable=transform_data,
-            provide_context=True,
-            op_kwargs={
-                'current_iterator': job_postings_sub_dag_id,
-            },
-            dag=dag,
-        )
-
-        transform_data = get_postgres_job_posting_operator(job_postings_sub_dag_id)
-
-        extract_python_data = PythonOperator(
-            task_id=f'extract_python_data_{job_postings_sub_dag_id}',
-            python_callable=extract_data_to_nested,
-            provide_context=True,
-            op_kwargs={
-                'current_iterator': job_postings_sub_dag_id,
-            },
-            dag=dag
-        )
-
-        transform_limit_offset >> transform_data >> extract_python_data
+).expand(parameters=plan_shards.output)
 
-    create_table >> extract_total_job_posting >> job_posting_sub_dag_task_group
+create_table >> plan_shards >> extract_and_load_data >> publish_result_table
@@ -1,13 +1,15 @@
 from airflow import DAG
 # from airflow.decorators import dag
+from airflow.operators.empty import EmptyOperator
 from airflow.operators.python import PythonOperator
 from airflow.providers.postgres.operators.postgres import PostgresOperator
-from airflow.providers.postgres.hooks.postgres import PostgresHook
-from airflow.models import Variable
-from airflow.utils.task_group import TaskGroup
 from datetime import datetime
 
-from sqlalchemy_utils.types.enriched_datetime.pendulum_date import pendulum
+from utils.datasets import result_table
+from utils.indexes import index_migrations
+from utils.loader import fingerprint_column_statement
+from utils.sharding import plan_id_ranges
+from utils.streaming import StreamingExtractOperator
 
 default_args = {
     'owner': 'airflow',
@@ -18,27 +20,35 @@ default_args = {
     'start_date': datetime(2023, 3, 16),
 }
 
-lecture_per_dags = Variable.get("lecture_per_dag", 4000)
-
-total_number_of_sub_dags = Variable.get("total_number_of_sub_dags", 5)
-
-total_number_of_extraction_cps_dags = Variable.get("total_number_of_extraction_cps_dags", 10)
-
 dag = DAG(
     'lecture_course_user_reports_bigserial_limit_offset_dag',
     default_args=default_args,
     concurrency=4,
     max_active_tasks=6,
-    max_active_runs=6,
+    max_active_runs=1,
     description='Table at user, lecture level for all users with cum.status in (8,9,11,12,30)',
-    schedule_interval='45 5 * * *',
+    # wow_active_batches is rebuilt weekly and read as of its last build, so it is not a schedule input.
+    schedule=[
+        result_table('course_user_category_mapping'),
+        result_table('course_user_mapping'),
+        result_table('courses'),
+        result_table('feedback_form_all_responses_new'),
+        result_table('lecture_engagement_time'),
+        result_table('lecture_topic_mapping'),
+        result_table('lectures'),
+        result_table('recorded_lectures_course_user_reports'),
+        result_table('topics'),
+        result_table('user_activity_status_mapping'),
+        result_table('users_info'),
+    ],
     catchup=False
 )
 
 create_table = PostgresOperator(
     task_id='create_table',
     postgres_conn_id='postgres_result_db',
-    sql='''CREATE TABLE IF NOT EXISTS lecture_course_user_reports_bigserial (
+    autocommit=True,
+    sql=['''CREATE TABLE IF NOT EXISTS lecture_course_user_reports_bigserial (
             id bigserial,
             table_unique_key text not null PRIMARY KEY,
             user_id bigint,
@@ -82,341 +92,21 @@ create_table = PostgresOperator(
             admin_unit_name text,
             child_video_session boolean
         );
-    ''',
+    ''', fingerprint_column_statement('lecture_course_user_reports_bigserial'), *index_migrations('lecture_course_user_reports_bigserial')],
     dag=dag
 )
 
-# Leaf Level Abstraction
-def extract_data_to_nested(**kwargs):
-    pg_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    pg_conn = pg_hook.get_conn()
-    ti = kwargs['ti']
-    current_lecture_sub_dag_id = kwargs['current_lecture_sub_dag_id']
-    current_cps_sub_dag_id = kwargs['current_cps_sub_dag_id']
-    transform_data_output = ti.xcom_pull(
-        task_ids=f'transforming_data_{current_lecture_sub_dag_id}.extract_and_transform_individual_lecture_sub_dag_{current_lecture_sub_dag_id}_cps_sub_dag_{current_cps_sub_dag_id}.transform_data')
-    for transform_row in transform_data_output:
-        pg_cursor = pg_conn.cursor()
-        pg_cursor.execute('INSERT INTO lecture_course_user_reports_bigserial (table_unique_key, user_id, student_name,'
-        'lead_type, student_category, course_user_mapping_id, label_mapping_status,'
-        'course_id, course_name, course_structure_class, lecture_id, lecture_title,'
-        'lecture_type, '
-        'mandatory, '
-        'lecture_start_timestamp,'
-        'topic_template_id, template_name, inst_min_join_time, '
-        'inst_max_leave_time,'
-        'inst_total_time_in_mins, inst_user_id, instructor_name,'
-        'lecture_date, live_attendance, recorded_attendance,'
-        'overall_attendance, total_overlapping_time_in_mins, total_user_time, user_min_join_time,'
-        'user_max_leave_time,'
-        'answer_rating,'
-        'rating_feedback_answer,'
-        'lecture_understood_rating,'
-        'lecture_understanding_feedback_answer,'
-        'activity_status_7_days,'
-        'activity_status_14_days,'
-        'activity_status_30_days,'
-        'user_placement_status,'
-        'admin_course_id,'
-        'admin_unit_name,'
-        'child_video_session)'
-        'VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)'
-        'on conflict (table_unique_key) do update set student_name = EXCLUDED.student_name,'
-        'lead_type = EXCLUDED.lead_type,'
-        'student_category = EXCLUDED.student_category,'
-        'label_mapping_status = EXCLUDED.label_mapping_status,'
-        'course_name = EXCLUDED.course_name,'
-        'course_structure_class = EXCLUDED.course_structure_class,'
-        'lecture_title = EXCLUDED.lecture_title,'
-        'lecture_type = EXCLUDED.lecture_type,'
-        'mandatory = EXCLUDED.mandatory,'
-        'lecture_start_timestamp = EXCLUDED.lecture_start_timestamp,'
-        'topic_template_id = EXCLUDED.topic_template_id,'
-        'template_name = EXCLUDED.template_name,'
-        'inst_min_join_time = EXCLUDED.inst_min_join_time,'
-        'inst_max_leave_time = EXCLUDED.inst_max_leave_time,'
-        'inst_total_time_in_mins = EXCLUDED.inst_total_time_in_mins,'
-        'inst_user_id = EXCLUDED.inst_user_id,'
-        'instructor_name = EXCLUDED.instructor_name,'
-        'lecture_date = EXCLUDED.lecture_date,'
-        'live_attendance = EXCLUDED.live_attendance,'
-        'recorded_attendance = EXCLUDED.recorded_attendance,'
-        'overall_attendance = EXCLUDED.overall_attendance,'
-        'total_overlapping_time_in_mins = EXCLUDED.total_overlapping_time_in_mins,'
-        'total_user_time = EXCLUDED.total_user_time,'
-        'user_min_join_time = EXCLUDED.user_min_join_time,'
-        'user_max_leave_time = EXCLUDED.user_max_leave_time,'
-        'answer_rating = EXCLUDED.answer_rating,'
-        'rating_feedback_answer = EXCLUDED.rating_feedback_answer,'
-        'lecture_understood_rating = EXCLUDED.lecture_understood_rating,'
-        'lecture_understanding_feedback_answer = EXCLUDED.lecture_understanding_feedback_answer,'
-        'activity_status_7_days = EXCLUDED.activity_status_7_days,'
-        'activity_status_14_days = EXCLUDED.activity_status_14_days,'
-        'activity_status_30_days = EXCLUDED.activity_status_30_days,'
-        'user_placement_status = EXCLUDED.user_placement_status,'
-        'admin_course_id = EXCLUDED.admin_course_id,'
-        'admin_unit_name = EXCLUDED.admin_unit_name,'
-        'child_video_session = EXCLUDED.child_video_session;',
-            (
-                transform_row[0],
-                transform_row[1],
-                transform_row[2],
-                transform_row[3],
-                transform_row[4],
-                transform_row[5],
-                transform_row[6],
-                transform_row[7],
-                transform_row[8],
-                transform_row[9],
-                transform_row[10],
-                transform_row[11],
-                transform_row[12],
-                transform_row[13],
-                transform_row[14],
-                transform_row[15],
-                transform_row[16],
-                transform_row[17],
-                transform_row[18],
-                transform_row[19],
-                transform_row[20],
-                transform_row[21],
-                transform_row[22],
-                transform_row[23],
-                transform_row[24],
-                transform_row[25],
-                transform_row[26],
-                transform_row[27],
-                transform_row[28],
-                transform_row[29],
-                transform_row[30],
-                transform_row[31],
-                transform_row[32],
-                transform_row[33],
-                transform_row[34],
-                transform_row[35],
-                transform_row[36],
-                transform_row[37],
-                transform_row[38],
-                transform_row[39],
-                transform_row[40],
-            )
-        )
-        pg_conn.commit()
-        pg_cursor.close()
-    pg_conn.close()
-
-
-def number_of_rows_per_lecture_sub_dag_func(start_lecture_id, end_lecture_id):
-    return PostgresOperator(
-        task_id='number_of_rows_per_lecture_sub_dag',
-        postgres_conn_id='postgres_result_db',
-        dag=dag,
-        sql='''select count(table_unique_key) from
-            (with user_raw_data as
-                (select
-                    lecture_id,
-                    course_user_mapping_id,
-                    join_time,
-                    leave_time,
-                    extract(epoch from (leave_time - join_time))/60 as time_diff,
-                    user_type,
-                    overlapping_time_seconds,
-                    overlapping_time_minutes
-                from
-                    lecture_engagement_time let
-                where lower(user_type) like 'user'
-                group by 1,2,3,4,5,6,7,8),
-            
-            inst_raw_data as
-                (select 
-                    lecture_id,
-                    user_id as inst_user_id, 
-                    let.course_user_mapping_id as inst_cum_id,
-                    join_time,
-                    leave_time,
-                    extract('epoch' from (leave_time - join_time))/60 as time_diff_in_mins
-                from
-                    lecture_engagement_time let
-                join course_user_mapping cum 
-                    on cum.course_user_mapping_id = let.course_user_mapping_id 
-                where lower(user_type) like 'instructor'
-                group by 1,2,3,4,5,6),
-            
-            inst_data as 
-                (select 
-                    lecture_id,
-                    inst_user_id,
-                    inst_cum_id,
-                    min(join_time) as inst_min_join_time,
-                    max(leave_time) as inst_max_leave_time,
-                    sum(time_diff_in_mins) as inst_total_time_in_mins
-                from
-                    inst_raw_data
-                group by 1,2,3),
-                        
-            user_overlapping_time as
-                (select 
-                    lecture_id,
-                    course_user_mapping_id,
-                    min(join_time) as min_join_time,
-                    max(leave_time) as max_leave_time,
-                    sum(overlapping_time_seconds) as total_overlapping_in_seconds,
-                    sum(overlapping_time_minutes) as total_overlapping_time_minutes,
-                    sum(time_diff) as total_user_time
-                from
-                    user_raw_data
-                group by 1,2),
-            
-            lecture_rating as 
-                (select
-                    user_id,
-                    entity_object_id as lecture_id,
-                    case
-                        when ffar.feedback_answer = 'Awesome' then 5
-                        when ffar.feedback_answer = 'Good' then 4
-                        when ffar.feedback_answer = 'Average' then 3
-                        when ffar.feedback_answer = 'Poor' then 2
-                        when ffar.feedback_answer = 'Very Poor' then 1
-                    end as answer_rating,
-                    feedback_answer as rating_feedback_answer
-                from
-                    feedback_form_all_responses_new ffar
-                where ffar.feedback_form_id = 4377 
-                    and ffar.feedback_question_id = 348
-                group by 1,2,3,4),
-            
-            lecture_understanding as 
-                (select
-                        user_id,
-                        entity_object_id as lecture_id,
-                    case 
-                        when feedback_answer_id = 179 then 1
-                        when feedback_answer_id = 180 then 0
-                        when feedback_answer_id = 181 then -1
-                    end as lecture_understood_rating,
-                        feedback_answer as lecture_understanding_feedback_answer
-                    from
-                        feedback_form_all_responses_new ffar
-                    where ffar.feedback_form_id = 4377 
-                        and ffar.feedback_question_id = 331
-                    group by 1,2,3,4)    
-                        
-            select
-                concat(cum.user_id, l.lecture_id, t.topic_template_id) as table_unique_key,
-                cum.user_id,
-                concat(ui.first_name,' ',ui.last_name) as student_name,
-                ui.lead_type,
-                cucm.student_category,
-                cum.course_user_mapping_id,
-                case 
-                    when cum.label_id is null and cum.status in (8,9) then 'Enrolled Student'
-                    when cum.label_id is not null and cum.status in (8,9) then 'Label Marked Student'
-                    when c.course_structure_id in (1,18) and cum.status in (11,12) then 'ISA Cancelled Student'
-                    when c.course_structure_id not in (1,18) and cum.status in (30) then 'Deferred Student'
-                    when c.course_structure_id not in (1,18) and cum.status in (11) then 'Foreclosed Student'
-                    when c.course_structure_id not in (1,18) and cum.status in (12) then 'Reject by NS-Ops'
-                    else 'Mapping Error'
-                end as label_mapping_status,
-                c.course_id,
-                c.course_name,
-                c.course_structure_class,
-                l.lecture_id,
-                l.lecture_title,
-                l.lecture_type,
-                l.mandatory,
-                l.start_timestamp as lecture_start_timestamp,
-                t.topic_template_id,
-                t.template_name,
-                inst_min_join_time,
-                inst_max_leave_time,
-                cast(inst_total_time_in_mins as int) as inst_total_time_in_mins,
-                inst_user_id,
-                concat(ui2.first_name,' ' ,ui2.last_name) as instructor_name,
-                date(l.start_timestamp) as lecture_date,
-                count(distinct let.lecture_id) filter (where let.lecture_id is not null) as live_attendance,
-                count(distinct rlcur.lecture_id) filter (where rlcur.id is not null) as recorded_attendance,
-                case
-                    when (count(distinct let.lecture_id) filter (where let.lecture_id is not null) = 1 or 
-                        count(distinct rlcur.lecture_id) filter (where rlcur.id is not null) = 1) then 1
-                    else 0 
-                end as overall_attendance,
-                cast(let.total_overlapping_time_minutes as int) as total_overlapping_time_minutes,
-                cast(let.total_user_time as int) as total_user_time ,
-                let.min_join_time as user_min_join_time,
-                let.max_leave_time as user_max_leave_time,
-                answer_rating,
-                rating_feedback_answer,
-                lecture_understood_rating,
-                lecture_understanding_feedback_answer,
-                uasm.activity_status_7_days,
-                uasm.activity_status_14_days,
-                uasm.activity_status_30_days,
-                cum.user_placement_status,
-                cum.admin_course_id,
-                cum.admin_unit_name,
-                l.child_video_session 
-            from
-                courses c
-            join course_user_mapping cum
-                on cum.course_id = c.course_id and c.course_structure_id in (1,6,7,8,11,12,14,18,19,20,22,23,26,32,34,44,47,50,51,52,53,54,55,56,57,58,59,60)
-                    and cum.status in (8,9,11,12,30) and (c.course_id in (select distinct wab.lu_course_id from wow_active_batches wab) or c.course_id = 798) 
-            join lectures l
-                on l.course_id = c.course_id and l.start_timestamp >= '2022-07-01'
-                    and (l.lecture_id between %d and %d)
-            left join user_overlapping_time let
-                on let.lecture_id = l.lecture_id and let.course_user_mapping_id = cum.course_user_mapping_id
-            left join recorded_lectures_course_user_reports rlcur
-                on rlcur.lecture_id = l.lecture_id and rlcur.course_user_mapping_id = cum.course_user_mapping_id
-            left join inst_data
-                on inst_data.lecture_id = l.lecture_id
-            left join lecture_topic_mapping ltm
-                on ltm.lecture_id = l.lecture_id and ltm.completed = true
-            left join topics t
-                on t.topic_id = ltm.topic_id and t.topic_template_id in (102,103,119,334,336,338,339,340,341,342,344,410,208,209,367,447,489,544,555,577)
-            left join users_info ui
-                on ui.user_id = cum.user_id
-            left join course_user_category_mapping cucm
-                on cucm.user_id = cum.user_id and cucm.course_id = cum.course_id
-            left join lecture_understanding
-                on lecture_understanding.lecture_id = l.lecture_id 
-                    and lecture_understanding.user_id = cum.user_id 
-            left join lecture_rating
-                on lecture_rating.lecture_id = l.lecture_id 
-                    and lecture_rating.user_id = cum.user_id
-            left join user_activity_status_mapping uasm 
-                on uasm.user_id = cum.user_id 
-            left join users_info ui2 
-                on ui2.user_id = inst_data.inst_user_id
-            group by 1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41) count_query;
-        ''' % (start_lecture_id, end_lecture_id),
-    )
-
-# Python Limit Offset generator
-def limit_offset_generator_func(**kwargs):
-    ti = kwargs['ti']
-    current_lecture_sub_dag_id = kwargs['current_lecture_sub_dag_id']
-    current_cps_sub_dag_id = kwargs['current_cps_sub_dag_id']
-    count_cps_rows = ti.xcom_pull(
-        task_ids=f'transforming_data_{current_lecture_sub_dag_id}.number_of_rows_per_lecture_sub_dag')
-    print(count_cps_rows)
-    total_count_rows = count_cps_rows[0][0]
-    return {
-        "limit": total_count_rows // total_number_of_extraction_cps_dags,
-        "offset": current_cps_sub_dag_id * (total_count_rows // total_number_of_extraction_cps_dags) + 1,
-    }
-
-
-def transform_data_per_query(start_lecture_id, end_lecture_id, cps_sub_dag_id, current_lecture_sub_dag_id):
-    return PostgresOperator(
-        task_id='transform_data',
-        postgres_conn_id='postgres_result_db',
-        dag=dag,
-        params={
-            'current_cps_sub_dag_id': cps_sub_dag_id,
-            'current_lecture_sub_dag_id': current_lecture_sub_dag_id,
-            'task_key': f'transforming_data_{current_lecture_sub_dag_id}.extract_and_transform_individual_lecture_sub_dag_{current_lecture_sub_dag_id}_cps_sub_dag_{cps_sub_dag_id}.limit_offset_generator'
-        },
-        sql=''' with user_raw_data as
+# The engagement and feedback aggregates every shard joins are built once per run into unlogged
+# work tables instead of being recomputed by each shard; runs do not overlap as they share them.
+# Only sessions of the lectures reported on (start_timestamp >= 2022-07-01) are read, joins up to a
+# day early included, so the older join_time partitions of lecture_engagement_time are pruned.
+# Sessions without a join_time are still read, from the default partition.
+materialize_work_tables = PostgresOperator(
+    task_id='materialize_work_tables',
+    postgres_conn_id='postgres_result_db',
+    sql='''DROP TABLE IF EXISTS lecture_course_user_reports_bigserial__user_overlapping_time;
+        CREATE UNLOGGED TABLE lecture_course_user_reports_bigserial__user_overlapping_time AS
+        with user_raw_data as
             (select
                 lecture_id,
                 course_user_mapping_id,
@@ -429,9 +119,24 @@ def transform_data_per_query(start_lecture_id, end_lecture_id, cps_sub_dag_id, c
             from
                 lecture_engagement_time let
             where lower(user_type) like 'user'
-            group by 1,2,3,4,5,6,7,8),
-        
-        inst_raw_data as
+                and (join_time >= date '2022-07-01' - interval '1 day' or join_time is null)
+            group by 1,2,3,4,5,6,7,8)
+        select
+            lecture_id,
+            course_user_mapping_id,
+            min(join_time) as min_join_time,
+            max(leave_time) as max_leave_time,
+            sum(overlapping_time_seconds) as total_overlapping_in_seconds,
+            sum(overlapping_time_minutes) as total_overlapping_time_minutes,
+            sum(time_diff) as total_user_time
+        from
+            user_raw_data
+        group by 1,2;
+        CREATE INDEX ON lecture_course_user_reports_bigserial__user_overlapping_time (lecture_id, course_user_mapping_id);
+
+        DROP TABLE IF EXISTS lecture_course_user_reports_bigserial__inst_data;
+        CREATE UNLOGGED TABLE lecture_course_user_reports_bigserial__inst_data AS
+        with inst_raw_data as
             (select 
                 lecture_id,
                 user_id as inst_user_id, 
@@ -444,68 +149,183 @@ def transform_data_per_query(start_lecture_id, end_lecture_id, cps_sub_dag_id, c
             join course_user_mapping cum 
                 on cum.course_user_mapping_id = let.course_user_mapping_id 
             where lower(user_type) like 'instructor'
-            group by 1,2,3,4,5,6),
-        
-        inst_data as 
-            (select 
-                lecture_id,
-                inst_user_id,
-                inst_cum_id,
-                min(join_time) as inst_min_join_time,
-                max(leave_time) as inst_max_leave_time,
-                sum(time_diff_in_mins) as inst_total_time_in_mins
-            from
-                inst_raw_data
-            group by 1,2,3),
-                    
-        user_overlapping_time as
-            (select 
-                lecture_id,
-                course_user_mapping_id,
-                min(join_time) as min_join_time,
-                max(leave_time) as max_leave_time,
-                sum(overlapping_time_seconds) as total_overlapping_in_seconds,
-                sum(overlapping_time_minutes) as total_overlapping_time_minutes,
-                sum(time_diff) as total_user_time
-            from
-                user_raw_data
-            group by 1,2),
-        
-        lecture_rating as 
-            (select
-                user_id,
-                entity_object_id as lecture_id,
-                case
-                    when ffar.feedback_answer = 'Awesome' then 5
-                    when ffar.feedback_answer = 'Good' then 4
-                    when ffar.feedback_answer = 'Average' then 3
-                    when ffar.feedback_answer = 'Poor' then 2
-                    when ffar.feedback_answer = 'Very Poor' then 1
-                end as answer_rating,
-                feedback_answer as rating_feedback_answer
-            from
-                feedback_form_all_responses_new ffar
-            where ffar.feedback_form_id = 4377 
-                and ffar.feedback_question_id = 348
-            group by 1,2,3,4),
-        
-        lecture_understanding as 
-            (select
-                    user_id,
-                    entity_object_id as lecture_id,
-                case 
-                    when feedback_answer_id = 179 then 1
-                    when feedback_answer_id = 180 then 0
-                    when feedback_answer_id = 181 then -1
-                end as lecture_understood_rating,
-                    feedback_answer as lecture_understanding_feedback_answer
-                from
-                    feedback_form_all_responses_new ffar
-                where ffar.feedback_form_id = 4377 
-                    and ffar.feedback_question_id = 331
-                group by 1,2,3,4)    
-                    
+                and (join_time >= date '2022-07-01' - interval '1 day' or join_time is null)
+            group by 1,2,3,4,5,6)
+        select 
+            lecture_id,
+            inst_user_id,
+            inst_cum_id,
+            min(join_time) as inst_min_join_time,
+            max(leave_time) as inst_max_leave_time,
+            sum(time_diff_in_mins) as inst_total_time_in_mins
+        from
+            inst_raw_data
+        group by 1,2,3;
+        CREATE INDEX ON lecture_course_user_reports_bigserial__inst_data (lecture_id);
+
+        DROP TABLE IF EXISTS lecture_course_user_reports_bigserial__lecture_rating;
+        CREATE UNLOGGED TABLE lecture_course_user_reports_bigserial__lecture_rating AS
         select
+            user_id,
+            entity_object_id as lecture_id,
+            case
+                when ffar.feedback_answer = 'Awesome' then 5
+                when ffar.feedback_answer = 'Good' then 4
+                when ffar.feedback_answer = 'Average' then 3
+                when ffar.feedback_answer = 'Poor' then 2
+                when ffar.feedback_answer = 'Very Poor' then 1
+            end as answer_rating,
+            feedback_answer as rating_feedback_answer
+        from
+            feedback_form_all_responses_new ffar
+        where ffar.feedback_form_id = 4377 
+            and ffar.feedback_question_id = 348
+        group by 1,2,3,4;
+        CREATE INDEX ON lecture_course_user_reports_bigserial__lecture_rating (lecture_id, user_id);
+
+        DROP TABLE IF EXISTS lecture_course_user_reports_bigserial__lecture_understanding;
+        CREATE UNLOGGED TABLE lecture_course_user_reports_bigserial__lecture_understanding AS
+        select
+            user_id,
+            entity_object_id as lecture_id,
+            case 
+                when feedback_answer_id = 179 then 1
+                when feedback_answer_id = 180 then 0
+                when feedback_answer_id = 181 then -1
+            end as lecture_understood_rating,
+            feedback_answer as lecture_understanding_feedback_answer
+        from
+            feedback_form_all_responses_new ffar
+        where ffar.feedback_form_id = 4377 
+            and ffar.feedback_question_id = 331
+        group by 1,2,3,4;
+        CREATE INDEX ON lecture_course_user_reports_bigserial__lecture_understanding (lecture_id, user_id);
+
+        ANALYZE lecture_course_user_reports_bigserial__user_overlapping_time;
+        ANALYZE lecture_course_user_reports_bigserial__inst_data;
+        ANALYZE lecture_course_user_reports_bigserial__lecture_rating;
+        ANALYZE lecture_course_user_reports_bigserial__lecture_understanding;
+    ''',
+    dag=dag
+)
+
+drop_work_tables = PostgresOperator(
+    task_id='drop_work_tables',
+    postgres_conn_id='postgres_result_db',
+    trigger_rule='all_done',
+    sql='''DROP TABLE IF EXISTS lecture_course_user_reports_bigserial__user_overlapping_time;
+        DROP TABLE IF EXISTS lecture_course_user_reports_bigserial__inst_data;
+        DROP TABLE IF EXISTS lecture_course_user_reports_bigserial__lecture_rating;
+        DROP TABLE IF EXISTS lecture_course_user_reports_bigserial__lecture_understanding;
+    ''',
+    dag=dag
+)
+
+plan_shards = PythonOperator(
+    task_id='plan_shards',
+    python_callable=plan_id_ranges,
+    op_kwargs={
+        'postgres_conn_id': 'postgres_result_db',
+        'cost_query': '''select l.lecture_id, count(cum.course_user_mapping_id)
+                          from lectures l
+                          left join course_user_mapping cum
+                              on cum.course_id = l.course_id and cum.status in (8,9,11,12,30)
+                          where l.start_timestamp >= '2022-07-01'
+                          group by 1''',
+        'max_shards': "{{ var.value.get('max_shards_per_dag', 50) }}",
+    },
+    dag=dag,
+)
+
+extract_and_load_data = StreamingExtractOperator.partial(
+    task_id='extract_and_load_data',
+    source_conn_id='postgres_result_db',
+    table='lecture_course_user_reports_bigserial',
+    columns=[
+        'table_unique_key',
+        'user_id',
+        'student_name',
+        'lead_type',
+        'student_category',
+        'course_user_mapping_id',
+        'label_mapping_status',
+        'course_id',
+        'course_name',
+        'course_structure_class',
+        'lecture_id',
+        'lecture_title',
+        'lecture_type',
+        'mandatory',
+        'lecture_start_timestamp',
+        'topic_template_id',
+        'template_name',
+        'inst_min_join_time',
+        'inst_max_leave_time',
+        'inst_total_time_in_mins',
+        'inst_user_id',
+        'instructor_name',
+        'lecture_date',
+        'live_attendance',
+        'recorded_attendance',
+        'overall_attendance',
+        'total_overlapping_time_in_mins',
+        'total_user_time',
+        'user_min_join_time',
+        'user_max_leave_time',
+        'answer_rating',
+        'rating_feedback_answer',
+        'lecture_understood_rating',
+        'lecture_understanding_feedback_answer',
+        'activity_status_7_days',
+        'activity_status_14_days',
+        'activity_status_30_days',
+        'user_placement_status',
+        'admin_course_id',
+        'admin_unit_name',
+        'child_video_session',
+    ],
+    conflict_columns=['table_unique_key'],
+    update_columns=[
+        'student_name',
+        'lead_type',
+        'student_category',
+        'label_mapping_status',
+        'course_name',
+        'course_structure_class',
+        'lecture_title',
+        'lecture_type',
+        'mandatory',
+        'lecture_start_timestamp',
+        'topic_template_id',
+        'template_name',
+        'inst_min_join_time',
+        'inst_max_leave_time',
+        'inst_total_time_in_mins',
+        'inst_user_id',
+        'instructor_name',
+        'lecture_date',
+        'live_attendance',
+        'recorded_attendance',
+        'overall_attendance',
+        'total_overlapping_time_in_mins',
+        'total_user_time',
+        'user_min_join_time',
+        'user_max_leave_time',
+        'answer_rating',
+        'rating_feedback_answer',
+        'lecture_understood_rating',
+        'lecture_understanding_feedback_answer',
+        'activity_status_7_days',
+        'activity_status_14_days',
+        'activity_status_30_days',
+        'user_placement_status',
+        'admin_course_id',
+        'admin_unit_name',
+        'child_video_session',
+    ],
+    fingerprint=True,
+    dag=dag,
+    sql=''' select
             concat(cum.user_id, l.lecture_id, t.topic_template_id) as table_unique_key,
             cum.user_id,
             concat(ui.first_name,' ',ui.last_name) as student_name,
@@ -566,12 +386,12 @@ def transform_data_per_query(start_lecture_id, end_lecture_id, cps_sub_dag_id, c
                 and cum.status in (8,9,11,12,30) and (c.course_id in (select distinct wab.lu_course_id from wow_active_batches wab) or c.course_id = 798) 
         join lectures l
             on l.course_id = c.course_id and l.start_timestamp >= '2022-07-01'
-                and (l.lecture_id between %d and %d)
-        left join user_overlapping_time let
+                and (l.lecture_id between %(start_id)s and %(end_id)s)
+        left join lecture_course_user_reports_bigserial__user_overlapping_time let
             on let.lecture_id = l.lecture_id and let.course_user_mapping_id = cum.course_user_mapping_id
         left join recorded_lectures_course_user_reports rlcur
             on rlcur.lecture_id = l.lecture_id and rlcur.course_user_mapping_id = cum.course_user_mapping_id
-        left join inst_data
+        left join lecture_course_user_reports_bigserial__inst_data inst_data
             on inst_data.lecture_id = l.lecture_id
         left join lecture_topic_mapping ltm
             on ltm.lecture_id = l.lecture_id and ltm.completed = true
@@ -581,10 +401,10 @@ def transform_data_per_query(start_lecture_id, end_lecture_id, cps_sub_dag_id, c
             on ui.user_id = cum.user_id
         left join course_user_category_mapping cucm
             on cucm.user_id = cum.user_id and cucm.course_id = cum.course_id
-        left join lecture_understanding
+        left join lecture_course_user_reports_bigserial__lecture_understanding lecture_understanding
             on lecture_understanding.lecture_id = l.lecture_id 
                 and lecture_understanding.user_id = cum.user_id 
-        left join lecture_rating
+        left join lecture_course_user_reports_bigserial__lecture_rating lecture_rating
             on lecture_rating.lecture_id = l.lecture_id 
                 and lecture_rating.user_id = cum.user_id
         left join user_activity_status_mapping uasm 
@@ -592,47 +412,13 @@ def transform_data_per_query(start_lecture_id, end_lecture_id, cps_sub_dag_id, c
         left join users_info ui2 
             on ui2.user_id = inst_data.inst_user_id
         group by 1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41;
-            ''' % (start_lecture_id, end_lecture_id),
-    )
-
-for lecture_sub_dag_id in range(int(total_number_of_sub_dags)):
-    with TaskGroup(group_id=f"transforming_data_{lecture_sub_dag_id}", dag=dag) as lecture_sub_dag_task_group:
-        lecture_start_id = lecture_sub_dag_id * int(lecture_per_dags) + 1
-        lecture_end_id = (lecture_sub_dag_id + 1) * int(lecture_per_dags)
-        number_of_rows_per_lecture_sub_dag = number_of_rows_per_lecture_sub_dag_func(lecture_start_id,
-                                                                                           lecture_end_id)
+            ''',
+).expand(parameters=plan_shards.output)
 
-        for cps_sub_dag_id in range(int(total_number_of_extraction_cps_dags)):
-            with TaskGroup(
-                    group_id=f"extract_and_transform_individual_lecture_sub_dag_{lecture_sub_dag_id}_cps_sub_dag_{cps_sub_dag_id}",
-                    dag=dag) as cps_sub_dag:
-                limit_offset_generator = PythonOperator(
-                    task_id='limit_offset_generator',
-                    python_callable=limit_offset_generator_func,
-                    provide_context=True,
-                    op_kwargs={
-                        'current_lecture_sub_dag_id': lecture_sub_dag_id,
-                        'current_cps_sub_dag_id': cps_sub_dag_id,
-                    },
-                    dag=dag,
-                )
-
-                transform_data = transform_data_per_query(lecture_start_id, lecture_end_id, cps_sub_dag_id,
-                                                          lecture_sub_dag_id)
-
-                extract_python_data = PythonOperator(
-                    task_id='extract_python_data',
-                    python_callable=extract_data_to_nested,
-                    provide_context=True,
-                    op_kwargs={
-                        'current_lecture_sub_dag_id': lecture_sub_dag_id,
-                        'current_cps_sub_dag_id': cps_sub_dag_id
-                    },
-                    dag=dag,
-                )
-
-                limit_offset_generator >> transform_data >> extract_python_data
-
-            number_of_rows_per_lecture_sub_dag >> cps_sub_dag
+publish_result_table = EmptyOperator(
+    task_id='publish_result_table',
+    outlets=[result_table('lecture_course_user_reports_bigserial')],
+    dag=dag
+)
 
-    create_table >> lecture_sub_dag_task_group
\ No newline at end of file
+create_table >> [materialize_work_tables, plan_shards] >> extract_and_load_data >> [publish_result_table, drop_work_tables]
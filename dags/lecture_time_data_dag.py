@@ -1,10 +1,13 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
-from airflow.providers.postgres.operators.postgres import PostgresOperator
-from airflow.providers.postgres.hooks.postgres import PostgresHook
 from datetime import datetime
-import pandas as pd
-import numpy as np
+from utils.connections import pg_connection
+from utils.instrumentation import task_metrics
+from utils.loader import bulk_upsert, delete_keys
+from utils.partitions import create_partitioned_table
+from utils.watermarks import LATE_ROW_LOOKBACK, SINCE, advance_watermark, get_watermark
+from utils.datasets import result_table
+from utils.pools import create_replica_pool, replica_pool
 
 default_args = {
     'owner': 'airflow',
@@ -12,76 +15,20 @@ default_args = {
     'start_date': datetime(2023, 3, 16),
 }
 
-# DATA CLEANING FUNCTION
-def remove_redundant_rows(df):
-    df = df.copy()
-    df = df.reset_index()  # Create a copy of the DataFrame to avoid modifying the original data
-    try:
-        join_time = df.iloc[0]["join_time"]
-    except:
-        print(df)
-    leave_time = df.iloc[0]["leave_time"]
-    primary_index = 0
-
-    rows_to_drop = []  # Maintain a list of rows to drop
-
-    for i, row in df.iterrows():
-        if join_time < row['join_time'] and row["join_time"] < leave_time:
-            if row["leave_time"] > leave_time:
-                leave_time = row["leave_time"]
-                df.at[primary_index, "leave_time"] = leave_time
-            rows_to_drop.append(i)  # Add the row index to the list of rows to drop
-        elif leave_time < row["join_time"]:
-            primary_index = i
-            join_time = row["join_time"]
-            leave_time = row["leave_time"]
-
-    df.drop(rows_to_drop, inplace=True)  # Drop the redundant rows from the DataFrame
-
-    return df
-
-
-# OVERLAPPING TIME FUNCTION
-def calculate_student_instructor_overlapping_time(student_join_time, student_leave_time, instructor_times):
-    overlapping_time = 0
-    for instructor_time in instructor_times:
-        instructor_join_time = pd.Timestamp(instructor_time[0])
-        instructor_leave_time = pd.Timestamp(instructor_time[1])
-
-        # Check for overlap between student and instructor times
-        if student_join_time <= instructor_leave_time and student_leave_time >= instructor_join_time:
-            overlap_start = max(student_join_time, instructor_join_time)
-            overlap_end = min(student_leave_time, instructor_leave_time)
-            overlap_time = max(overlap_end - overlap_start, pd.Timedelta(0))  # Ensure positive time difference
-            overlapping_time += (overlap_end - overlap_start).total_seconds()
-
-    # print("Bhai Nan aaya hai", student_leave_time, student_join_time, instructor_times)
-    return overlapping_time
-
-
 def fetch_data_and_preprocess(**kwargs):
-    # Fetch data from the query
-    pg_hook = PostgresHook(postgres_conn_id='postgres_read_replica')
-    pg_conn = pg_hook.get_conn()
-    pg_cursor = pg_conn.cursor()
-
-    result_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    result_conn = result_hook.get_conn()
-    result_cursor = result_conn.cursor()
+    import pandas as pd
+    from utils.intervals import iter_session_frames, session_overlap
 
-    result_cursor.execute("""
-    select distinct lecture_id from lecture_engagement_time;
-        """)
-
-    inserted_lecture_id = list(result_cursor.fetchall())
-    new_inserted_lecture_id = []
-    for insert_lecture in inserted_lecture_id:
-        new_inserted_lecture_id.append(insert_lecture[0])
-    # print(inserted_lecture_id)
-    # print(new_inserted_lecture_id)
-    # print(len(inserted_lecture_id))
+    ti = kwargs['ti']
+    with pg_connection('postgres_result_db') as result_conn:
+        watermark = get_watermark(
+            result_conn, ti.dag_id, 'join_time',
+            bootstrap_query='select max(join_time) from lecture_engagement_time;',
+        )
 
-    query = """
+    # Every session with report rows past the watermark is extracted in full, as its overlaps
+    # depend on all of its rows, and replaces the rows loaded for it before.
+    query = f"""
     with vsl_cur_raw as
             (select
                 lecture_id,
@@ -94,6 +41,9 @@ def fetch_data_and_preprocess(**kwargs):
                 video_sessions_lecturecourseuserreport
             where report_type = 4
             and date(join_time) >= '2023-08-11'
+            and lecture_id in
+                (select lecture_id from video_sessions_lecturecourseuserreport
+                where report_type = 4 and join_time >= {SINCE})
             group by 1,2,3,4,5,6),
     
         course_inst_mapping_raw as
@@ -174,63 +124,25 @@ def fetch_data_and_preprocess(**kwargs):
             vsl_cur_raw
         left join inst_details
             on inst_details.lecture_id = vsl_cur_raw.lecture_id and inst_details.inst_cum_id = vsl_cur_raw.course_user_mapping_id
-        where vsl_cur_raw.lecture_id not in %s 
         order by 1 desc, 5, 2;
     """
 
-    #print(query)
-    # print(inserted_lecture_id)
-    # pg_cursor.execute(query)
-    pg_cursor.execute(query, (tuple(new_inserted_lecture_id),))
-
-    rows = pg_cursor.fetchall()
-    # print(rows)
-    # for row_data in rows:
-    #     lecture_id = row_data[0]
-    #     if lecture_id in new_inserted_lecture_id:
-    #         print(lecture_id)
-    # col_names = ['lecture_id']
-    column_names = ['lecture_id', 'course_user_mapping_id', 'join_time', 'leave_time', 'user_type']
-    df = pd.DataFrame(rows, columns=column_names)
-
-    # MAIN CODE AND CALLING OF FUNCTIONS
-    new_df = pd.DataFrame()  # copy of the original df
-    for i, row in df.groupby('lecture_id'):
-        instructor_dataframe = row[row['user_type'] == 'Instructor']
-        instructor_dataframe = instructor_dataframe.sort_values('join_time')
-        if instructor_dataframe.shape[0] == 0:
-            continue
-        instructor_dataframe = remove_redundant_rows(instructor_dataframe)
-        instructor_times = np.array(instructor_dataframe[['join_time', 'leave_time']].values.tolist())
-        # concat_instructor_dataframe
-        new_df = pd.concat([new_df, instructor_dataframe])
-        for j, row2 in row.groupby('course_user_mapping_id'):
-            user_type = row2['user_type'].values[0]
-            if user_type == 'User':
-                row2 = row2.sort_values('join_time')
-                student_dataframe = remove_redundant_rows(row2)
-                # print(student_dataframe[['join_time', 'leave_time']])
-                for k, row3 in student_dataframe.iterrows():
-                    student_join_time = row3['join_time']
-                    student_leave_time = row3['leave_time']
-
-                    # Get the index of the row in the original dataframe (df)
-                    original_index = row3.name
-
-                    # Check if the row is redundant based on its index
-                    is_redundant = original_index != k
-
-                    # Set user_type to None for redundant rows
-                    user_type = row3['user_type'] if not is_redundant else None
-
-                    overlapping_time_seconds = calculate_student_instructor_overlapping_time(student_join_time,
-                                                                                             student_leave_time,
-                                                                                             instructor_times)
-                    student_dataframe.at[original_index, 'overlapping_time_seconds'] = round(overlapping_time_seconds,
-                                                                                             0)
-                    student_dataframe.at[original_index, 'overlapping_time_minutes'] = round(
-                        overlapping_time_seconds / 60, 2)
-                new_df = pd.concat([new_df, student_dataframe])
+    with task_metrics(ti) as metrics, pg_connection('postgres_read_replica') as pg_conn:
+        # Server-side cursor, so rows are streamed to the preprocessing one batch of sessions at a time.
+        pg_cursor = pg_conn.cursor(name='lecture_engagement_time_rows')
+        with metrics.query():
+            pg_cursor.execute(query, {'watermark': watermark, 'lookback': LATE_ROW_LOOKBACK})
+
+        # col_names = ['lecture_id']
+        column_names = ['lecture_id', 'course_user_mapping_id', 'join_time', 'leave_time', 'user_type']
+        frames = []
+        high_watermark = None
+        for df in iter_session_frames(pg_cursor, column_names, 'lecture_id', metrics=metrics):
+            latest_join_time = df['join_time'].max()
+            if pd.notna(latest_join_time):
+                high_watermark = max(high_watermark, latest_join_time) if high_watermark is not None else latest_join_time
+            frames.append(session_overlap(df, 'lecture_id', 'user_type', host_role='Instructor', participant_role='User'))
+        new_df = pd.concat(frames) if frames else pd.DataFrame(columns=column_names)
 
     # result_df = result_df.drop(['index'], axis=1)
     column_positioning = ['lecture_id', 'course_user_mapping_id', 'user_type', 'join_time', 'leave_time',
@@ -238,52 +150,63 @@ def fetch_data_and_preprocess(**kwargs):
     new_df = new_df.reindex(columns=column_positioning)
     # result_df = result_df.reindex(columns=column_positioning)
 
-    ti = kwargs['ti']
     ti.xcom_push(key='preprocessed_data_df', value=new_df)
+    ti.xcom_push(key='high_watermark', value=None if high_watermark is None else str(high_watermark))
 
 def insert_preprocessed_data(**kwargs):
-    pg_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    pg_conn = pg_hook.get_conn()
-    pg_cursor = pg_conn.cursor()
-
     ti = kwargs['ti']
     df_cleaned = ti.xcom_pull(task_ids='fetch_data_and_preprocess', key='preprocessed_data_df')
-
-    for _, row in df_cleaned.iterrows():
-        # print("Insert Pre Processed Data", row)
-        pg_cursor.execute(
-            'INSERT INTO lecture_engagement_time (lecture_id, course_user_mapping_id, user_type, join_time, leave_time, overlapping_time_seconds, overlapping_time_minutes) '
-            'VALUES (%s, %s, %s, %s, %s, %s, %s);',
-            (
-                row['lecture_id'],
-                row['course_user_mapping_id'],
-                row['user_type'],
-                row['join_time'],
-                row['leave_time'],
-                row['overlapping_time_seconds'],
-                row['overlapping_time_minutes']
-            )
+    high_watermark = ti.xcom_pull(task_ids='fetch_data_and_preprocess', key='high_watermark')
+
+    columns = ['lecture_id', 'course_user_mapping_id', 'user_type', 'join_time', 'leave_time',
+               'overlapping_time_seconds', 'overlapping_time_minutes']
+    with task_metrics(ti) as metrics, metrics.load(), pg_connection('postgres_result_db') as pg_conn:
+        pg_cursor = pg_conn.cursor()
+        # The extracted sessions are reloaded in full, replacing the rows loaded for them by earlier runs.
+        delete_keys(pg_conn, 'lecture_engagement_time', 'lecture_id', ((int(key),) for key in df_cleaned['lecture_id'].unique()))
+        metrics.rows_written = bulk_upsert(
+            pg_conn,
+            'lecture_engagement_time',
+            columns=columns,
+            rows=df_cleaned[columns].itertuples(index=False, name=None),
+            metrics=metrics,
         )
-
-    pg_conn.commit()
+        # Advanced in the same transaction as the load, so a failed load is retried from the old watermark.
+        advance_watermark(pg_cursor, ti.dag_id, 'join_time', high_watermark, cast='timestamp')
 
 dag = DAG(
     'lecture_time_dag',
     default_args=default_args,
     concurrency=4,
     max_active_tasks=6,
-    max_active_runs=6,
+    # One run at a time, as every run reads and advances the same watermark.
+    max_active_runs=1,
     description='Live lecture ET data with overlapping time calculation and table creation/update',
     schedule_interval='0 1 * * *',
     catchup=False
 )
 
-create_table = PostgresOperator(
+ensure_replica_pool = PythonOperator(
+    task_id='ensure_replica_pool',
+    python_callable=create_replica_pool,
+    dag=dag
+)
+
+# Append-only: one partition per join_time month, so loads touch only the newest partition and
+# date-filtered readers prune the rest; rows without a join_time stay in the default partition.
+# A primary key or unique index of a partitioned table must include join_time, so nothing enforces
+# unique ids: they stay unique only because the load never writes id and every row takes the next
+# value of the serial sequence. The (id, join_time) index serves lookups by id and rejects only a
+# repeated (id, join_time) pair, not the same id with another or a null join_time.
+create_table = PythonOperator(
     task_id='create_table',
-    postgres_conn_id='postgres_result_db',
-    sql="""
+    python_callable=create_partitioned_table,
+    op_kwargs={
+        'postgres_conn_id': 'postgres_result_db',
+        'table': 'lecture_engagement_time',
+        'create_table_sql': '''
     CREATE TABLE IF NOT EXISTS lecture_engagement_time (
-        id serial not null PRIMARY KEY,
+        id serial not null,
         lecture_id bigint,
         course_user_mapping_id bigint,
         join_time timestamp,
@@ -291,13 +214,16 @@ create_table = PostgresOperator(
         user_type varchar(32),
         overlapping_time_seconds real,
         overlapping_time_minutes real
-    )
-    """,
+    ) PARTITION BY RANGE (join_time);
+    CREATE UNIQUE INDEX IF NOT EXISTS lecture_engagement_time_id_join_time_idx ON lecture_engagement_time (id, join_time);
+    ''',
+    },
     dag=dag
 )
 
 fetch_data = PythonOperator(
     task_id='fetch_data_and_preprocess',
+    **replica_pool('heavy'),
     python_callable=fetch_data_and_preprocess,
     provide_context=True,
     dag=dag
@@ -307,7 +233,8 @@ insert_data = PythonOperator(
     task_id='insert_preprocessed_data',
     python_callable=insert_preprocessed_data,
     provide_context=True,
+    outlets=[result_table('lecture_engagement_time')],
     dag=dag
 )
 
-create_table >> fetch_data >> insert_data
\ No newline at end of file
+ensure_replica_pool >> create_table >> fetch_data >> insert_data
\ No newline at end of file
@@ -1,9 +1,14 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 from airflow.providers.postgres.operators.postgres import PostgresOperator
-from airflow.providers.postgres.hooks.postgres import PostgresHook
 from datetime import datetime
-import pandas as pd
+from utils.connections import pg_connection
+from utils.indexes import index_migrations
+from utils.instrumentation import task_metrics
+from utils.loader import bulk_upsert, fingerprint_column_statement
+from utils.datasets import result_table
+from utils.pools import create_replica_pool, replica_pool
+
 default_args = {
     'owner': 'airflow',
     'depends_on_past': False,
@@ -12,16 +17,18 @@ default_args = {
 
 
 def execute_query_on_db(db_name, query):
-    pg_hook = PostgresHook(postgres_conn_id=db_name)
-    pg_conn = pg_hook.get_conn()
-    pg_cursor = pg_conn.cursor()
-    pg_cursor.execute(query)
-    columns = [desc[0] for desc in pg_cursor.description]
-    print(columns)
-    return pd.DataFrame(pg_cursor.fetchall(), columns=columns)
+    import pandas as pd
+
+    with pg_connection(db_name) as pg_conn:
+        pg_cursor = pg_conn.cursor()
+        pg_cursor.execute(query)
+        columns = [desc[0] for desc in pg_cursor.description]
+        return pd.DataFrame(pg_cursor.fetchall(), columns=columns)
 
 
 def join_two_tables(table1, table2, common_column):
+    import pandas as pd
+
     return pd.merge(table2, table1, on=common_column)
 
 
@@ -52,51 +59,34 @@ from openai_transcribeaudio'''
 
 
 def dump_joined_data_in_results_db(**kwargs):
-    def clean_input(data_type, data_value):
-        if data_type == 'string':
-            return 'null' if not data_value else f'\"{data_value}\"'
-        elif data_type == 'datetime':
-            return 'null' if not data_value else f'CAST(\'{data_value}\' As TIMESTAMP)'
-        else:
-            return data_value
-
-    pg_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    pg_conn = pg_hook.get_conn()
-    pg_cursor = pg_conn.cursor()
     ti = kwargs['ti']
-    transform_data_output = ti.xcom_pull(task_ids='join_python_data')
-
-    for i, transform_row in transform_data_output.iterrows():
-        pg_cursor.execute(
-                'INSERT INTO lsq_leads_joined_data (user_id, email, username, full_name, graduation_year_from_lsq, work_experience_from_lsq, graduation_year_from_product, prospect_id, current_ctc_ai, expected_ctc_ai, graduation_year_ai, current_employer_ai, is_working_professional_ai, years_of_work_experience_ai)'
-                'VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)'
-                'on conflict (user_id) do update set '
-                'email=EXCLUDED.email,'
-                'username = EXCLUDED.username,'
-                'graduation_year_from_lsq=EXCLUDED.graduation_year_from_lsq,'
-                'prospect_id= EXCLUDED.prospect_id,'
-                'current_ctc_ai=EXCLUDED.current_ctc_ai,'
-                'expected_ctc_ai=EXCLUDED.expected_ctc_ai,'
-                'graduation_year_ai=EXCLUDED.graduation_year_ai,'
-                'graduation_year_from_product=EXCLUDED.graduation_year_from_product;',
-                (
-                    transform_row['user_id'],
-                    transform_row['email'],
-                    transform_row['username'],
-                    transform_row['full_name'],
-                    transform_row['graduation_year_from_lsq'],
-                    transform_row['work_experience_from_lsq'],
-                    transform_row['graduation_year_from_product'],
-                    transform_row['prospect_id'],
-                    transform_row['current_ctc_ai'],
-                    transform_row['expected_ctc_ai'],
-                    transform_row['graduation_year_ai'],
-                    transform_row['current_employer_ai'],
-                    transform_row['is_working_professional_ai'],
-                    transform_row['years_of_work_experience_ai']
-                 )
+
+    columns = ['user_id', 'email', 'username', 'full_name', 'graduation_year_from_lsq',
+               'work_experience_from_lsq', 'graduation_year_from_product', 'prospect_id', 'current_ctc_ai',
+               'expected_ctc_ai', 'graduation_year_ai', 'current_employer_ai', 'is_working_professional_ai',
+               'years_of_work_experience_ai']
+    with task_metrics(ti) as metrics, metrics.load(), pg_connection('postgres_result_db') as pg_conn:
+        with metrics.query():
+            transform_data_output = ti.xcom_pull(task_ids='join_python_data')
+        metrics.rows_written = bulk_upsert(
+            pg_conn,
+            'lsq_leads_joined_data',
+            columns=columns,
+            rows=metrics.read_rows(transform_data_output[columns].itertuples(index=False, name=None)),
+            conflict_columns=['user_id'],
+            update_columns=[
+                'email',
+                'username',
+                'graduation_year_from_lsq',
+                'prospect_id',
+                'current_ctc_ai',
+                'expected_ctc_ai',
+                'graduation_year_ai',
+                'graduation_year_from_product',
+            ],
+            fingerprint=True,
+            metrics=metrics,
         )
-    pg_conn.commit()
 
 
 dag = DAG(
@@ -108,10 +98,17 @@ dag = DAG(
 )
 
 
+ensure_replica_pool = PythonOperator(
+    task_id='ensure_replica_pool',
+    python_callable=create_replica_pool,
+    dag=dag
+)
+
 create_table = PostgresOperator(
     task_id='create_table',
     postgres_conn_id='postgres_result_db',
-    sql='''CREATE TABLE IF NOT EXISTS lsq_leads_joined_data (
+    autocommit=True,
+    sql=['''CREATE TABLE IF NOT EXISTS lsq_leads_joined_data (
             user_id bigint not null PRIMARY KEY,
             email varchar(256),
             username varchar(256),
@@ -127,12 +124,13 @@ create_table = PostgresOperator(
             is_working_professional_ai varchar(256),
             years_of_work_experience_ai varchar(256)
         );
-    ''',
+    ''', fingerprint_column_statement('lsq_leads_joined_data'), *index_migrations('lsq_leads_joined_data')],
     dag=dag
 )
 
 join_python_data = PythonOperator(
     task_id='join_python_data',
+    **replica_pool('medium'),
     python_callable=join_lsq_prospects_with_sales_call_analysis_ai,
     provide_context=True,
     dag=dag
@@ -142,7 +140,8 @@ extract_python_data = PythonOperator(
     task_id='extract_python_data',
     python_callable=dump_joined_data_in_results_db,
     provide_context=True,
+    outlets=[result_table('lsq_leads_joined_data')],
     dag=dag
 )
 
-create_table >> join_python_data >> extract_python_data
+ensure_replica_pool >> create_table >> join_python_data >> extract_python_data
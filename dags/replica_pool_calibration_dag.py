@@ -0,0 +1,102 @@
+from airflow import DAG
+from airflow.operators.python import PythonOperator
+from datetime import datetime, timedelta
+import json
+import logging
+import math
+import statistics
+from utils.pools import COST_CLASSES, DEFAULT_REPLICA_POOL_SLOTS, REPLICA_POOL, cost_class_of, measured_cost_class
+
+log = logging.getLogger(__name__)
+
+default_args = {
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'start_date': datetime(2024, 1, 1),
+}
+
+# Runs ahead of the 20:30 batch, so the pool is sized before the replica tasks queue. Until its
+# first run the pool has the DEFAULT_REPLICA_POOL_SLOTS every DAG's ensure_replica_pool task creates it with.
+dag = DAG(
+    'replica_pool_calibration_dag',
+    default_args=default_args,
+    description='Sizes the postgres_read_replica pool and checks task cost classes against measured runtimes',
+    schedule_interval='0 19 * * *',
+    catchup=False,
+    max_active_runs=1,
+)
+
+
+def calibrate_replica_pool(**kwargs):
+    """
+    Read the runtimes of the successful postgres_read_replica pool task instances of the last
+    lookback_days from the metadata database, then
+
+    - size the pool so the measured nightly slot-seconds fit in the batch window, between
+      min_slots and max_slots,
+    - compare every task's declared cost class with the class of its median runtime and log
+      the tasks to reclassify,
+    - store the measured classes and runtimes in the replica_pool_cost_classes Variable.
+    """
+    from airflow.models import Pool, TaskInstance, Variable
+    from airflow.utils import timezone
+    from airflow.utils.session import create_session
+    from airflow.utils.state import TaskInstanceState
+
+    settings = Variable.get('replica_pool_settings', default_var={}, deserialize_json=True)
+    lookback_days = int(settings.get('lookback_days', 28))
+    window_minutes = int(settings.get('window_minutes', 120))
+    min_slots = int(settings.get('min_slots', DEFAULT_REPLICA_POOL_SLOTS))
+    max_slots = int(settings.get('max_slots', 32))
+
+    with create_session() as session:
+        rows = session.query(
+            TaskInstance.dag_id,
+            TaskInstance.task_id,
+            TaskInstance.pool_slots,
+            TaskInstance.duration,
+        ).filter(
+            TaskInstance.pool == REPLICA_POOL,
+            TaskInstance.state == TaskInstanceState.SUCCESS,
+            TaskInstance.end_date >= timezone.utcnow() - timedelta(days=lookback_days),
+            TaskInstance.duration.isnot(None),
+        ).all()
+
+    runtimes = {}
+    declared = {}
+    slot_seconds = 0.0
+    for dag_id, task_id, pool_slots, duration in rows:
+        runtimes.setdefault((dag_id, task_id), []).append(duration)
+        declared[(dag_id, task_id)] = cost_class_of(pool_slots)
+        slot_seconds += duration * pool_slots
+
+    nightly_slot_seconds = slot_seconds / lookback_days
+    slots = max(min_slots, min(max_slots, math.ceil(nightly_slot_seconds / (window_minutes * 60))))
+    Pool.create_or_update_pool(
+        REPLICA_POOL,
+        slots=slots,
+        description=f'postgres_read_replica queries, sized for {window_minutes} minute batch window',
+    )
+    log.info('%s pool: %s slots for %.0f measured slot-seconds a night', REPLICA_POOL, slots, nightly_slot_seconds)
+
+    measured = {}
+    for (dag_id, task_id), durations in sorted(runtimes.items()):
+        median_seconds = statistics.median(durations)
+        cost_class = measured_cost_class(median_seconds)
+        measured[f'{dag_id}.{task_id}'] = {'cost_class': cost_class, 'median_seconds': round(median_seconds)}
+        if cost_class != declared[(dag_id, task_id)]:
+            log.warning(
+                'Reclassify %s.%s: declared %s, median runtime %.0fs is %s (pool_slots=%s, priority_weight=%s)',
+                dag_id, task_id, declared[(dag_id, task_id)], median_seconds, cost_class,
+                COST_CLASSES[cost_class]['pool_slots'], COST_CLASSES[cost_class]['priority_weight'],
+            )
+    Variable.set('replica_pool_cost_classes', json.dumps(measured, indent=2, sort_keys=True))
+    return slots
+
+
+calibrate = PythonOperator(
+    task_id='calibrate_replica_pool',
+    python_callable=calibrate_replica_pool,
+    provide_context=True,
+    dag=dag
+)
@@ -0,0 +1,5 @@
+# Airflow DAGs of the result tables declared in table_specs/, one DAG per spec.
+from utils.dag_factory import build_table_dag, load_specs
+
+for spec in load_specs():
+    globals()[spec['dag_id']] = build_table_dag(spec)
@@ -0,0 +1,356 @@
+from airflow import DAG
+from airflow.operators.empty import EmptyOperator
+from airflow.operators.python import PythonOperator
+from airflow.providers.postgres.operators.postgres import PostgresOperator
+from datetime import datetime
+
+from utils.connections import pg_connection
+from utils.datasets import result_table
+from utils.indexes import index_migrations
+from utils.instrumentation import task_metrics
+from utils.watermarks import LATE_ROW_LOOKBACK, SINCE, advance_watermark, get_watermark
+
+# Per source: the user_activity_status_mapping column holding the user's last activity in it,
+# and the query of the users with rows since the watermark, as (user_id, activity_at, feed_at):
+# their newest activity among those rows and the newest feed column value seen, the next watermark.
+# The feed columns are indexed through index_migrations/, so each read is a range scan.
+SOURCES = {
+    'live_lectures': ('last_lecture_attended_on', f'''
+        with touched_lectures as
+            (select
+                lecture_id,
+                max(join_time) as feed_at
+            from
+                lecture_engagement_time
+            where join_time >= {SINCE}
+            group by 1),
+
+        raw_data as
+            (select
+                let.course_user_mapping_id,
+                let.lecture_id,
+                let.join_time,
+                let.leave_time,
+                extract('epoch' from let.leave_time - let.join_time) as time_spent_in_seconds,
+                let.user_type,
+                let.overlapping_time_seconds,
+                let.overlapping_time_minutes
+            from
+                lecture_engagement_time let
+            join touched_lectures
+                on touched_lectures.lecture_id = let.lecture_id
+            group by 1,2,3,4,5,6,7,8),
+
+        instructor_data as
+            (select
+                raw_data.lecture_id,
+                raw_data.course_user_mapping_id,
+                user_id,
+                sum(time_spent_in_seconds) / 60 as total_inst_time_in_mins
+            from
+                raw_data
+            join course_user_mapping
+                on course_user_mapping.course_user_mapping_id = raw_data.course_user_mapping_id
+            where user_type like 'Instructor'
+            group by 1,2,3),
+
+        users_data as
+            (select
+                raw_data.lecture_id,
+                raw_data.course_user_mapping_id,
+                course_user_mapping.user_id,
+                instructor_data.total_inst_time_in_mins,
+                sum(overlapping_time_minutes) as total_overlap_time_in_mins
+            from
+                raw_data
+            join course_user_mapping
+                on course_user_mapping.course_user_mapping_id = raw_data.course_user_mapping_id
+            left join instructor_data
+                on instructor_data.lecture_id = raw_data.lecture_id
+            where user_type like 'User'
+            group by 1,2,3,4)
+
+        select
+            users_data.user_id,
+            max(date(l.start_timestamp)) filter (
+                where (users_data.total_overlap_time_in_mins / users_data.total_inst_time_in_mins) >= 0.1) as activity_at,
+            max(touched_lectures.feed_at) as feed_at
+        from
+            users_data
+        join lectures l
+            on l.lecture_id = users_data.lecture_id
+        join touched_lectures
+            on touched_lectures.lecture_id = users_data.lecture_id
+        group by 1
+    '''),
+    'assignments': ('last_question_attempted_on', f'''
+        select
+            user_id,
+            max(question_started_at) as activity_at,
+            max(question_started_at) as feed_at
+        from
+            assignment_question_user_mapping_new
+        where question_started_at >= {SINCE}
+        group by 1
+    '''),
+    'assessments': ('last_quiz_attempted_on', f'''
+        select
+            user_id,
+            max(option_marked_at) as activity_at,
+            max(option_marked_at) as feed_at
+        from
+            assessment_question_user_mapping
+        where option_marked_at >= {SINCE}
+        group by 1
+    '''),
+    'mocks': ('last_mock_date', f'''
+        select
+            user_id,
+            max(join_time) filter (where overlapping_time_minutes >= 1) as activity_at,
+            max(join_time) as feed_at
+        from
+            video_sessions_one_to_one_course_user_reports
+        where one_to_one_type <> 7 and join_time >= {SINCE}
+        group by 1
+    '''),
+    'one_on_ones': ('last_one_on_one_date', f'''
+        select
+            user_id,
+            max(join_time) filter (where overlapping_time_minutes >= 1) as activity_at,
+            max(join_time) as feed_at
+        from
+            video_sessions_one_to_one_course_user_reports
+        where one_to_one_type = 7 and join_time >= {SINCE}
+        group by 1
+    '''),
+    'recorded_lectures': ('last_recorded_lecture_watched_on', f'''
+        select
+            cum.user_id,
+            max(rlcur.lecture_watch_date) filter (where rlcur.total_time_watched_in_mins >= 1) as activity_at,
+            max(rlcur.lecture_watch_date) as feed_at
+        from
+            recorded_lectures_course_user_reports rlcur
+        join course_user_mapping cum
+            on cum.course_user_mapping_id = rlcur.course_user_mapping_id
+        where rlcur.lecture_watch_date >= {SINCE}
+        group by 1
+    '''),
+    'group_sessions': ('last_group_session_date', f'''
+        select
+            cum.user_id,
+            max(gscur.join_time) filter (where gscur.overlapping_time_minutes >= 1) as activity_at,
+            max(gscur.join_time) as feed_at
+        from
+            group_session_course_user_reports gscur
+        join course_user_mapping cum
+            on cum.course_user_mapping_id = gscur.course_user_mapping_id
+        where gscur.join_time >= {SINCE}
+        group by 1
+    '''),
+}
+
+
+def fold_in_activity(**kwargs):
+    """
+    Fold the source rows added since the last run into each user's last activity per source.
+
+    A column only moves forward, to the newest activity among the new rows. With
+    {"full_refresh": true} in the run's conf the columns are cleared and rebuilt from the whole
+    history instead, e.g. after source rows were deleted. Each source's watermark advances in
+    the same transaction as the fold-in.
+    """
+    ti = kwargs['ti']
+    dag_run = kwargs.get('dag_run')
+    full_refresh = bool(dag_run and dag_run.conf and dag_run.conf.get('full_refresh'))
+    with task_metrics(ti) as metrics, pg_connection('postgres_result_db') as pg_conn:
+        watermarks = {
+            source: None if full_refresh else get_watermark(pg_conn, ti.dag_id, source)
+            for source in SOURCES
+        }
+        pg_cursor = pg_conn.cursor()
+        if full_refresh:
+            pg_cursor.execute(
+                'UPDATE user_activity_status_mapping SET '
+                + ', '.join(f'{column} = null' for column, _ in SOURCES.values()) + ';'
+            )
+        for source, (column, sql) in SOURCES.items():
+            with metrics.query():
+                pg_cursor.execute(
+                    f'CREATE TEMP TABLE new_activity ON COMMIT DROP AS {sql};',
+                    {'watermark': watermarks[source], 'lookback': LATE_ROW_LOOKBACK}
+                )
+                metrics.rows_read += pg_cursor.rowcount
+            with metrics.load():
+                pg_cursor.execute(f'''
+                    INSERT INTO user_activity_status_mapping (user_id, student_name, lead_type, {column})
+                    select
+                        ui.user_id,
+                        concat(ui.first_name,' ', ui.last_name),
+                        ui.lead_type,
+                        new_activity.activity_at
+                    from
+                        new_activity
+                    join users_info ui
+                        on ui.user_id = new_activity.user_id
+                    where new_activity.activity_at is not null
+                    on conflict (user_id) do update set {column} = EXCLUDED.{column}
+                    where user_activity_status_mapping.{column} is null
+                        or EXCLUDED.{column} > user_activity_status_mapping.{column};
+                ''')
+                users_updated = pg_cursor.rowcount
+                metrics.rows_written += users_updated
+                pg_cursor.execute('select max(feed_at) from new_activity;')
+                advance_watermark(pg_cursor, ti.dag_id, source, pg_cursor.fetchone()[0], cast='timestamp')
+                pg_cursor.execute('DROP TABLE new_activity;')
+            ti.log.info('%s: %s users with newer activity', source, users_updated)
+        pg_cursor.close()
+    return metrics.rows_written
+
+
+default_args = {
+    'owner': 'airflow',
+    'max_active_tasks': 6,
+    'max_active_runs': 6,
+    'concurrency': 4,
+    'depends_on_past': False,
+    'start_date': datetime(2023, 3, 16),
+}
+
+dag = DAG(
+    'user_activity_status_mapping_dag',
+    default_args=default_args,
+    concurrency=4,
+    max_active_tasks=6,
+    # Runs share the new_activity fold-in and the watermarks, so they must not overlap.
+    max_active_runs=1,
+    description='assigns activity status as active/ inactive to each user_id irrespective of user course',
+    schedule=[
+        result_table('assessment_question_user_mapping'),
+        result_table('assessments'),
+        result_table('assignment_question_user_mapping_new'),
+        result_table('assignments'),
+        result_table('course_user_mapping'),
+        result_table('group_session_course_user_reports'),
+        result_table('group_sessions'),
+        result_table('lecture_engagement_time'),
+        result_table('lectures'),
+        result_table('recorded_lectures_course_user_reports'),
+        result_table('users_info'),
+        result_table('video_sessions_one_to_one_course_user_reports'),
+    ],
+    catchup=False
+)
+
+create_table = PostgresOperator(
+    task_id='create_table',
+    postgres_conn_id='postgres_result_db',
+    autocommit=True,
+    sql=['''CREATE TABLE IF NOT EXISTS user_activity_status_mapping (
+            id serial,
+            user_id bigint not null PRIMARY KEY,
+            student_name text,
+            lead_type text,
+            latest_activity_date timestamp,
+            activity_status_7_days text,
+            activity_status_14_days text,
+            activity_status_30_days text,
+            last_activity text,
+            last_lecture_attended_on date,
+            last_question_attempted_on timestamp,
+            last_quiz_attempted_on timestamp,
+            last_mock_date timestamp,
+            last_one_on_one_date timestamp,
+            last_recorded_lecture_watched_on date,
+            last_group_session_date timestamp
+        );
+    ''', *index_migrations('user_activity_status_mapping')],
+    dag=dag
+)
+
+fold_in_new_activity = PythonOperator(
+    task_id='fold_in_activity',
+    python_callable=fold_in_activity,
+    dag=dag
+)
+
+# Adds the users without any activity and re-derives latest_activity_date, the 7/14/30 day
+# statuses and last_activity, writing only the users whose activity changed or who crossed
+# a window boundary since the last run.
+refresh_activity_status = PostgresOperator(
+    task_id='refresh_activity_status',
+    postgres_conn_id='postgres_result_db',
+    sql='''INSERT INTO user_activity_status_mapping (user_id, student_name, lead_type)
+        select
+            ui.user_id,
+            concat(ui.first_name,' ', ui.last_name) as student_name,
+            ui.lead_type
+        from
+            users_info ui
+        on conflict (user_id) do update set
+            student_name = EXCLUDED.student_name,
+            lead_type = EXCLUDED.lead_type
+        where (user_activity_status_mapping.student_name, user_activity_status_mapping.lead_type)
+            is distinct from (EXCLUDED.student_name, EXCLUDED.lead_type);
+
+        with latest as
+            (select
+                *,
+                greatest
+                    (last_lecture_attended_on, last_question_attempted_on, last_quiz_attempted_on, last_mock_date,
+                    last_one_on_one_date, last_recorded_lecture_watched_on, last_group_session_date) as latest
+            from
+                user_activity_status_mapping),
+
+        status as
+            (select
+                user_id,
+                latest as latest_activity_date,
+                case
+                    when date(latest) - date((current_date - interval '7 days')) >= 0 then 'Active'
+                    else 'Inactive'
+                end as activity_status_7_days,
+                case
+                    when date(latest) - date((current_date - interval '14 days')) >= 0 then 'Active'
+                    else 'Inactive'
+                end as activity_status_14_days,
+                case
+                    when date(latest) - date((current_date - interval '30 days')) >= 0 then 'Active'
+                    else 'Inactive'
+                end as activity_status_30_days,
+                case
+                    when latest = last_lecture_attended_on then 'Live Lecture'
+                    when latest = last_question_attempted_on then 'Coding Question'
+                    when latest = last_quiz_attempted_on then 'MCQ Question'
+                    when latest = last_mock_date then 'Mock Interview'
+                    when latest = last_one_on_one_date then 'One-on-One'
+                    when latest = last_recorded_lecture_watched_on then 'Recorded Lecture'
+                    when latest = last_group_session_date then 'Group Session'
+                    else 'No Activity'
+                end as last_activity
+            from
+                latest)
+
+        UPDATE user_activity_status_mapping uasm set
+            latest_activity_date = status.latest_activity_date,
+            activity_status_7_days = status.activity_status_7_days,
+            activity_status_14_days = status.activity_status_14_days,
+            activity_status_30_days = status.activity_status_30_days,
+            last_activity = status.last_activity
+        from
+            status
+        where status.user_id = uasm.user_id
+            and (uasm.latest_activity_date, uasm.activity_status_7_days, uasm.activity_status_14_days,
+                uasm.activity_status_30_days, uasm.last_activity)
+            is distinct from (status.latest_activity_date, status.activity_status_7_days,
+                status.activity_status_14_days, status.activity_status_30_days, status.last_activity);
+    ''',
+    dag=dag
+)
+
+publish_result_table = EmptyOperator(
+    task_id='publish_result_table',
+    outlets=[result_table('user_activity_status_mapping')],
+    dag=dag
+)
+
+create_table >> fold_in_new_activity >> refresh_activity_status >> publish_result_table
@@ -1,8 +1,13 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 from airflow.providers.postgres.operators.postgres import PostgresOperator
-from airflow.providers.postgres.hooks.postgres import PostgresHook
 from datetime import datetime
+from utils.connections import pg_connection
+from utils.indexes import index_migrations
+from utils.instrumentation import task_metrics
+from utils.loader import bulk_upsert, fingerprint_column_statement
+from utils.datasets import result_table
+from utils.pools import create_replica_pool, replica_pool
 
 default_args = {
     'owner': 'airflow',
@@ -20,10 +25,17 @@ dag = DAG(
 )
 
 
+ensure_replica_pool = PythonOperator(
+    task_id='ensure_replica_pool',
+    python_callable=create_replica_pool,
+    dag=dag
+)
+
 create_table = PostgresOperator(
     task_id='create_table',
     postgres_conn_id='postgres_result_db',
-    sql='''CREATE TABLE IF NOT EXISTS users_info (
+    autocommit=True,
+    sql=['''CREATE TABLE IF NOT EXISTS users_info (
             id serial,
             user_id bigint not null PRIMARY KEY,
             first_name varchar(100),
@@ -56,13 +68,14 @@ create_table = PostgresOperator(
             marketing_url_structure_slug varchar(256),
             signup_graduation_year int
         );
-    ''',
+    ''', fingerprint_column_statement('users_info'), *index_migrations('users_info')],
     dag=dag
 )
 
 transform_data = PostgresOperator(
     task_id='transform_data',
     postgres_conn_id='postgres_read_replica',
+    **replica_pool('heavy'),
     sql='''with lead_type_table as(
             select distinct 
                 user_id,
@@ -169,86 +182,87 @@ transform_data = PostgresOperator(
     dag=dag
 )
 
-def extract_exception_logs(**kwargs):
-    transform_data_output = kwargs['ti'].xcom_pull(task_ids=extract_python_data)
-    for logs in transform_data_output:
-        print(logs)
-
-
 def extract_data_to_nested(**kwargs):
-    def clean_input(data_type, data_value):
-        if data_type == 'string':
-            return 'null' if not data_value else f'\"{data_value}\"'
-        elif data_type == 'datetime':
-            return 'null' if not data_value else f'CAST(\'{data_value}\' As TIMESTAMP)'
-        else:
-            return data_value
-
-    pg_hook = PostgresHook(postgres_conn_id='postgres_result_db')
-    pg_conn = pg_hook.get_conn()
-    pg_cursor = pg_conn.cursor()
     ti = kwargs['ti']
-    transform_data_output = ti.xcom_pull(task_ids='transform_data')
-    for transform_row in transform_data_output:
-            pg_cursor.execute(
-                    'INSERT INTO users_info (user_id,first_name,last_name,date_joined,last_login,username,email,phone,'
-                    'current_location_city,current_location_state,gender,date_of_birth,utm_source,utm_medium,utm_campaign,utm_hash,'
-                    'tenth_marks,twelfth_marks,bachelors_marks,bachelors_grad_year,bachelors_degree,'
-                    'bachelors_field_of_study,masters_marks,masters_grad_year,masters_degree,masters_field_of_study,lead_type,'
-                    'course_structure_slug,marketing_url_structure_slug,signup_graduation_year) '
-                    'VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s) '
-                    'on conflict (user_id) do update set first_name=EXCLUDED.first_name,'
-                    'last_name=EXCLUDED.last_name,last_login=EXCLUDED.last_login,'
-                    'username=EXCLUDED.username,email=EXCLUDED.email,phone=EXCLUDED.phone,'
-                    'current_location_city=EXCLUDED.current_location_city,current_location_state=EXCLUDED.current_location_state,'
-                    'gender=EXCLUDED.gender,date_of_birth=EXCLUDED.date_of_birth,'
-                    'utm_source=EXCLUDED.utm_source,utm_medium=EXCLUDED.utm_medium,utm_campaign=EXCLUDED.utm_campaign,utm_hash,'
-                    'tenth_marks=EXCLUDED.tenth_marks,twelfth_marks=EXCLUDED.twelfth_marks,'
-                    'bachelors_marks=EXCLUDED.bachelors_marks,bachelors_grad_year=EXCLUDED.bachelors_grad_year,'
-                    'bachelors_degree=EXCLUDED.bachelors_degree,bachelors_field_of_study=EXCLUDED.bachelors_field_of_study,'
-                    'masters_marks=EXCLUDED.masters_marks,masters_grad_year=EXCLUDED.masters_grad_year,'
-                    'masters_degree=EXCLUDED.masters_degree,masters_field_of_study=EXCLUDED.masters_field_of_study,'
-                    'lead_type=EXCLUDED.lead_type,course_structure_slug=EXCLUDED.course_structure_slug,'
-                    'marketing_url_structure_slug=EXCLUDED.marketing_url_structure_slug,'
-                    'signup_graduation_year=EXCLUDED.signup_graduation_year ;',
-                    (
-                        transform_row[0],
-                        transform_row[1],
-                        transform_row[2],
-                        transform_row[3],
-                        transform_row[4],
-                        transform_row[5],
-                        transform_row[6],
-                        transform_row[7],
-                        transform_row[8],
-                        transform_row[9],
-                        transform_row[10],
-                        transform_row[11],
-                        transform_row[12],
-                        transform_row[13],
-                        transform_row[14],
-                        transform_row[15],
-                        transform_row[16],
-                        transform_row[17],
-                        transform_row[18],
-                        transform_row[19],
-                        transform_row[20],
-                        transform_row[21],
-                        transform_row[22],
-                        transform_row[23],
-                        transform_row[24],
-                        transform_row[25],
-                        transform_row[26],
-                        transform_row[27],
-                        transform_row[28],
-                    )
-            )
-            pg_conn.commit()
+    with task_metrics(ti) as metrics, metrics.load(), pg_connection('postgres_result_db') as pg_conn:
+        with metrics.query():
+            transform_data_output = ti.xcom_pull(task_ids='transform_data')
+        metrics.rows_written = bulk_upsert(
+            pg_conn,
+            'users_info',
+            columns=[
+                'user_id',
+                'first_name',
+                'last_name',
+                'date_joined',
+                'last_login',
+                'username',
+                'email',
+                'phone',
+                'current_location_city',
+                'current_location_state',
+                'gender',
+                'date_of_birth',
+                'utm_source',
+                'utm_medium',
+                'utm_campaign',
+                'utm_hash',
+                'tenth_marks',
+                'twelfth_marks',
+                'bachelors_marks',
+                'bachelors_grad_year',
+                'bachelors_degree',
+                'bachelors_field_of_study',
+                'masters_marks',
+                'masters_grad_year',
+                'masters_degree',
+                'masters_field_of_study',
+                'lead_type',
+                'course_structure_slug',
+                'marketing_url_structure_slug',
+                'signup_graduation_year',
+            ],
+            rows=metrics.read_rows(transform_data_output),
+            conflict_columns=['user_id'],
+            update_columns=[
+                'first_name',
+                'last_name',
+                'last_login',
+                'username',
+                'email',
+                'phone',
+                'current_location_city',
+                'current_location_state',
+                'gender',
+                'date_of_birth',
+                'utm_source',
+                'utm_medium',
+                'utm_campaign',
+                'utm_hash',
+                'tenth_marks',
+                'twelfth_marks',
+                'bachelors_marks',
+                'bachelors_grad_year',
+                'bachelors_degree',
+                'bachelors_field_of_study',
+                'masters_marks',
+                'masters_grad_year',
+                'masters_degree',
+                'masters_field_of_study',
+                'lead_type',
+                'course_structure_slug',
+                'marketing_url_structure_slug',
+                'signup_graduation_year',
+            ],
+            fingerprint=True,
+            metrics=metrics,
+        )
 
 extract_python_data = PythonOperator(
     task_id='extract_python_data',
     python_callable=extract_data_to_nested,
     provide_context=True,
+    outlets=[result_table('users_info')],
     dag=dag
 )
 
@@ -259,4 +273,4 @@ extract_python_data = PythonOperator(
 #     dag=dag
 # )
 
-create_table >> transform_data >> extract_python_data
+ensure_replica_pool >> create_table >> transform_data >> extract_python_data
@@ -0,0 +1,25 @@
+from contextlib import contextmanager
+
+
+@contextmanager
+def pg_connection(conn_id):
+    """
+    Open a psycopg2 connection to conn_id for the duration of a with block.
+
+    The transaction is committed when the block completes and rolled back when it raises, and
+    the connection is closed either way, so callables never leak it.
+    """
+    from airflow.providers.postgres.hooks.postgres import PostgresHook
+
+    pg_conn = PostgresHook(postgres_conn_id=conn_id).get_conn()
+    try:
+        yield pg_conn
+        pg_conn.commit()
+    except BaseException:
+        try:
+            pg_conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        pg_conn.close()
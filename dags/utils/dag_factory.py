@@ -0,0 +1,294 @@
+import os
+from datetime import date, datetime
+
+import yaml
+from airflow import DAG
+from airflow.operators.empty import EmptyOperator
+from airflow.operators.python import PythonOperator
+from airflow.providers.postgres.operators.postgres import PostgresOperator
+
+from utils.connections import pg_connection
+from utils.datasets import result_table
+from utils.indexes import index_migrations
+from utils.instrumentation import task_metrics
+from utils.loader import bulk_upsert, fingerprint_column_statement, prune_missing_keys, rebuild_table
+from utils.pools import REPLICA_POOL, create_replica_pool, replica_pool
+from utils.sharding import plan_id_ranges
+from utils.streaming import StreamingExtractOperator
+from utils.watermarks import advance_watermark, get_watermark
+
+SPEC_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'table_specs')
+TARGET_CONN_ID = 'postgres_result_db'
+DEFAULT_MAX_SHARDS = "{{ var.value.get('max_shards_per_dag', 50) }}"
+
+MODES = ('streaming', 'xcom')
+LOADS = ('upsert', 'rebuild')
+
+
+def load_specs(directory=SPEC_DIRECTORY):
+    """The table specs in directory, one YAML document per file, sorted by file name."""
+    specs = []
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(('.yaml', '.yml')):
+            with open(os.path.join(directory, file_name)) as spec_file:
+                spec = yaml.safe_load(spec_file)
+            spec.setdefault('dag_id', os.path.splitext(file_name)[0])
+            specs.append(spec)
+    return specs
+
+
+def _datetime(value):
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def _check_spec(spec):
+    mode = spec.get('mode', 'streaming')
+    load = spec.get('load', 'upsert')
+    if mode not in MODES:
+        raise ValueError(f"{spec['dag_id']}: mode must be one of {MODES}, not {mode!r}")
+    if load not in LOADS:
+        raise ValueError(f"{spec['dag_id']}: load must be one of {LOADS}, not {load!r}")
+    if (spec.get('sharding') or spec.get('incremental')) and mode != 'streaming':
+        raise ValueError(f"{spec['dag_id']}: sharding and incremental loads need mode: streaming")
+    if spec.get('sharding') and spec.get('incremental'):
+        raise ValueError(f"{spec['dag_id']}: sharding and incremental cannot be combined")
+    if load == 'rebuild' and (spec.get('sharding') or spec.get('incremental')):
+        raise ValueError(f"{spec['dag_id']}: a rebuild load reads the whole source in one task")
+
+
+def _source_pool(source, cost_class=None):
+    if source['conn_id'] != REPLICA_POOL:
+        return {}
+    return replica_pool(cost_class or source.get('cost_class', 'medium'))
+
+
+def read_watermark(table, column, **kwargs):
+    """PythonOperator callable returning {'watermark': ...} for the incremental extract's parameters."""
+    with pg_connection(TARGET_CONN_ID) as pg_conn:
+        watermark = get_watermark(
+            pg_conn, kwargs['ti'].dag_id, f'{table}.{column}', bootstrap_query=f'select max({column}) from {table};')
+    return {'watermark': watermark}
+
+
+def store_watermark(table, column, **kwargs):
+    """PythonOperator callable advancing the watermark to the newest value loaded into table."""
+    with pg_connection(TARGET_CONN_ID) as pg_conn:
+        pg_cursor = pg_conn.cursor()
+        pg_cursor.execute(f'select max({column}) from {table};')
+        advance_watermark(pg_cursor, kwargs['ti'].dag_id, f'{table}.{column}', pg_cursor.fetchone()[0])
+        pg_cursor.close()
+
+
+def load_transformed_rows(table, columns, conflict_columns=None, update_columns=None, fingerprint=True,
+                          rebuild=False, **kwargs):
+    """PythonOperator callable loading the rows transform_data pushed to XCom (mode: xcom)."""
+    with task_metrics(kwargs['ti']) as metrics:
+        with metrics.query():
+            rows = kwargs['ti'].xcom_pull(task_ids='transform_data')
+        with metrics.load(), pg_connection(TARGET_CONN_ID) as pg_conn:
+            if rebuild:
+                metrics.rows_written = rebuild_table(
+                    pg_conn, table, columns=columns, rows=metrics.read_rows(rows), conflict_columns=conflict_columns,
+                    metrics=metrics,
+                )
+            else:
+                metrics.rows_written = bulk_upsert(
+                    pg_conn,
+                    table,
+                    columns=columns,
+                    rows=metrics.read_rows(rows),
+                    conflict_columns=conflict_columns,
+                    update_columns=update_columns,
+                    fingerprint=fingerprint,
+                    metrics=metrics,
+                )
+    return metrics.rows_written
+
+
+def prune_deleted_rows(source_conn_id, key_query, table, key_column, **kwargs):
+    """PythonOperator callable deleting the rows of table whose key key_query no longer returns."""
+    with pg_connection(source_conn_id) as source_conn, pg_connection(TARGET_CONN_ID) as target_conn:
+        source_cursor = source_conn.cursor(name=f'{table}_keys')
+        source_cursor.itersize = 50000
+        source_cursor.execute(key_query)
+        rows_deleted = prune_missing_keys(target_conn, table, key_column, source_cursor)
+        source_cursor.close()
+    return rows_deleted
+
+
+def build_table_dag(spec):
+    """
+    Build the create_table -> extract -> load DAG of one result table from its spec.
+
+    A spec (one YAML file in table_specs/) names the source connection and query, the target table
+    with its CREATE TABLE statement, the conflict and update columns and the schedule. How the
+    rows move is chosen per spec:
+
+    - mode: streaming (default) runs the query on a named cursor and loads the rows as they
+      arrive in one task; mode: xcom keeps the transform_data -> extract_python_data pair.
+      A source on TARGET_CONN_ID always streams, which StreamingExtractOperator turns into a
+      pushdown: one INSERT ... SELECT inside the database, no rows pulled out and copied back.
+    - load: upsert (default) merges with bulk_upsert, load: rebuild replaces its contents in one transaction (rebuild_table).
+    - sharding: {cost_query, max_shards} maps the extract over cost-balanced id ranges;
+      the query filters on %(start_id)s and %(end_id)s.
+    - incremental: {column} only extracts rows past the newest column value already loaded;
+      the query filters on %(watermark)s (None on the first run).
+    - prune: {key_query, key_column} deletes the rows whose key the source no longer has.
+
+    create_table also applies the table's index_migrations/<table>.sql (see utils.indexes) and,
+    for an upsert with update_columns and fingerprint (default true), adds its fingerprint column.
+    """
+    _check_spec(spec)
+    table = spec['table']
+    source = spec['source']
+    rebuild = spec.get('load', 'upsert') == 'rebuild'
+    schedule = spec.get('schedule')
+    if isinstance(schedule, list):
+        schedule = [result_table(upstream_table) for upstream_table in schedule]
+
+    default_args = {
+        'owner': 'airflow',
+        'depends_on_past': False,
+        **spec.get('default_args', {}),
+        'start_date': _datetime(spec['start_date']),
+    }
+    dag = DAG(
+        spec['dag_id'],
+        default_args=default_args,
+        description=spec.get('description'),
+        schedule=schedule,
+        catchup=False,
+        **spec.get('dag_args', {}),
+    )
+
+    create_table_sql = [spec['create_table'], *index_migrations(table)]
+    if spec.get('fingerprint', True) and spec.get('update_columns') and not rebuild:
+        create_table_sql.insert(1, fingerprint_column_statement(table))
+    create_table = PostgresOperator(
+        task_id='create_table',
+        postgres_conn_id=TARGET_CONN_ID,
+        autocommit=True,
+        sql=create_table_sql,
+        dag=dag
+    )
+    if source['conn_id'] == REPLICA_POOL:
+        ensure_replica_pool = PythonOperator(
+            task_id='ensure_replica_pool',
+            python_callable=create_replica_pool,
+            dag=dag
+        )
+        ensure_replica_pool >> create_table
+    publish_result_table = EmptyOperator(
+        task_id='publish_result_table',
+        outlets=[result_table(table)],
+        dag=dag
+    )
+    load_arguments = {
+        'table': table,
+        'columns': spec['columns'],
+        'conflict_columns': spec.get('conflict_columns'),
+        'update_columns': spec.get('update_columns'),
+        'fingerprint': spec.get('fingerprint', True),
+        'rebuild': rebuild,
+    }
+
+    if spec.get('mode', 'streaming') == 'xcom' and source['conn_id'] != TARGET_CONN_ID:
+        transform_data = PostgresOperator(
+            task_id='transform_data',
+            postgres_conn_id=source['conn_id'],
+            **_source_pool(source),
+            sql=source['sql'],
+            dag=dag
+        )
+        extract_python_data = PythonOperator(
+            task_id='extract_python_data',
+            python_callable=load_transformed_rows,
+            op_kwargs=load_arguments,
+            dag=dag
+        )
+        create_table >> transform_data >> extract_python_data
+        loaded = extract_python_data
+    elif spec.get('sharding'):
+        sharding = spec['sharding']
+        pool = _source_pool(source)
+        plan_shards = PythonOperator(
+            task_id='plan_shards',
+            **_source_pool(source, 'light'),
+            python_callable=plan_id_ranges,
+            op_kwargs={
+                'postgres_conn_id': source['conn_id'],
+                'pool': pool.get('pool', 'default_pool'),
+                'pool_slots': pool.get('pool_slots', 1),
+                'cost_query': sharding['cost_query'],
+                'max_shards': sharding.get('max_shards', DEFAULT_MAX_SHARDS),
+            },
+            dag=dag,
+        )
+        extract_and_load_data = StreamingExtractOperator.partial(
+            task_id='extract_and_load_data',
+            source_conn_id=source['conn_id'],
+            **pool,
+            **load_arguments,
+            sql=source['sql'],
+            dag=dag,
+        ).expand(parameters=plan_shards.output)
+        create_table >> plan_shards >> extract_and_load_data
+        loaded = extract_and_load_data
+    elif spec.get('incremental'):
+        column = spec['incremental']['column']
+        read_old_watermark = PythonOperator(
+            task_id='read_watermark',
+            python_callable=read_watermark,
+            op_kwargs={'table': table, 'column': column},
+            dag=dag
+        )
+        extract_and_load_data = StreamingExtractOperator(
+            task_id='extract_and_load_data',
+            source_conn_id=source['conn_id'],
+            **_source_pool(source),
+            **load_arguments,
+            sql=source['sql'],
+            parameters=read_old_watermark.output,
+            dag=dag,
+        )
+        store_new_watermark = PythonOperator(
+            task_id='advance_watermark',
+            python_callable=store_watermark,
+            op_kwargs={'table': table, 'column': column},
+            dag=dag
+        )
+        create_table >> read_old_watermark >> extract_and_load_data >> store_new_watermark
+        loaded = store_new_watermark
+    else:
+        extract_and_load_data = StreamingExtractOperator(
+            task_id='extract_and_load_data',
+            source_conn_id=source['conn_id'],
+            **_source_pool(source),
+            **load_arguments,
+            sql=source['sql'],
+            dag=dag,
+        )
+        create_table >> extract_and_load_data
+        loaded = extract_and_load_data
+
+    if spec.get('prune'):
+        prune = PythonOperator(
+            task_id='prune_deleted_rows',
+            **_source_pool(source, 'light'),
+            python_callable=prune_deleted_rows,
+            op_kwargs={
+                'source_conn_id': source['conn_id'],
+                'key_query': spec['prune']['key_query'],
+                'table': table,
+                'key_column': spec['prune']['key_column'],
+            },
+            dag=dag
+        )
+        loaded >> prune
+        loaded = prune
+
+    loaded >> publish_result_table
+    return dag
+
@@ -0,0 +1,6 @@
+from airflow.datasets import Dataset
+
+
+def result_table(table):
+    """Dataset for a table in the postgres_result_db results database."""
+    return Dataset(f'postgres://postgres_result_db/public/{table}')
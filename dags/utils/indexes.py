@@ -0,0 +1,40 @@
+import hashlib
+import os
+
+MIGRATION_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'index_migrations')
+
+# Postgres truncates identifiers longer than this, which would make IF NOT EXISTS compare the wrong name.
+MAX_IDENTIFIER_LENGTH = 63
+
+
+def index_name(table, columns):
+    name = f"{table}_{'_'.join(columns)}_idx"
+    if len(name) > MAX_IDENTIFIER_LENGTH:
+        digest = hashlib.md5(name.encode()).hexdigest()[:8]
+        name = f'{name[:MAX_IDENTIFIER_LENGTH - 13]}_{digest}_idx'
+    return name
+
+
+def create_index_statement(table, columns):
+    return (
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(table, columns)} '
+        f"ON {table} ({', '.join(columns)});"
+    )
+
+
+def index_migrations(table, directory=MIGRATION_DIRECTORY):
+    """
+    The CREATE INDEX CONCURRENTLY statements of index_migrations/<table>.sql, [] if there is none.
+
+    The files hold one statement per line and -- comments, as written by tools/index_advisor.py.
+    create_table tasks run them after their CREATE TABLE with autocommit, as CONCURRENTLY cannot
+    run inside a transaction; IF NOT EXISTS makes every run after the first a no-op.
+    """
+    path = os.path.join(directory, f'{table}.sql')
+    if not os.path.exists(path):
+        return []
+    with open(path) as migration_file:
+        return [
+            line.strip() for line in migration_file
+            if line.strip() and not line.strip().startswith('--')
+        ]
@@ -0,0 +1,146 @@
+import logging
+import resource
+import time
+from contextlib import contextmanager
+
+from airflow.stats import Stats
+
+from utils.connections import pg_connection
+
+STATS_TABLE = 'pipeline_run_stats'
+STATS_CONN_ID = 'postgres_result_db'
+
+log = logging.getLogger(__name__)
+
+_EXHAUSTED = object()
+
+
+def create_stats_table(pg_cursor):
+    pg_cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+            id bigserial PRIMARY KEY,
+            dag_id text not null,
+            task_id text not null,
+            run_id text not null,
+            map_index int not null default -1,
+            try_number int,
+            state text not null,
+            rows_read bigint,
+            rows_written bigint,
+            payload_bytes bigint,
+            query_seconds double precision,
+            load_seconds double precision,
+            peak_rss_bytes bigint,
+            started_at timestamptz not null,
+            finished_at timestamptz not null default now()
+        );
+        CREATE INDEX IF NOT EXISTS {STATS_TABLE}_dag_id_task_id_started_at_idx
+            ON {STATS_TABLE} (dag_id, task_id, started_at);
+    ''')
+
+
+def _peak_rss_bytes():
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class TaskMetrics:
+    """
+    Counters of one task's extract and load phases.
+
+    query_seconds is the time spent waiting on the source query (running it and fetching its
+    rows), load_seconds the time spent loading with the fetches subtracted, so the two add up
+    for a task that streams rows from one into the other.
+    """
+
+    def __init__(self, ti):
+        self.ti = ti
+        self.rows_read = 0
+        self.rows_written = 0
+        self.payload_bytes = 0
+        self.query_seconds = 0.0
+        self.load_seconds = 0.0
+        self.started_at = time.time()
+
+    @contextmanager
+    def query(self):
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.query_seconds += time.monotonic() - started_at
+
+    @contextmanager
+    def load(self):
+        started_at = time.monotonic()
+        query_seconds_before = self.query_seconds
+        try:
+            yield
+        finally:
+            fetch_seconds = self.query_seconds - query_seconds_before
+            self.load_seconds += time.monotonic() - started_at - fetch_seconds
+
+    def read_rows(self, rows):
+        """Iterate rows, counting them and timing the fetches as query time."""
+        rows = iter(rows)
+        while True:
+            with self.query():
+                row = next(rows, _EXHAUSTED)
+            if row is _EXHAUSTED:
+                return
+            self.rows_read += 1
+            yield row
+
+    def summary(self):
+        return {
+            'rows_read': self.rows_read,
+            'rows_written': self.rows_written,
+            'payload_bytes': self.payload_bytes,
+            'query_seconds': round(self.query_seconds, 3),
+            'load_seconds': round(self.load_seconds, 3),
+            'peak_rss_bytes': _peak_rss_bytes(),
+        }
+
+    def publish(self, state):
+        """Emit the counters as pipeline.<dag_id>.<task_id>.* StatsD metrics and a pipeline_run_stats row."""
+        summary = self.summary()
+        prefix = f'pipeline.{self.ti.dag_id}.{self.ti.task_id}'
+        Stats.incr(f'{prefix}.rows_read', summary['rows_read'])
+        Stats.incr(f'{prefix}.rows_written', summary['rows_written'])
+        Stats.incr(f'{prefix}.payload_bytes', summary['payload_bytes'])
+        Stats.timing(f'{prefix}.query_duration', summary['query_seconds'] * 1000)
+        Stats.timing(f'{prefix}.load_duration', summary['load_seconds'] * 1000)
+        Stats.gauge(f'{prefix}.peak_rss_bytes', summary['peak_rss_bytes'])
+        log.info('%s %s: %s', self.ti.task_id, state, summary)
+        try:
+            with pg_connection(STATS_CONN_ID) as pg_conn:
+                pg_cursor = pg_conn.cursor()
+                create_stats_table(pg_cursor)
+                pg_cursor.execute(
+                    f'INSERT INTO {STATS_TABLE} (dag_id, task_id, run_id, map_index, try_number, state, '
+                    f'rows_read, rows_written, payload_bytes, query_seconds, load_seconds, peak_rss_bytes, started_at) '
+                    f'values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, to_timestamp(%s));',
+                    (self.ti.dag_id, self.ti.task_id, self.ti.run_id, getattr(self.ti, 'map_index', -1),
+                     self.ti.try_number, state, summary['rows_read'], summary['rows_written'],
+                     summary['payload_bytes'], summary['query_seconds'], summary['load_seconds'],
+                     summary['peak_rss_bytes'], self.started_at)
+                )
+                pg_cursor.close()
+        except Exception:
+            # Losing a stats row must never fail the task it describes.
+            log.exception('Could not record %s stats', STATS_TABLE)
+
+
+@contextmanager
+def task_metrics(ti):
+    """
+    Collect TaskMetrics for the task instance ti inside a with block and publish them when it
+    ends, as state 'success' or 'failed'.
+    """
+    metrics = TaskMetrics(ti)
+    try:
+        yield metrics
+    except BaseException:
+        metrics.publish('failed')
+        raise
+    metrics.publish('success')
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+NAT = np.iinfo(np.int64).min
+
+
+def _epoch_microseconds(times):
+    # Postgres timestamps have microsecond precision; NaT maps to the int64 minimum.
+    times = pd.to_datetime(pd.Series(times), utc=True).dt.tz_localize(None)
+    return times.to_numpy(dtype='datetime64[us]').astype(np.int64)
+
+
+def _group_starts(df, by):
+    starts = np.ones(len(df), dtype=bool)
+    if by and len(df) > 1:
+        keys = df[by].to_numpy()
+        starts[1:] = (keys[1:] != keys[:-1]).any(axis=1)
+    return starts
+
+
+def merge_overlapping_intervals(df, by=None, join_column='join_time', leave_column='leave_time'):
+    """
+    Merge the overlapping join/leave intervals of every group of rows sharing the by columns.
+
+    Each merged interval keeps the row that opened it, with its leave time extended to the
+    latest leave time of the rows it absorbed. Rows with a missing join or leave time are
+    returned unchanged.
+    """
+    by = list(by or [])
+    valid = df[join_column].notna() & df[leave_column].notna()
+    invalid_rows = df[~valid]
+    df = df[valid].sort_values(by + [join_column], kind='stable')
+    if df.empty:
+        return pd.concat([df, invalid_rows])
+
+    join = _epoch_microseconds(df[join_column])
+    leave = _epoch_microseconds(df[leave_column])
+    group_ids = np.cumsum(_group_starts(df, by))
+    positions = np.arange(len(df))
+
+    # Sweep line: an interval opens a new run unless it starts before the latest leave time
+    # seen so far in its group.
+    latest_leave = pd.Series(leave).groupby(group_ids).cummax().to_numpy()
+    run_starts = _group_starts(df, by)
+    run_starts[1:] |= join[1:] > latest_leave[:-1]
+    first_rows = np.flatnonzero(run_starts)
+    last_rows = np.append(first_rows[1:], len(df)) - 1
+    latest_leave_rows = pd.Series(np.where(leave == latest_leave, positions, -1)).groupby(group_ids).cummax()
+
+    merged = df.iloc[first_rows].copy()
+    merged[leave_column] = df[leave_column].iloc[latest_leave_rows.to_numpy()[last_rows]].array
+    return pd.concat([merged, invalid_rows]) if len(invalid_rows) else merged
+
+
+def overlapping_seconds(participants, hosts, by=None, join_column='join_time', leave_column='leave_time'):
+    """
+    Seconds each participant interval overlaps the host intervals of the same group.
+
+    hosts must already be merged with merge_overlapping_intervals. The host intervals of a
+    group are disjoint, so the overlap of [join, leave) is covered(leave) - covered(join), where
+    covered(t) is the host time elapsed up to t. covered is evaluated for every participant at
+    once with a binary search over the sorted host intervals of its group.
+    """
+    by = list(by or [])
+    seconds = np.zeros(len(participants))
+    hosts = hosts[hosts[join_column].notna() & hosts[leave_column].notna()]
+    if participants.empty or hosts.empty:
+        return seconds
+
+    hosts = hosts.sort_values(by + [join_column], kind='stable')
+    host_join = _epoch_microseconds(hosts[join_column])
+    host_leave = _epoch_microseconds(hosts[leave_column])
+    host_length = host_leave - host_join
+    host_group_starts = np.flatnonzero(_group_starts(hosts, by))
+    host_group_ids = np.cumsum(_group_starts(hosts, by)) - 1
+    covered_before = np.cumsum(host_length) - host_length
+    covered_before -= covered_before[host_group_starts][host_group_ids]
+
+    # Locate each participant's group in the host intervals.
+    if by:
+        group_keys = pd.MultiIndex.from_frame(hosts[by].iloc[host_group_starts])
+        group_positions = group_keys.get_indexer(pd.MultiIndex.from_frame(participants[by]))
+    else:
+        group_positions = np.zeros(len(participants), dtype=np.int64)
+    has_hosts = group_positions >= 0
+    group_positions = group_positions[has_hosts]
+    segment_start = host_group_starts[group_positions]
+    segment_end = np.append(host_group_starts[1:], len(hosts))[group_positions]
+
+    def covered(times):
+        # Index of the last host interval of the group starting at or before each time.
+        low, high = segment_start.copy(), segment_end.copy()
+        while True:
+            searching = low < high
+            if not searching.any():
+                break
+            middle = (low + high) // 2
+            go_right = searching & (host_join[np.minimum(middle, len(hosts) - 1)] <= times)
+            low = np.where(go_right, middle + 1, low)
+            high = np.where(searching & ~go_right, middle, high)
+        interval = low - 1
+        before_group = interval < segment_start
+        interval = np.maximum(interval, 0)
+        elapsed = np.clip(times - host_join[interval], 0, host_length[interval])
+        return np.where(before_group, 0, covered_before[interval] + elapsed)
+
+    join = _epoch_microseconds(participants[join_column])[has_hosts]
+    leave = _epoch_microseconds(participants[leave_column])[has_hosts]
+    overlap = (covered(leave) - covered(join)) / 1e6
+    overlap[(join == NAT) | (leave == NAT)] = 0
+    seconds[has_hosts] = overlap
+    return seconds
+
+
+def session_overlap(df, session_column, role_column, host_role, participant_role,
+                    participant_column='course_user_mapping_id'):
+    """
+    Merged host intervals and merged participant intervals of every session, the latter with
+    overlapping_time_seconds / overlapping_time_minutes spent together with the host.
+
+    Sessions without host rows are left out.
+    """
+    hosts = merge_overlapping_intervals(df[df[role_column] == host_role], by=[session_column])
+    participants = df[(df[role_column] == participant_role) & df[session_column].isin(hosts[session_column])]
+    participants = merge_overlapping_intervals(participants, by=[session_column, participant_column])
+    seconds = overlapping_seconds(participants, hosts, by=[session_column])
+    participants = participants.assign(
+        overlapping_time_seconds=np.round(seconds, 0),
+        overlapping_time_minutes=np.round(seconds / 60, 2),
+    )
+    return pd.concat([hosts, participants])
+
+
+def iter_session_frames(pg_cursor, columns, session_column, batch_size=50000, metrics=None):
+    """
+    Yield DataFrames holding complete sessions from a cursor whose rows are ordered by session_column.
+
+    Rows are fetched batch_size at a time. The trailing session of a batch is held back until
+    the rest of its rows have been fetched, so every session is processed in one piece.
+    The fetches are counted as query time and rows read of metrics, a utils.instrumentation.TaskMetrics.
+    """
+    session_position = columns.index(session_column)
+    pending = []
+    while True:
+        if metrics is None:
+            rows = pg_cursor.fetchmany(batch_size)
+        else:
+            with metrics.query():
+                rows = pg_cursor.fetchmany(batch_size)
+            metrics.rows_read += len(rows)
+        if not rows:
+            break
+        rows = pending + rows
+        split = len(rows)
+        while split > 0 and rows[split - 1][session_position] == rows[-1][session_position]:
+            split -= 1
+        pending = rows[split:]
+        if split:
+            yield pd.DataFrame(rows[:split], columns=columns)
+    if pending:
+        yield pd.DataFrame(pending, columns=columns)
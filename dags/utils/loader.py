@@ -0,0 +1,415 @@
+import json
+import logging
+from datetime import date, datetime, time
+
+from utils.partitions import partition_key, split_default_partition
+
+# Rows are staged in chunks of this many characters before psycopg2 hands them to COPY.
+COPY_CHUNK_SIZE = 1 << 16
+
+# Column holding the md5 of a row's update_columns when bulk_upsert merges with fingerprint=True.
+FINGERPRINT_COLUMN = 'row_fingerprint'
+
+log = logging.getLogger(__name__)
+
+
+def _is_null(value):
+    # NaN and NaT are the only values that are not equal to themselves.
+    return value is None or value != value
+
+
+def _array_literal(values):
+    elements = []
+    for value in values:
+        if _is_null(value):
+            elements.append('NULL')
+        elif isinstance(value, (list, tuple)):
+            elements.append(_array_literal(value))
+        else:
+            text = _text_literal(value).replace('\\', '\\\\').replace('"', '\\"')
+            elements.append(f'"{text}"')
+    return '{' + ','.join(elements) + '}'
+
+
+def _text_literal(value):
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return _array_literal(value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return str(value)
+
+
+def _csv_line(row):
+    fields = []
+    for value in row:
+        if _is_null(value):
+            # An unquoted empty field is NULL in COPY's CSV format, a quoted one is ''.
+            fields.append('')
+        else:
+            fields.append('"' + _text_literal(value).replace('"', '""') + '"')
+    return ','.join(fields) + '\n'
+
+
+class CopyStream:
+    """File-like object that encodes rows to CSV lazily as COPY reads from it."""
+
+    def __init__(self, rows, with_row_number=False):
+        self._rows = iter(rows)
+        self._with_row_number = with_row_number
+        self._row_number = 0
+        self._buffer = ''
+        self.rows_read = 0
+        self.bytes_read = 0
+
+    def _next_line(self):
+        row = next(self._rows, None)
+        if row is None:
+            return None
+        self.rows_read += 1
+        if self._with_row_number:
+            self._row_number += 1
+            row = tuple(row) + (self._row_number,)
+        return _csv_line(row)
+
+    def read(self, size=-1):
+        size = COPY_CHUNK_SIZE if size is None or size < 0 else size
+        chunks = [self._buffer]
+        buffered = len(self._buffer)
+        while buffered < size:
+            line = self._next_line()
+            if line is None:
+                break
+            chunks.append(line)
+            buffered += len(line)
+        data = ''.join(chunks)
+        self._buffer = data[size:]
+        chunk = data[:size]
+        # psycopg2 sends the chunk UTF-8 encoded; len(chunk) would count characters, not bytes.
+        self.bytes_read += len(chunk.encode())
+        return chunk
+
+
+def _column_types(pg_cursor, table, columns):
+    pg_cursor.execute(
+        'select attname, format_type(atttypid, atttypmod) from pg_attribute '
+        'where attrelid = %s::regclass and attnum > 0 and not attisdropped;',
+        (table,)
+    )
+    types = dict(pg_cursor.fetchall())
+    column_types = []
+    for column in columns:
+        column_type = types[column.lower()]
+        # psycopg2 sends aware datetimes as timestamptz literals, which Postgres converts
+        # to the session time zone on assignment; staging as timestamptz keeps that behaviour.
+        if column_type.startswith('timestamp') and column_type.endswith('without time zone'):
+            column_type = column_type.replace('without time zone', 'with time zone')
+        column_types.append(column_type)
+    return column_types
+
+
+def _record_payload(metrics, stream):
+    if metrics is not None:
+        metrics.payload_bytes += stream.bytes_read
+
+
+def _create_staging_table(pg_cursor, table, columns):
+    # Temporary table with table's column types plus the position of each row in the batch.
+    staging_table = f'{table}_staging'
+    column_definitions = ', '.join(
+        f'{column} {column_type}'
+        for column, column_type in zip(columns, _column_types(pg_cursor, table, columns))
+    )
+    pg_cursor.execute(f'DROP TABLE IF EXISTS pg_temp.{staging_table};')
+    pg_cursor.execute(
+        f'CREATE TEMP TABLE {staging_table} ({column_definitions}, staging_row_number bigint) '
+        f'ON COMMIT DROP;'
+    )
+    return staging_table
+
+
+def _copy_to_staging(pg_cursor, table, columns, rows, metrics=None):
+    staging_table = _create_staging_table(pg_cursor, table, columns)
+    column_list = ', '.join(columns)
+    stream = CopyStream(() if rows is None else rows, with_row_number=True)
+    pg_cursor.copy_expert(
+        f'COPY {staging_table} ({column_list}, staging_row_number) FROM STDIN WITH (FORMAT csv)',
+        stream, size=COPY_CHUNK_SIZE)
+    _record_payload(metrics, stream)
+    return staging_table
+
+
+def _select_from_query(pg_cursor, table, columns, sql, row_number=False):
+    # The query's columns are renamed to columns by position and cast to table's column types,
+    # the same conversion COPY applies to the text of a row.
+    column_list = ', '.join(columns)
+    casts = ', '.join(
+        f'source.{column}::{column_type}'
+        for column, column_type in zip(columns, _column_types(pg_cursor, table, columns))
+    )
+    if row_number:
+        casts += ', row_number() over ()'
+    # The query goes on lines of its own, so a trailing -- comment cannot swallow the parenthesis.
+    return f"SELECT {casts} FROM (\n{sql.strip().rstrip(';')}\n) AS source ({column_list})"
+
+
+def _query_to_staging(pg_cursor, table, columns, sql, parameters=None):
+    staging_table = _create_staging_table(pg_cursor, table, columns)
+    column_list = ', '.join(columns)
+    pg_cursor.execute(
+        f'INSERT INTO {staging_table} ({column_list}, staging_row_number) '
+        f'{_select_from_query(pg_cursor, table, columns, sql, row_number=True)};',
+        parameters
+    )
+    return staging_table
+
+
+def fingerprint_column_statement(table):
+    """
+    The statement adding FINGERPRINT_COLUMN to table, for the create_table task of every table
+    merged with fingerprint=True. The loader never runs DDL itself: mapped shards loading the
+    same table would race to add the column and hold its lock for their whole load.
+    """
+    return f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {FINGERPRINT_COLUMN} uuid;'
+
+
+def _require_fingerprint_column(pg_cursor, table):
+    pg_cursor.execute(
+        'select 1 from pg_attribute where attrelid = %s::regclass and attname = %s and not attisdropped;',
+        (table, FINGERPRINT_COLUMN)
+    )
+    if pg_cursor.fetchone() is None:
+        raise ValueError(
+            f'{table} has no {FINGERPRINT_COLUMN} column; add fingerprint_column_statement({table!r}) '
+            f'to its create_table task')
+
+
+def _merge_staging(pg_cursor, table, columns, staging_table, conflict_columns, update_columns, fingerprint):
+    column_list = ', '.join(columns)
+    conflict_list = ', '.join(conflict_columns)
+    if update_columns:
+        row_order = 'desc'
+        conflict_action = 'do update set ' + ', '.join(
+            f'{column} = EXCLUDED.{column}' for column in update_columns)
+    else:
+        row_order = 'asc'
+        conflict_action = 'do nothing'
+
+    if fingerprint and update_columns:
+        _require_fingerprint_column(pg_cursor, table)
+        fingerprint_value = 'md5(row(' + ', '.join(update_columns) + ')::text)::uuid'
+        pg_cursor.execute(
+            f'WITH source AS ('
+            f'SELECT DISTINCT ON ({conflict_list}) {column_list}, {fingerprint_value} as {FINGERPRINT_COLUMN} '
+            f'FROM {staging_table} ORDER BY {conflict_list}, staging_row_number {row_order}'
+            f'), merged AS ('
+            f'INSERT INTO {table} ({column_list}, {FINGERPRINT_COLUMN}) '
+            f'SELECT {column_list}, {FINGERPRINT_COLUMN} FROM source '
+            f'on conflict ({conflict_list}) {conflict_action}, '
+            f'{FINGERPRINT_COLUMN} = EXCLUDED.{FINGERPRINT_COLUMN} '
+            f'where {table}.{FINGERPRINT_COLUMN} is distinct from EXCLUDED.{FINGERPRINT_COLUMN} '
+            # xmax is 0 only on freshly inserted row versions.
+            f'returning (xmax = 0) as inserted'
+            f') SELECT (SELECT count(*) FROM source), '
+            f'count(*) filter (where inserted), count(*) filter (where not inserted) FROM merged;'
+        )
+        source_rows, inserted_rows, updated_rows = pg_cursor.fetchone()
+        log.info('%s: %s rows inserted, %s updated, %s unchanged',
+                 table, inserted_rows, updated_rows, source_rows - inserted_rows - updated_rows)
+        pg_cursor.execute(f'DROP TABLE {staging_table};')
+        return inserted_rows + updated_rows
+
+    pg_cursor.execute(
+        f'INSERT INTO {table} ({column_list}) '
+        f'SELECT DISTINCT ON ({conflict_list}) {column_list} FROM {staging_table} '
+        f'ORDER BY {conflict_list}, staging_row_number {row_order} '
+        f'on conflict ({conflict_list}) {conflict_action};'
+    )
+    inserted_rows = pg_cursor.rowcount
+    pg_cursor.execute(f'DROP TABLE {staging_table};')
+    return inserted_rows
+
+
+def _route_partitioned_rows(pg_cursor, table):
+    # Rows past table's newest partition land in its default partition; move them into partitions of their own.
+    if partition_key(pg_cursor, table) is not None:
+        split_default_partition(pg_cursor, table)
+
+
+def bulk_upsert(pg_conn, table, columns, rows, conflict_columns=None, update_columns=None, fingerprint=False,
+                metrics=None):
+    """
+    Load rows into table with COPY instead of one INSERT round trip per row.
+
+    Without conflict_columns the rows are copied straight into the table. Otherwise they are
+    copied into a temporary staging table and merged with a single
+    INSERT ... SELECT ... ON CONFLICT (conflict_columns) DO UPDATE SET update_columns
+    (DO NOTHING when update_columns is empty). When the batch repeats a conflict key, the last
+    row wins for DO UPDATE and the first for DO NOTHING, as with row-by-row inserts.
+
+    With fingerprint=True the md5 of each row's update_columns is stored in FINGERPRINT_COLUMN
+    (which create_table adds, see fingerprint_column_statement; the load fails without it) and
+    existing rows are only rewritten when it changed, so unchanged rows cost no new row version,
+    WAL or index churn. The inserted, updated and unchanged counts are logged.
+    metrics (a utils.instrumentation.TaskMetrics) is credited with the CSV bytes sent to COPY.
+    When table is range partitioned (see utils.partitions), rows that fell into its default
+    partition are given partitions of their own after the load.
+    The caller owns the transaction. Returns the number of rows written to table.
+    """
+    column_list = ', '.join(columns)
+    pg_cursor = pg_conn.cursor()
+    try:
+        if not conflict_columns:
+            stream = CopyStream(() if rows is None else rows)
+            pg_cursor.copy_expert(
+                f'COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)', stream, size=COPY_CHUNK_SIZE)
+            _record_payload(metrics, stream)
+            rows_written = stream.rows_read
+        else:
+            staging_table = _copy_to_staging(pg_cursor, table, columns, rows, metrics)
+            rows_written = _merge_staging(
+                pg_cursor, table, columns, staging_table, conflict_columns, update_columns, fingerprint)
+        _route_partitioned_rows(pg_cursor, table)
+        return rows_written
+    finally:
+        pg_cursor.close()
+
+
+def upsert_from_query(pg_conn, table, columns, sql, parameters=None, conflict_columns=None, update_columns=None,
+                      fingerprint=False):
+    """
+    bulk_upsert the rows of sql, a query on pg_conn's own database, without them leaving it.
+
+    The query's result is staged with INSERT ... SELECT instead of COPY, its columns taken as
+    columns by position, and merged exactly as bulk_upsert merges; parameters are bound to sql.
+    The caller owns the transaction. Returns the number of rows written to table.
+    """
+    column_list = ', '.join(columns)
+    pg_cursor = pg_conn.cursor()
+    try:
+        if not conflict_columns:
+            pg_cursor.execute(
+                f'INSERT INTO {table} ({column_list}) {_select_from_query(pg_cursor, table, columns, sql)};',
+                parameters
+            )
+            rows_written = pg_cursor.rowcount
+        else:
+            staging_table = _query_to_staging(pg_cursor, table, columns, sql, parameters)
+            rows_written = _merge_staging(
+                pg_cursor, table, columns, staging_table, conflict_columns, update_columns, fingerprint)
+        _route_partitioned_rows(pg_cursor, table)
+        return rows_written
+    finally:
+        pg_cursor.close()
+
+
+def _rebuild(pg_conn, table, columns, stage_rows, conflict_columns=None):
+    # The rows are staged first, so table is only locked for the TRUNCATE and one local INSERT ... SELECT.
+    column_list = ', '.join(columns)
+    pg_cursor = pg_conn.cursor()
+    try:
+        staging_table = stage_rows(pg_cursor)
+        pg_cursor.execute(f'TRUNCATE {table};')
+        if conflict_columns:
+            conflict_list = ', '.join(conflict_columns)
+            pg_cursor.execute(
+                f'INSERT INTO {table} ({column_list}) '
+                f'SELECT DISTINCT ON ({conflict_list}) {column_list} FROM {staging_table} '
+                f'ORDER BY {conflict_list}, staging_row_number desc;'
+            )
+        else:
+            pg_cursor.execute(f'INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging_table};')
+        rows_loaded = pg_cursor.rowcount
+        pg_cursor.execute(f'DROP TABLE {staging_table};')
+        _route_partitioned_rows(pg_cursor, table)
+        return rows_loaded
+    finally:
+        pg_cursor.close()
+
+
+def rebuild_table(pg_conn, table, columns, rows, conflict_columns=None, metrics=None):
+    """
+    Replace the contents of table with rows, without readers ever seeing it empty or half loaded.
+
+    The rows are copied into a temporary staging table, then table is truncated and reloaded
+    from it with one INSERT ... SELECT. All of it runs in the caller's transaction: until the
+    commit, readers see the old rows (or wait on the TRUNCATE's lock), never an empty table.
+    table itself is kept, so its grants, triggers, policies and dependent views are untouched.
+    With conflict_columns the last row of a repeated key wins, as with bulk_upsert, and metrics
+    is credited as by bulk_upsert. Returns the number of rows loaded.
+    """
+    return _rebuild(
+        pg_conn, table, columns,
+        lambda pg_cursor: _copy_to_staging(pg_cursor, table, columns, rows, metrics),
+        conflict_columns,
+    )
+
+
+def rebuild_from_query(pg_conn, table, columns, sql, parameters=None, conflict_columns=None):
+    """
+    rebuild_table with the rows of sql, a query on pg_conn's own database, staged with
+    INSERT ... SELECT so they never leave it (see upsert_from_query).
+    """
+    return _rebuild(
+        pg_conn, table, columns,
+        lambda pg_cursor: _query_to_staging(pg_cursor, table, columns, sql, parameters),
+        conflict_columns,
+    )
+
+
+def prune_missing_keys(pg_conn, table, key_column, keys):
+    """
+    Delete the rows of table whose key_column value is not among keys, e.g. the rows whose source
+    row was deleted since they were loaded.
+
+    keys is an iterable of 1-tuples, such as a cursor over the source keys. They are copied into
+    a temporary table and removed with one anti-join instead of a NOT IN list. An empty keys
+    deletes nothing rather than everything, as an empty source is more likely a failed read.
+    The caller owns the transaction. Returns the number of rows deleted.
+    """
+    pg_cursor = pg_conn.cursor()
+    try:
+        staging_table = _copy_to_staging(pg_cursor, table, [key_column], keys)
+        pg_cursor.execute(f'SELECT count(*) FROM {staging_table};')
+        if pg_cursor.fetchone()[0] == 0:
+            log.warning('%s: no source keys, nothing pruned', table)
+            pg_cursor.execute(f'DROP TABLE {staging_table};')
+            return 0
+        pg_cursor.execute(f'ANALYZE {staging_table};')
+        pg_cursor.execute(
+            f'DELETE FROM {table} WHERE NOT EXISTS '
+            f'(SELECT 1 FROM {staging_table} WHERE {staging_table}.{key_column} = {table}.{key_column});'
+        )
+        rows_deleted = pg_cursor.rowcount
+        pg_cursor.execute(f'DROP TABLE {staging_table};')
+        log.info('%s: %s rows pruned', table, rows_deleted)
+        return rows_deleted
+    finally:
+        pg_cursor.close()
+
+
+def delete_keys(pg_conn, table, key_column, keys):
+    """
+    Delete the rows of table whose key_column value is among keys, e.g. the rows of the sessions
+    about to be reloaded in full.
+
+    keys is an iterable of 1-tuples. They are copied into a temporary table and deleted with one
+    join instead of an IN list. The caller owns the transaction. Returns the number of rows deleted.
+    """
+    pg_cursor = pg_conn.cursor()
+    try:
+        staging_table = _copy_to_staging(pg_cursor, table, [key_column], keys)
+        pg_cursor.execute(f'ANALYZE {staging_table};')
+        pg_cursor.execute(
+            f'DELETE FROM {table} USING {staging_table} '
+            f'WHERE {staging_table}.{key_column} = {table}.{key_column};'
+        )
+        rows_deleted = pg_cursor.rowcount
+        pg_cursor.execute(f'DROP TABLE {staging_table};')
+        log.info('%s: %s rows deleted', table, rows_deleted)
+        return rows_deleted
+    finally:
+        pg_cursor.close()
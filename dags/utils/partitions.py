@@ -0,0 +1,232 @@
+import logging
+import re
+
+from utils.connections import pg_connection
+from utils.indexes import index_migrations
+
+# Width of the partitions of a table range partitioned on an integer column such as a serial id.
+ID_RANGE_SIZE = 10000000
+
+# Partitions created past the current one, so the next loads never fall into the default partition.
+PARTITIONS_AHEAD = 1
+
+log = logging.getLogger(__name__)
+
+
+def partition_key(pg_cursor, table):
+    """(column, type) of table's range partition key, None if table is not partitioned."""
+    pg_cursor.execute(
+        'select a.attname, format_type(a.atttypid, a.atttypmod) from pg_partitioned_table p '
+        'join pg_attribute a on a.attrelid = p.partrelid and a.attnum = p.partattrs[0] '
+        "where p.partrelid = to_regclass(%s) and p.partstrat = 'r';",
+        (table,)
+    )
+    return pg_cursor.fetchone()
+
+
+def _is_time(column_type):
+    return column_type.startswith(('timestamp', 'date'))
+
+
+def _bucket(column, column_type):
+    # The lower bound of the partition holding column's value.
+    if _is_time(column_type):
+        return f"date_trunc('month', {column})::{column_type}"
+    return f'({column} - {column} % {ID_RANGE_SIZE})'
+
+
+def _upper_bound(column_type):
+    if _is_time(column_type):
+        return f"(%(lower)s::{column_type} + interval '1 month')::{column_type}"
+    return f'%(lower)s::bigint + {ID_RANGE_SIZE}'
+
+
+def _partition_name(table, column_type, lower):
+    if _is_time(column_type):
+        return f"{table}_p{lower.strftime('%Y_%m')}"
+    return f'{table}_p{lower}'
+
+
+def _existing_partitions(pg_cursor, table):
+    pg_cursor.execute('select inhrelid::regclass::text from pg_inherits where inhparent = %s::regclass;', (table,))
+    return {row[0] for row in pg_cursor.fetchall()}
+
+
+def create_partition(pg_cursor, table, lower):
+    """
+    Create the partition of table starting at lower, unless it exists.
+
+    Rows of its range already in the default partition are moved into it before it is attached,
+    as ATTACH PARTITION refuses a range the default partition holds rows of.
+    """
+    column, column_type = partition_key(pg_cursor, table)
+    partition = _partition_name(table, column_type, lower)
+    if partition in _existing_partitions(pg_cursor, table):
+        return partition
+    upper_bound = _upper_bound(column_type)
+    pg_cursor.execute(f'select {upper_bound};', {'lower': lower})
+    upper = pg_cursor.fetchone()[0]
+    default_partition = f'{table}_default'
+    pg_cursor.execute(
+        f'CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE);')
+    pg_cursor.execute(
+        f'WITH moved AS (DELETE FROM {default_partition} WHERE {column} >= %(lower)s AND {column} < %(upper)s '
+        f'RETURNING *) INSERT INTO {partition} SELECT * FROM moved;',
+        {'lower': lower, 'upper': upper}
+    )
+    if pg_cursor.rowcount:
+        log.info('%s: moved %s rows out of %s', partition, pg_cursor.rowcount, default_partition)
+    pg_cursor.execute(
+        f'ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES FROM (%(lower)s) TO (%(upper)s);',
+        {'lower': lower, 'upper': upper}
+    )
+    log.info('%s: created partition %s for [%s, %s)', table, partition, lower, upper)
+    return partition
+
+
+def split_default_partition(pg_cursor, table):
+    """
+    Give the rows that landed in table's default partition partitions of their own.
+
+    Only rows with a NULL partition key stay in the default partition. The loader calls this
+    after every load into a partitioned table; normally the default partition is empty and this
+    is one index lookup. Returns the partitions created.
+    """
+    column, column_type = partition_key(pg_cursor, table)
+    pg_cursor.execute(
+        f'select distinct {_bucket(column, column_type)} from {table}_default where {column} is not null;')
+    return [create_partition(pg_cursor, table, lower) for (lower,) in pg_cursor.fetchall()]
+
+
+def ensure_partitions(pg_cursor, table, ahead=PARTITIONS_AHEAD):
+    """
+    Create table's current partition and the ahead ones after it, current being this month's
+    for a time key and the one of the next value of a serial key's sequence.
+    """
+    column, column_type = partition_key(pg_cursor, table)
+    if _is_time(column_type):
+        pg_cursor.execute(
+            f"select (date_trunc('month', now()) + interval '1 month' * step)::{column_type} "
+            f'from generate_series(0, %s) as step;',
+            (ahead,)
+        )
+    else:
+        pg_cursor.execute('select pg_get_serial_sequence(%s, %s);', (table, column))
+        sequence = pg_cursor.fetchone()[0]
+        current = f'(select last_value from {sequence})' if sequence else f'(select coalesce(max({column}), 0) from {table})'
+        pg_cursor.execute(
+            f'select {_bucket(current, column_type)} + {ID_RANGE_SIZE} * step from generate_series(0, %s) as step;',
+            (ahead,)
+        )
+    return [create_partition(pg_cursor, table, lower) for (lower,) in pg_cursor.fetchall()]
+
+
+def _dependents(pg_cursor, table):
+    # Objects the conversion would break or silently drop: views and foreign keys referencing
+    # table (DROP TABLE refuses them) and triggers and row security policies on it (not copied).
+    pg_cursor.execute(
+        "select pg_describe_object(classid, objid, objsubid) from pg_depend "
+        "where refclassid = 'pg_class'::regclass and refobjid = %s::regclass and deptype = 'n' "
+        "union select 'trigger ' || tgname from pg_trigger where tgrelid = %s::regclass and not tgisinternal "
+        "union select 'policy ' || polname from pg_policy where polrelid = %s::regclass;",
+        (table, table, table)
+    )
+    return sorted(row[0] for row in pg_cursor.fetchall())
+
+
+def _grants(pg_cursor, table):
+    # table's ACL as GRANT statements, to reapply to the table replacing it.
+    pg_cursor.execute(
+        "select format('GRANT %%s ON TABLE %%s TO %%s%%s;', a.privilege_type, c.oid::regclass, "
+        "case when a.grantee = 0 then 'PUBLIC' else quote_ident(pg_get_userbyid(a.grantee)) end, "
+        "case when a.is_grantable then ' WITH GRANT OPTION' else '' end) "
+        "from pg_class c, aclexplode(c.relacl) a where c.oid = %s::regclass and a.grantee <> c.relowner;",
+        (table,)
+    )
+    return [row[0] for row in pg_cursor.fetchall()]
+
+
+def convert_to_partitioned(pg_cursor, table, column):
+    """
+    One-off migration replacing the unpartitioned table with one range partitioned on column,
+    its rows moved into one partition per month (or ID_RANGE_SIZE ids).
+
+    Run it once per table with tools/partition_table.py, with the DAGs writing to table paused:
+    it holds an ACCESS EXCLUSIVE lock on table while every row is copied. Nothing depending on
+    table may exist (see _dependents); it raises ValueError listing them otherwise, before
+    changing anything. The owner, grants, table and column comments and serial sequences are
+    carried over. The primary key and indexes are not, as a unique constraint on a partitioned
+    table must include the partition key: the table's create_table task declares the new ones.
+    The caller owns the transaction, so a failure leaves table as it was.
+    """
+    dependents = _dependents(pg_cursor, table)
+    if dependents:
+        raise ValueError(f"{table} cannot be converted while these depend on it: {', '.join(dependents)}")
+    grants = _grants(pg_cursor, table)
+    pg_cursor.execute(
+        "select quote_ident(pg_get_userbyid(relowner)), obj_description(oid, 'pg_class') from pg_class "
+        "where oid = %s::regclass;",
+        (table,)
+    )
+    owner, comment = pg_cursor.fetchone()
+
+    old_table = f'{table}__unpartitioned'
+    pg_cursor.execute(f'ALTER TABLE {table} RENAME TO {old_table};')
+    pg_cursor.execute(
+        f'CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS) '
+        f'PARTITION BY RANGE ({column});')
+    pg_cursor.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT;')
+    _, column_type = partition_key(pg_cursor, table)
+    pg_cursor.execute(f'select distinct {_bucket(column, column_type)} from {old_table} where {column} is not null;')
+    for (lower,) in pg_cursor.fetchall():
+        create_partition(pg_cursor, table, lower)
+    # ALTER TABLE ... OWNER TO does not recurse into partitions.
+    for relation in [table, *_existing_partitions(pg_cursor, table)]:
+        pg_cursor.execute(f'ALTER TABLE {relation} OWNER TO {owner};')
+    for grant in grants:
+        pg_cursor.execute(grant)
+    if comment is not None:
+        pg_cursor.execute(f'COMMENT ON TABLE {table} IS %s;', (comment,))
+    # The sequences move to the new table before the old one is dropped, which would drop them too.
+    pg_cursor.execute(
+        'select attname, pg_get_serial_sequence(%s, attname) from pg_attribute '
+        'where attrelid = %s::regclass and attnum > 0 and not attisdropped;',
+        (old_table, old_table)
+    )
+    for serial_column, sequence in pg_cursor.fetchall():
+        if sequence:
+            pg_cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}.{serial_column};')
+    pg_cursor.execute(f'INSERT INTO {table} SELECT * FROM {old_table};')
+    log.info('%s: moved %s rows into the partitioned table', table, pg_cursor.rowcount)
+    pg_cursor.execute(f'DROP TABLE {old_table};')
+
+
+def create_partitioned_table(postgres_conn_id, table, create_table_sql, **kwargs):
+    """
+    PythonOperator callable creating table, declared PARTITION BY RANGE (column) in create_table_sql.
+
+    create_table_sql runs, the default partition and the partitions up to PARTITIONS_AHEAD are
+    created and the index migrations of utils.indexes are applied. A table that exists
+    unpartitioned is not touched: the task fails until it is converted with
+    tools/partition_table.py (see convert_to_partitioned). CREATE INDEX CONCURRENTLY does not work on partitioned tables, so
+    they are applied without it; on the parent they cascade to every current and future partition.
+    """
+    column = re.search(r'partition\s+by\s+range\s*\(\s*(\w+)\s*\)', create_table_sql, re.IGNORECASE).group(1)
+    with pg_connection(postgres_conn_id) as pg_conn:
+        pg_cursor = pg_conn.cursor()
+        pg_cursor.execute("select relkind from pg_class where oid = to_regclass(%s);", (table,))
+        row = pg_cursor.fetchone()
+        if row is not None and row[0] == 'r':
+            raise ValueError(
+                f'{table} exists and is not partitioned; pause the DAGs writing to it and convert it once with '
+                f'tools/partition_table.py --table {table} --column {column}')
+        pg_cursor.execute(create_table_sql)
+        pg_cursor.execute(f'CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT;')
+        split_default_partition(pg_cursor, table)
+        ensure_partitions(pg_cursor, table)
+        for statement in index_migrations(table):
+            pg_cursor.execute(statement.replace(' CONCURRENTLY ', ' ', 1))
+        # Autovacuum vacuums and analyzes each partition on its own but never analyzes the parent,
+        # whose statistics the planner uses for queries spanning partitions.
+        pg_cursor.execute(f'ANALYZE {table};')
+        pg_cursor.close()
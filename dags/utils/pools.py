@@ -0,0 +1,64 @@
+REPLICA_POOL = 'postgres_read_replica'
+
+# Slots the pool is created with until replica_pool_calibration_dag sizes it: at least the
+# pool_slots of a heavy task, which could never start in a smaller pool.
+DEFAULT_REPLICA_POOL_SLOTS = 8
+
+# Per cost class: pool slots a task occupies while it runs and the priority_weight it adds to
+# every upstream task. The classes are assigned in the DAG files and checked against measured
+# runtimes by replica_pool_calibration_dag.
+COST_CLASSES = {
+    'light': {'pool_slots': 1, 'priority_weight': 1},
+    'medium': {'pool_slots': 2, 'priority_weight': 5},
+    'heavy': {'pool_slots': 4, 'priority_weight': 10},
+}
+
+# Median runtime (seconds) up to which a task is measured as light / medium; anything longer is heavy.
+LIGHT_MAX_SECONDS = 5 * 60
+MEDIUM_MAX_SECONDS = 30 * 60
+
+
+def replica_pool(cost_class):
+    """
+    Operator arguments that run a task in the postgres_read_replica pool as cost_class, e.g.
+    PostgresOperator(..., **replica_pool('heavy')).
+    """
+    return {'pool': REPLICA_POOL, **COST_CLASSES[cost_class]}
+
+
+def create_replica_pool(**kwargs):
+    """
+    PythonOperator callable creating the postgres_read_replica pool with DEFAULT_REPLICA_POOL_SLOTS
+    unless it exists. Airflow never schedules a task whose pool is missing, so every DAG with
+    replica tasks runs it first, in default_pool; replica_pool_calibration_dag resizes the pool.
+    """
+    from airflow.models import Pool
+
+    if Pool.get_pool(REPLICA_POOL) is not None:
+        return
+    try:
+        Pool.create_or_update_pool(
+            REPLICA_POOL,
+            slots=DEFAULT_REPLICA_POOL_SLOTS,
+            description='postgres_read_replica queries, default size until calibrated',
+        )
+    except Exception:
+        # Another DAG created it at the same time.
+        if Pool.get_pool(REPLICA_POOL) is None:
+            raise
+
+
+def cost_class_of(pool_slots):
+    """The cost class a task was declared with, from the pool slots it occupied."""
+    for cost_class, settings in COST_CLASSES.items():
+        if settings['pool_slots'] == pool_slots:
+            return cost_class
+    return None
+
+
+def measured_cost_class(seconds):
+    if seconds <= LIGHT_MAX_SECONDS:
+        return 'light'
+    if seconds <= MEDIUM_MAX_SECONDS:
+        return 'medium'
+    return 'heavy'
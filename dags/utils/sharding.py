@@ -0,0 +1,132 @@
+import logging
+
+from utils.connections import pg_connection
+
+DEFAULT_MAX_SHARDS = 50
+MIN_ROWS_PER_SHARD = 10000
+
+log = logging.getLogger(__name__)
+
+
+def key_range_cut_points(pg_cursor, key_query, number_of_shards):
+    """
+    Split the keys returned by key_query into number_of_shards ranges of roughly equal size.
+
+    Returns the number_of_shards - 1 cut points between consecutive ranges, computed with a
+    single percentile_disc pass over the keys, or an empty list when there are no keys.
+    """
+    if number_of_shards < 2:
+        return []
+    fractions = ', '.join(str(shard / number_of_shards) for shard in range(1, number_of_shards))
+    pg_cursor.execute(
+        f'select percentile_disc(array[{fractions}]::float8[]) within group (order by shard_key) '
+        f'from ({key_query}) as keys(shard_key);'
+    )
+    cut_points = pg_cursor.fetchone()[0]
+    return cut_points or []
+
+
+def cost_balanced_id_ranges(pg_cursor, cost_query, max_shards, min_rows_per_shard=1):
+    """
+    Split the ids returned by cost_query into ranges of roughly equal estimated cost.
+
+    cost_query returns (id, estimated_rows) rows, e.g. the number of course user rows each
+    assignment or lecture fans out to. There are max_shards shards, fewer when a shard would
+    carry less than min_rows_per_shard rows, and every id goes to the shard its cumulative cost
+    falls in, so a shard of recent, heavy ids spans fewer ids than a shard of old, light ones.
+    Everything is computed in one pass over cost_query. Returns [start_id, end_id, estimated_rows]
+    per non-empty shard; the ranges are contiguous and inclusive, from min(id) to max(id).
+    """
+    pg_cursor.execute(f'''
+        with per_id as (
+            select shard_id, coalesce(sum(estimated_rows), 0) as estimated_rows
+            from ({cost_query}) as costs(shard_id, estimated_rows)
+            where shard_id is not null
+            group by 1
+        ),
+        cumulative as (
+            select
+                shard_id,
+                estimated_rows,
+                sum(estimated_rows) over (order by shard_id) - estimated_rows as rows_before,
+                sum(estimated_rows) over () as total_rows
+            from per_id
+        ),
+        sized as (
+            select
+                *,
+                greatest(1, least({int(max_shards)}, floor(total_rows / {int(min_rows_per_shard)}))) as number_of_shards
+            from cumulative
+        )
+        select min(shard_id), max(shard_id), sum(estimated_rows)
+        from sized
+        group by least(floor(rows_before * number_of_shards / nullif(total_rows, 0)), number_of_shards - 1)
+        order by 1;
+    ''')
+    ranges = [list(row) for row in pg_cursor.fetchall()]
+    for previous, current in zip(ranges, ranges[1:]):
+        current[0] = previous[1] + 1
+    return ranges
+
+
+def available_pool_slots(pool):
+    from airflow.models import Pool
+
+    pool = Pool.get_pool(pool)
+    if pool is None or pool.slots < 0:
+        return None
+    return pool.slots
+
+
+def number_of_shards_for_pool(pool, pool_slots=1, max_shards=None):
+    """One shard per pool_slots slots of the pool the mapped task runs in, capped at max_shards."""
+    slots = available_pool_slots(pool)
+    number_of_shards = max(1, slots // int(pool_slots)) if slots else DEFAULT_MAX_SHARDS
+    if max_shards:
+        number_of_shards = min(number_of_shards, int(max_shards))
+    return number_of_shards
+
+
+def plan_key_ranges(postgres_conn_id, key_query, pool='default_pool', pool_slots=1, max_shards=None, **kwargs):
+    """
+    PythonOperator callable planning key ranges of roughly equal size for dynamic task mapping.
+
+    For keys that are not ids (e.g. urls). Returns one {'lower_key': ..., 'upper_key': ...,
+    'null_keys': False} dict per shard (see number_of_shards_for_pool), plus a final
+    {'lower_key': None, 'upper_key': None, 'null_keys': True} shard for the rows whose key is
+    NULL, which no range holds. A shard selects the keys above lower_key and up to upper_key, and
+    a None bound is open, so the mapped query filters with
+        (case when %(null_keys)s then key is null else key is not null end)
+        and (%(lower_key)s::text is null or key > %(lower_key)s)
+        and (%(upper_key)s::text is null or key <= %(upper_key)s)
+    """
+    number_of_shards = number_of_shards_for_pool(pool, pool_slots, max_shards)
+    with pg_connection(postgres_conn_id) as pg_conn:
+        pg_cursor = pg_conn.cursor()
+        cut_points = sorted(set(key_range_cut_points(pg_cursor, key_query, number_of_shards)))
+        pg_cursor.close()
+    bounds = [None] + cut_points + [None]
+    shards = [{'lower_key': lower, 'upper_key': upper, 'null_keys': False} for lower, upper in zip(bounds, bounds[1:])]
+    return shards + [{'lower_key': None, 'upper_key': None, 'null_keys': True}]
+
+
+def plan_id_ranges(postgres_conn_id, cost_query, pool='default_pool', pool_slots=1, max_shards=None,
+                   min_rows_per_shard=MIN_ROWS_PER_SHARD, **kwargs):
+    """
+    PythonOperator callable planning cost-balanced id ranges for dynamic task mapping.
+
+    The fan-out of every id is read at run time with cost_query (see cost_balanced_id_ranges).
+    The number of shards comes from number_of_shards_for_pool.
+    Returns one {'start_id': ..., 'end_id': ...} dict per shard, ready for
+    Operator.partial(...).expand(parameters=planner.output); ids added after the plan was made
+    are picked up by the next run.
+    """
+    number_of_shards = number_of_shards_for_pool(pool, pool_slots, max_shards)
+
+    with pg_connection(postgres_conn_id) as pg_conn:
+        pg_cursor = pg_conn.cursor()
+        id_ranges = cost_balanced_id_ranges(pg_cursor, cost_query, number_of_shards, int(min_rows_per_shard))
+        pg_cursor.close()
+    for start_id, end_id, estimated_rows in id_ranges:
+        log.info('Shard %s - %s: %s estimated rows', start_id, end_id, estimated_rows)
+    return [{'start_id': start_id, 'end_id': end_id} for start_id, end_id, _ in id_ranges]
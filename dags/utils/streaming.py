@@ -0,0 +1,123 @@
+from airflow.models import BaseOperator
+
+from utils.connections import pg_connection
+from utils.instrumentation import task_metrics
+from utils.loader import bulk_upsert, rebuild_from_query, rebuild_table, upsert_from_query
+
+DEFAULT_ITERSIZE = 10000
+
+
+class StreamingExtractOperator(BaseOperator):
+    """
+    Run sql on source_conn_id and load its rows into table on target_conn_id in one task.
+
+    The query runs on a named (server-side) cursor that fetches itersize rows per round trip,
+    and the rows are fed to bulk_upsert as they arrive, so neither the task nor XCom ever holds
+    the full result set. columns, conflict_columns, update_columns and fingerprint are passed to
+    bulk_upsert. With rebuild=True the rows replace the contents of table through rebuild_table
+    instead. parameters are bound to the query like PostgresOperator's, so the operator can be
+    mapped over shard bounds with .partial(...).expand(parameters=...).
+    Rows, bytes, query and load time are recorded with utils.instrumentation.
+
+    When source_conn_id is target_conn_id (or pushdown=True) the rows never leave the database:
+    the query runs inside a single INSERT ... SELECT through upsert_from_query or
+    rebuild_from_query instead of being fetched and copied back. Returns the number of rows written.
+    """
+
+    template_fields = ('sql', 'parameters')
+    template_ext = ('.sql',)
+    template_fields_renderers = {'sql': 'sql'}
+    ui_color = '#cdaaed'
+
+    def __init__(
+        self,
+        *,
+        sql,
+        source_conn_id,
+        table,
+        columns,
+        conflict_columns=None,
+        update_columns=None,
+        fingerprint=False,
+        rebuild=False,
+        target_conn_id='postgres_result_db',
+        parameters=None,
+        itersize=DEFAULT_ITERSIZE,
+        pushdown=None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.sql = sql
+        self.source_conn_id = source_conn_id
+        self.table = table
+        self.columns = columns
+        self.conflict_columns = conflict_columns
+        self.update_columns = update_columns
+        self.fingerprint = fingerprint
+        self.rebuild = rebuild
+        self.target_conn_id = target_conn_id
+        self.parameters = parameters
+        self.itersize = itersize
+        self.pushdown = source_conn_id == target_conn_id if pushdown is None else pushdown
+
+    def execute(self, context):
+        if self.pushdown:
+            return self.execute_pushdown(context)
+        with task_metrics(context['ti']) as metrics, pg_connection(self.source_conn_id) as source_conn, \
+                pg_connection(self.target_conn_id) as target_conn:
+            source_cursor = source_conn.cursor(name=f'{self.task_id}_rows'.replace('.', '_'))
+            source_cursor.itersize = self.itersize
+            with metrics.query():
+                source_cursor.execute(self.sql, self.parameters)
+            with metrics.load():
+                if self.rebuild:
+                    rows_written = rebuild_table(
+                        target_conn,
+                        self.table,
+                        columns=self.columns,
+                        rows=metrics.read_rows(source_cursor),
+                        conflict_columns=self.conflict_columns,
+                        metrics=metrics,
+                    )
+                else:
+                    rows_written = bulk_upsert(
+                        target_conn,
+                        self.table,
+                        columns=self.columns,
+                        rows=metrics.read_rows(source_cursor),
+                        conflict_columns=self.conflict_columns,
+                        update_columns=self.update_columns,
+                        fingerprint=self.fingerprint,
+                        metrics=metrics,
+                    )
+            metrics.rows_written = rows_written
+            source_cursor.close()
+        self.log.info('Loaded %s rows into %s', rows_written, self.table)
+        return rows_written
+
+    def execute_pushdown(self, context):
+        with task_metrics(context['ti']) as metrics, metrics.load(), \
+                pg_connection(self.target_conn_id) as target_conn:
+            if self.rebuild:
+                rows_written = rebuild_from_query(
+                    target_conn,
+                    self.table,
+                    columns=self.columns,
+                    sql=self.sql,
+                    parameters=self.parameters,
+                    conflict_columns=self.conflict_columns,
+                )
+            else:
+                rows_written = upsert_from_query(
+                    target_conn,
+                    self.table,
+                    columns=self.columns,
+                    sql=self.sql,
+                    parameters=self.parameters,
+                    conflict_columns=self.conflict_columns,
+                    update_columns=self.update_columns,
+                    fingerprint=self.fingerprint,
+                )
+            metrics.rows_written = rows_written
+        self.log.info('Loaded %s rows into %s inside %s', rows_written, self.table, self.target_conn_id)
+        return rows_written
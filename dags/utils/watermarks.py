@@ -0,0 +1,63 @@
+WATERMARK_TABLE = 'etl_watermarks'
+
+# Timestamp watermarks are read from this far behind, so rows loaded late (e.g. an upserted
+# attempt or a report inserted a day after the session) are still picked up.
+LATE_ROW_LOOKBACK = '3 days'
+
+# Lower bound of the rows past a timestamp watermark, for queries bound to %(watermark)s and %(lookback)s.
+SINCE = "coalesce(%(watermark)s::timestamp - %(lookback)s::interval, '-infinity')"
+
+
+def create_watermark_table(pg_cursor):
+    pg_cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} (
+            dag_id text not null,
+            source text not null,
+            watermark text,
+            updated_at timestamp not null default now(),
+            PRIMARY KEY (dag_id, source)
+        );
+    ''')
+
+
+def get_watermark(pg_conn, dag_id, source, bootstrap_query=None):
+    """
+    High watermark of dag_id's incremental extraction from source, stored as text (an id or a timestamp).
+
+    When no watermark has been stored yet, it is seeded from bootstrap_query (e.g. the max id
+    already present in the result table) so switching a DAG to incremental extraction does not
+    reload what it loaded before.
+    """
+    pg_cursor = pg_conn.cursor()
+    create_watermark_table(pg_cursor)
+    pg_cursor.execute(
+        f'select watermark from {WATERMARK_TABLE} where dag_id = %s and source = %s;', (dag_id, source))
+    row = pg_cursor.fetchone()
+    if row is None and bootstrap_query:
+        pg_cursor.execute(bootstrap_query)
+        row = pg_cursor.fetchone()
+    pg_conn.commit()
+    pg_cursor.close()
+    return None if row is None or row[0] is None else str(row[0])
+
+
+def advance_watermark(pg_cursor, dag_id, source, watermark, cast=None):
+    """
+    Store a new high watermark for dag_id and source.
+
+    Runs on the caller's cursor, so committing it together with the load makes the watermark
+    advance only when the rows beyond the old one were loaded. None leaves the watermark as is.
+    With cast (e.g. 'timestamp') the stored and new watermarks are compared as that type and the
+    later one is kept, so rows re-read within LATE_ROW_LOOKBACK never move the watermark back.
+    """
+    if watermark is None:
+        return
+    new_watermark = 'EXCLUDED.watermark'
+    if cast:
+        new_watermark = f'greatest({WATERMARK_TABLE}.watermark::{cast}, EXCLUDED.watermark::{cast})::text'
+    create_watermark_table(pg_cursor)
+    pg_cursor.execute(
+        f'INSERT INTO {WATERMARK_TABLE} (dag_id, source, watermark, updated_at) values (%s, %s, %s, now()) '
+        f'on conflict (dag_id, source) do update set watermark = {new_watermark}, updated_at = now();',
+        (dag_id, source, str(watermark))
+    )
@@ -0,0 +1,268 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+
+from airflow.configuration import conf
+from airflow.exceptions import AirflowException, AirflowSkipException
+from airflow.models.xcom import BaseXCom
+
+# Settings live in the [columnar_xcom] section, e.g. AIRFLOW__COLUMNAR_XCOM__BASE_PATH=s3://bucket/xcom.
+CONFIG_SECTION = 'columnar_xcom'
+DEFAULT_SIZE_THRESHOLD_BYTES = 1 << 20
+# Offloaded payloads older than this are deleted by purge_expired_payloads; longer than any DAG run and its retries.
+DEFAULT_RETENTION_DAYS = 7
+DEFAULT_AWS_CONN_ID = 's3_aws_credentials'
+DEFAULT_BATCH_SIZE = 50000
+
+REFERENCE_MARKER = '__columnar_xcom__'
+JSON_COLUMNS_METADATA_KEY = b'columnar_xcom_json_columns'
+SIZE_SAMPLE_ROWS = 100
+
+log = logging.getLogger(__name__)
+
+
+def _base_path():
+    # The task pulling an XCom may run on another worker than the one that pushed it, so the
+    # payloads must live where every worker can read them; a worker's own disk never qualifies.
+    base_path = conf.get(CONFIG_SECTION, 'base_path', fallback='').rstrip('/')
+    if not base_path.startswith('s3://') and (
+            not os.path.isabs(base_path) or base_path.startswith(tempfile.gettempdir())):
+        raise AirflowException(
+            f'[{CONFIG_SECTION}] base_path must be an s3:// prefix or a directory on a volume mounted on '
+            f'every worker, got {base_path!r}')
+    return base_path
+
+
+def _size_threshold():
+    return conf.getint(CONFIG_SECTION, 'size_threshold_bytes', fallback=DEFAULT_SIZE_THRESHOLD_BYTES)
+
+
+def _retention_days():
+    return conf.getint(CONFIG_SECTION, 'retention_days', fallback=DEFAULT_RETENTION_DAYS)
+
+
+def _aws_conn_id():
+    return conf.get(CONFIG_SECTION, 'aws_conn_id', fallback=DEFAULT_AWS_CONN_ID)
+
+
+def _split_s3_path(path):
+    bucket_name, _, key = path[len('s3://'):].partition('/')
+    return bucket_name, key
+
+
+def _path_part(value):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(value))
+
+
+def _is_row_list(value):
+    return isinstance(value, (list, tuple)) and len(value) > 0 and all(
+        isinstance(row, (list, tuple)) for row in value[:SIZE_SAMPLE_ROWS])
+
+
+def _estimated_size(value):
+    import pandas as pd
+
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if _is_row_list(value):
+        sample = value[:SIZE_SAMPLE_ROWS]
+        sample_size = len(json.dumps(list(sample), default=str))
+        return sample_size * len(value) // len(sample)
+    return 0
+
+
+def _rows_to_table(rows):
+    import pyarrow as pa
+
+    number_of_columns = max(len(row) for row in rows)
+    arrays = []
+    json_columns = []
+    for column in range(number_of_columns):
+        values = [row[column] if column < len(row) else None for row in rows]
+        if any(isinstance(value, (dict, list)) for value in values):
+            # Nested json values would be coerced to one struct type; keep them as json text.
+            values = [None if value is None else json.dumps(value) for value in values]
+            json_columns.append(column)
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if value is None else str(value) for value in values]))
+    table = pa.Table.from_arrays(arrays, names=[f'c{column}' for column in range(number_of_columns)])
+    return table.replace_schema_metadata({JSON_COLUMNS_METADATA_KEY: json.dumps(json_columns).encode()})
+
+
+def _write_table(table, path):
+    import pyarrow.parquet as pq
+
+    if not path.startswith('s3://'):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pq.write_table(table, path)
+        return
+
+    from airflow.providers.amazon.aws.hooks.s3 import S3Hook
+
+    bucket_name, key = _split_s3_path(path)
+    with tempfile.NamedTemporaryFile(suffix='.parquet') as local_file:
+        pq.write_table(table, local_file.name)
+        S3Hook(aws_conn_id=_aws_conn_id()).load_file(
+            filename=local_file.name, key=key, bucket_name=bucket_name, replace=True)
+
+
+def _open_parquet(path):
+    import pyarrow.parquet as pq
+
+    if not path.startswith('s3://'):
+        return pq.ParquetFile(path)
+
+    from airflow.providers.amazon.aws.hooks.s3 import S3Hook
+
+    bucket_name, key = _split_s3_path(path)
+    local_path = S3Hook(aws_conn_id=_aws_conn_id()).download_file(
+        key=key, bucket_name=bucket_name, local_path=tempfile.gettempdir())
+    # The open file outlives its directory entry, so the download is gone once the reader is.
+    local_file = open(local_path, 'rb')
+    os.remove(local_path)
+    return pq.ParquetFile(local_file)
+
+
+class ColumnarXComRows:
+    """
+    Lazy view of a list of rows offloaded to a Parquet file.
+
+    Iterating decodes one record batch at a time, so a consumer such as bulk_upsert never holds
+    more than batch_size rows in memory. len() reads the row count from the file footer, indexing
+    loads every row once.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._parquet_file = None
+        self._rows = None
+
+    @property
+    def parquet_file(self):
+        if self._parquet_file is None:
+            self._parquet_file = _open_parquet(self.path)
+        return self._parquet_file
+
+    def iter_batches(self, batch_size=None):
+        metadata = self.parquet_file.schema_arrow.metadata or {}
+        json_columns = json.loads(metadata.get(JSON_COLUMNS_METADATA_KEY, b'[]'))
+        for batch in self.parquet_file.iter_batches(batch_size=batch_size or self.batch_size):
+            columns = [column.to_pylist() for column in batch.columns]
+            for column in json_columns:
+                columns[column] = [None if value is None else json.loads(value) for value in columns[column]]
+            yield list(zip(*columns))
+
+    def __iter__(self):
+        if self._rows is not None:
+            return iter(self._rows)
+        return (row for batch in self.iter_batches() for row in batch)
+
+    def __len__(self):
+        return self.parquet_file.metadata.num_rows
+
+    def __getitem__(self, index):
+        if self._rows is None:
+            self._rows = [row for batch in self.iter_batches() for row in batch]
+        return self._rows[index]
+
+    def __repr__(self):
+        return f'ColumnarXComRows({self.path!r})'
+
+
+class ColumnarXComBackend(BaseXCom):
+    """
+    XCom backend that keeps large payloads out of the metadata database.
+
+    DataFrames and lists of rows (e.g. PostgresOperator results) whose estimated size is above
+    [columnar_xcom] size_threshold_bytes are written to a Parquet file under
+    [columnar_xcom] base_path, a local directory or an s3:// prefix, and only a reference to the
+    file is stored in the xcom table. Smaller values are stored as usual.
+
+    Pulling an offloaded DataFrame returns the DataFrame, pulling offloaded rows returns a
+    ColumnarXComRows that reads them lazily in record batches. Payloads older than
+    [columnar_xcom] retention_days are deleted by xcom_payload_cleanup_dag.
+
+    Enable it with AIRFLOW__CORE__XCOM_BACKEND=utils.xcom_backend.ColumnarXComBackend together
+    with AIRFLOW__COLUMNAR_XCOM__BASE_PATH; without a shared base_path every XCom push fails.
+    """
+
+    @staticmethod
+    def serialize_value(value, *, key=None, task_id=None, dag_id=None, run_id=None, map_index=None, **kwargs):
+        base_path = _base_path()
+        table = None
+        if _estimated_size(value) > _size_threshold():
+            import pandas as pd
+            import pyarrow as pa
+
+            kind = 'dataframe' if isinstance(value, pd.DataFrame) else 'rows'
+            try:
+                table = pa.Table.from_pandas(value) if kind == 'dataframe' else _rows_to_table(value)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Values Arrow cannot type (e.g. mixed object columns) stay in the metadata db.
+                pass
+        if table is not None:
+            path = '/'.join([
+                base_path,
+                _path_part(dag_id),
+                _path_part(run_id),
+                _path_part(task_id),
+                f'{_path_part(map_index)}_{_path_part(key)}_{uuid.uuid4().hex}.parquet',
+            ])
+            _write_table(table, path)
+            value = {REFERENCE_MARKER: path, 'kind': kind, 'num_rows': table.num_rows}
+        return BaseXCom.serialize_value(
+            value, key=key, task_id=task_id, dag_id=dag_id, run_id=run_id, map_index=map_index)
+
+    @staticmethod
+    def deserialize_value(result):
+        value = BaseXCom.deserialize_value(result)
+        if not isinstance(value, dict) or REFERENCE_MARKER not in value:
+            return value
+        if value['kind'] == 'dataframe':
+            return _open_parquet(value[REFERENCE_MARKER]).read().to_pandas()
+        return ColumnarXComRows(value[REFERENCE_MARKER])
+
+
+def purge_expired_payloads(retention_days=None, **kwargs):
+    """
+    PythonOperator callable deleting the payloads under base_path written more than
+    retention_days ([columnar_xcom] retention_days) ago. Returns the number of files deleted.
+    Skipped on deployments that do not offload XComs.
+    """
+    if not conf.get(CONFIG_SECTION, 'base_path', fallback=''):
+        raise AirflowSkipException(f'[{CONFIG_SECTION}] base_path is not set, no XCom payloads are offloaded')
+    base_path = _base_path()
+    cutoff = time.time() - int(retention_days or _retention_days()) * 24 * 60 * 60
+    if base_path.startswith('s3://'):
+        from airflow.providers.amazon.aws.hooks.s3 import S3Hook
+
+        s3_hook = S3Hook(aws_conn_id=_aws_conn_id())
+        bucket_name, prefix = _split_s3_path(f'{base_path}/')
+        pages = s3_hook.get_conn().get_paginator('list_objects_v2').paginate(Bucket=bucket_name, Prefix=prefix)
+        expired = [
+            s3_object['Key'] for page in pages for s3_object in page.get('Contents', [])
+            if s3_object['LastModified'].timestamp() < cutoff
+        ]
+        # DeleteObjects takes at most 1000 keys per request.
+        for start in range(0, len(expired), 1000):
+            s3_hook.delete_objects(bucket=bucket_name, keys=expired[start:start + 1000])
+    else:
+        expired = []
+        for directory, _, file_names in os.walk(base_path, topdown=False):
+            for file_name in file_names:
+                path = os.path.join(directory, file_name)
+                if file_name.endswith('.parquet') and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    expired.append(path)
+            if directory != base_path and not os.listdir(directory):
+                os.rmdir(directory)
+    log.info('Deleted %s offloaded XCom payloads older than %s under %s',
+             len(expired), time.strftime('%Y-%m-%d %H:%M', time.gmtime(cutoff)), base_path)
+    return len(expired)
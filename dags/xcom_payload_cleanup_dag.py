@@ -0,0 +1,25 @@
+from airflow import DAG
+from airflow.operators.python import PythonOperator
+from datetime import datetime
+from utils.xcom_backend import purge_expired_payloads
+
+default_args = {
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'start_date': datetime(2024, 1, 1),
+}
+
+dag = DAG(
+    'xcom_payload_cleanup_dag',
+    default_args=default_args,
+    description='Deletes the XCom payloads offloaded by ColumnarXComBackend once they are past retention',
+    schedule_interval='0 6 * * *',
+    catchup=False,
+    max_active_runs=1,
+)
+
+purge_expired_xcom_payloads = PythonOperator(
+    task_id='purge_expired_xcom_payloads',
+    python_callable=purge_expired_payloads,
+    dag=dag
+)
@@ -0,0 +1,409 @@
+"""
+Suggest indexes for the result database tables from the SQL the DAGs run against them.
+
+Every SQL string in the DAG files and every result-db query of the table specs is scanned for
+the columns its ON and WHERE clauses compare with = / IN or a range operator, per result table
+(a table some create_table task creates). Each ON or WHERE clause gives one candidate index per
+table, equality columns first. Candidates already served by an index, or by a wider candidate
+on the same table, are dropped.
+
+With --dsn the existing indexes are read from the database, together with the seq-scan counts
+of pg_stat_user_tables: only tables with at least --min-seq-scans sequential scans and
+--min-rows live rows get suggestions, the most scanned first, and invalid indexes left behind by
+a failed CREATE INDEX CONCURRENTLY are reported. Without it the primary keys of the CREATE
+TABLE statements and the existing migrations stand in for the indexes and every table is listed.
+
+--write appends the suggestions to dags/index_migrations/<table>.sql, which the create_table
+tasks apply (see utils.indexes).
+
+    python tools/index_advisor.py [--dsn postgresql://...] [--min-seq-scans 100] [--min-rows 10000]
+        [--table lecture_engagement_time ...] [--write]
+"""
+import argparse
+import ast
+import os
+import re
+import sys
+from collections import defaultdict
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAGS_FOLDER = os.path.join(ROOT, 'dags')
+sys.path.insert(0, DAGS_FOLDER)
+
+from utils.indexes import MIGRATION_DIRECTORY, create_index_statement, index_migrations  # noqa: E402
+
+RESULT_CONN_ID = 'postgres_result_db'
+MAX_INDEX_COLUMNS = 4
+
+TOKEN = re.compile(r'''
+    (?P<string>'(?:[^']|'')*')
+  | (?P<comment>--[^\n]*)
+  | (?P<param>%\(\w+\)s|%s)
+  | (?P<quoted>"[^"]*")
+  | (?P<name>[A-Za-z_][A-Za-z0-9_$]*(?:\.[A-Za-z_][A-Za-z0-9_$]*)*)
+  | (?P<number>\d+(?:\.\d+)?)
+  | (?P<operator><=|>=|<>|!=|::|[=<>(),;])
+  | (?P<other>\S)
+''', re.VERBOSE)
+
+CLAUSE_STARTS = {'on', 'where'}
+CLAUSE_ENDS = {
+    'join', 'left', 'right', 'inner', 'full', 'cross', 'where', 'group', 'order', 'limit', 'having',
+    'union', 'except', 'intersect', 'window', 'returning', 'on', 'select', 'from',
+}
+EQUALITY = {'=', 'in'}
+RANGE = {'<', '>', '<=', '>=', 'between'}
+KEYWORDS = {
+    'and', 'or', 'not', 'in', 'is', 'null', 'like', 'ilike', 'between', 'true', 'false', 'case', 'when',
+    'then', 'else', 'end', 'select', 'distinct', 'interval', 'exists', 'any', 'all', 'as', 'on', 'where',
+    'from', 'join', 'left', 'right', 'inner', 'full', 'cross', 'outer', 'group', 'order', 'by', 'limit',
+    'having', 'union', 'with', 'lateral', 'using', 'current_date', 'now', 'date', 'filter', 'over',
+}
+
+CREATE_TABLE = re.compile(r'create\s+(?:unlogged\s+)?table\s+if\s+not\s+exists\s+(\w+)\s*\((.*?)\)\s*;?\s*$',
+                          re.IGNORECASE | re.DOTALL)
+
+
+def tokenize(sql):
+    tokens = []
+    for match in TOKEN.finditer(sql):
+        kind = match.lastgroup
+        if kind in ('comment', 'string', 'param', 'number'):
+            tokens.append((kind, None))
+        elif kind == 'quoted':
+            tokens.append(('name', match.group().strip('"').lower()))
+        else:
+            tokens.append((kind, match.group().lower()))
+    return tokens
+
+
+def _aliases(tokens):
+    aliases = {}
+    for position, (kind, value) in enumerate(tokens[:-1]):
+        if value not in ('from', 'join') or tokens[position + 1][0] != 'name':
+            continue
+        table = tokens[position + 1][1].split('.')[-1]
+        aliases[table] = table
+        following = tokens[position + 2:position + 4]
+        if following and following[0][1] == 'as' and len(following) > 1 and following[1][0] == 'name':
+            aliases[following[1][1]] = table
+        elif following and following[0][0] == 'name' and following[0][1] not in KEYWORDS:
+            aliases[following[0][1]] = table
+    return aliases
+
+
+def predicate_columns(sql):
+    """
+    The (table, [(column, 'eq' or 'range'), ...]) of every ON and WHERE clause of sql, tables
+    as written (aliases resolved), the columns of each table in the order they appear.
+    """
+    tokens = tokenize(sql)
+    aliases = _aliases(tokens)
+    clauses = []
+    # One frame per parenthesis; a subquery's frame stops its clauses from reaching the outer one.
+    stack = [{'subquery': True, 'clause': None, 'tables': []}]
+
+    def query_frame():
+        return next(frame for frame in reversed(stack) if frame['subquery'])
+
+    def clause_frame():
+        for frame in reversed(stack):
+            if frame['clause'] is not None:
+                return frame
+            if frame['subquery']:
+                return None
+
+    def close_clause(frame):
+        if frame['clause'] is not None:
+            clauses.append((frame['clause'], query_frame_of(frame)['tables']))
+            frame['clause'] = None
+
+    def query_frame_of(frame):
+        index = stack.index(frame)
+        return next(stack[position] for position in range(index, -1, -1) if stack[position]['subquery'])
+
+    for position, (kind, value) in enumerate(tokens):
+        previous = tokens[position - 1][1] if position else None
+        following = tokens[position + 1][1] if position + 1 < len(tokens) else None
+        if value == '(':
+            # An aggregate's FILTER (WHERE ...) filters rows already read, it is no index candidate.
+            stack.append({
+                'subquery': following in ('select', 'with') or previous == 'filter',
+                'filter': previous == 'filter',
+                'clause': None,
+                'tables': [],
+            })
+        elif value == ')':
+            if len(stack) > 1:
+                close_clause(stack[-1])
+                stack.pop()
+        elif kind == 'name' and value in CLAUSE_STARTS:
+            if stack[-1].get('filter'):
+                continue
+            frame = clause_frame() or stack[-1]
+            close_clause(frame)
+            stack[-1]['clause'] = []
+        elif kind == 'name' and value in CLAUSE_ENDS:
+            frame = clause_frame()
+            if frame is not None and (value != 'select' or frame is stack[-1]):
+                close_clause(frame)
+            if value in ('from', 'join') and following and tokens[position + 1][0] == 'name':
+                query_frame()['tables'].append(following.split('.')[-1])
+        elif kind == 'name' and value not in KEYWORDS and previous != '::' and following != '(':
+            frame = clause_frame()
+            if frame is None:
+                continue
+            if following in EQUALITY or previous in EQUALITY:
+                operator = 'eq'
+            elif following in RANGE or previous in RANGE:
+                operator = 'range'
+            else:
+                continue
+            frame['clause'].append((value, operator))
+    for frame in stack:
+        close_clause(frame)
+
+    result = []
+    for references, tables in clauses:
+        columns = defaultdict(list)
+        for reference, operator in references:
+            if '.' in reference:
+                alias, column = reference.rsplit('.', 1)
+                table = aliases.get(alias.split('.')[-1])
+            elif len(set(tables)) == 1:
+                table, column = tables[0], reference
+            else:
+                continue
+            if table is not None and (column, operator) not in columns[table] \
+                    and column not in [known for known, _ in columns[table]]:
+                columns[table].append((column, operator))
+        result.extend(columns.items())
+    return result
+
+
+def _string_value(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        # f-strings: the interpolated parts become placeholders that parse like a parameter.
+        return ''.join(
+            part.value if isinstance(part, ast.Constant) else '%s' for part in node.values)
+    return None
+
+
+def _looks_like_sql(text):
+    lowered = text.lower()
+    return ('select' in lowered and 'from' in lowered) or 'create table' in lowered
+
+
+def collect_sql(dags_folder=DAGS_FOLDER):
+    """[(source, sql)] of every SQL string in the DAG files and the result-db SQL of the specs."""
+    statements = []
+    for file_name in sorted(os.listdir(dags_folder)):
+        if not file_name.endswith('.py'):
+            continue
+        with open(os.path.join(dags_folder, file_name)) as dag_file:
+            tree = ast.parse(dag_file.read(), file_name)
+        for node in ast.walk(tree):
+            text = _string_value(node)
+            if text and _looks_like_sql(text):
+                statements.append((file_name, text))
+    spec_folder = os.path.join(dags_folder, 'table_specs')
+    for file_name in sorted(os.listdir(spec_folder)):
+        if not file_name.endswith(('.yaml', '.yml')):
+            continue
+        with open(os.path.join(spec_folder, file_name)) as spec_file:
+            spec = yaml.safe_load(spec_file)
+        statements.append((file_name, spec['create_table']))
+        if spec['source']['conn_id'] == RESULT_CONN_ID:
+            statements.append((file_name, spec['source']['sql']))
+            if spec.get('sharding'):
+                statements.append((file_name, spec['sharding']['cost_query']))
+        if spec.get('prune') and spec['source']['conn_id'] == RESULT_CONN_ID:
+            statements.append((file_name, spec['prune']['key_query']))
+    return statements
+
+
+def declared_tables(statements):
+    """{table: [primary key columns]} of the CREATE TABLE IF NOT EXISTS statements."""
+    tables = {}
+    for _, sql in statements:
+        for statement in sql.split(';'):
+            match = CREATE_TABLE.search(statement.strip() + ';')
+            if not match or 'unlogged' in statement.lower():
+                continue
+            body = match.group(2)
+            primary_key = re.search(r'primary\s+key\s*\(([^)]*)\)', body, re.IGNORECASE)
+            if primary_key:
+                columns = [column.strip().lower() for column in primary_key.group(1).split(',')]
+            else:
+                columns = [
+                    line.split()[0].lower() for line in body.split(',')
+                    if re.search(r'\bprimary\s+key\b', line, re.IGNORECASE) and line.split()
+                ]
+            tables[match.group(1).lower()] = columns
+    return tables
+
+
+def candidates(statements, tables):
+    """{(table, columns): set of sources} of the index candidates on the result tables."""
+    found = defaultdict(set)
+    for source, sql in statements:
+        if re.search(r'^\s*create\s', sql, re.IGNORECASE) and 'select' not in sql.lower():
+            continue
+        for table, columns in predicate_columns(sql):
+            if table not in tables:
+                continue
+            ordered = [column for column, operator in columns if operator == 'eq']
+            ordered += [column for column, operator in columns if operator == 'range']
+            if ordered:
+                found[(table, tuple(ordered[:MAX_INDEX_COLUMNS]))].add(source)
+    return found
+
+
+def serves(index_columns, columns):
+    """Whether an index on index_columns serves a lookup on columns (its leading columns)."""
+    return len(index_columns) >= len(columns) and set(index_columns[:len(columns)]) == set(columns)
+
+
+def existing_indexes_from_files(tables):
+    indexes = defaultdict(list)
+    for table, primary_key in tables.items():
+        if primary_key:
+            indexes[table].append(tuple(primary_key))
+        for statement in index_migrations(table):
+            match = re.search(r'\bon\s+\w+\s*\(([^)]*)\)', statement, re.IGNORECASE)
+            if match:
+                indexes[table].append(tuple(column.strip() for column in match.group(1).split(',')))
+    return indexes
+
+
+def existing_indexes_from_database(pg_cursor):
+    pg_cursor.execute('''
+        select t.relname, i.relname, ix.indisvalid, array_agg(a.attname order by k.ordinality)
+        from pg_index ix
+        join pg_class t on t.oid = ix.indrelid
+        join pg_class i on i.oid = ix.indexrelid
+        join pg_namespace n on n.oid = t.relnamespace and n.nspname = 'public'
+        cross join lateral unnest(ix.indkey) with ordinality as k (attnum, ordinality)
+        join pg_attribute a on a.attrelid = t.oid and a.attnum = k.attnum
+        group by 1,2,3;
+    ''')
+    indexes = defaultdict(list)
+    invalid = []
+    for table, index, valid, columns in pg_cursor.fetchall():
+        if valid:
+            indexes[table].append(tuple(columns))
+        else:
+            invalid.append((table, index))
+    return indexes, invalid
+
+
+def table_stats(pg_cursor):
+    pg_cursor.execute('''
+        select relname, seq_scan, seq_tup_read, coalesce(idx_scan, 0), n_live_tup
+        from pg_stat_user_tables
+        where schemaname = 'public';
+    ''')
+    return {
+        table: {'seq_scan': seq_scan, 'seq_tup_read': seq_tup_read, 'idx_scan': idx_scan, 'n_live_tup': rows}
+        for table, seq_scan, seq_tup_read, idx_scan, rows in pg_cursor.fetchall()
+    }
+
+
+def advise(found, indexes, stats=None, min_seq_scans=0, min_rows=0):
+    """[(table, columns, sources)] of the candidates to create, the most seq-scanned tables first."""
+    suggestions = []
+    for (table, columns), sources in found.items():
+        if any(serves(index_columns, columns) for index_columns in indexes.get(table, [])):
+            continue
+        # A wider candidate on the same table serves this one as well.
+        if any(other_table == table and other_columns != columns and serves(other_columns, columns)
+               for other_table, other_columns in found):
+            continue
+        if stats is not None:
+            table_stat = stats.get(table)
+            if table_stat is None or table_stat['seq_scan'] < min_seq_scans or table_stat['n_live_tup'] < min_rows:
+                continue
+        suggestions.append((table, columns, sorted(sources)))
+
+    def order(suggestion):
+        seq_tup_read = (stats or {}).get(suggestion[0], {}).get('seq_tup_read', 0)
+        return (-seq_tup_read, suggestion[0], suggestion[1])
+
+    return sorted(suggestions, key=order)
+
+
+def write_migrations(suggestions, directory=MIGRATION_DIRECTORY):
+    by_table = defaultdict(list)
+    for table, columns, sources in suggestions:
+        by_table[table].append((columns, sources))
+    os.makedirs(directory, exist_ok=True)
+    for table, table_suggestions in sorted(by_table.items()):
+        path = os.path.join(directory, f'{table}.sql')
+        existing = set(index_migrations(table, directory))
+        lines = []
+        for columns, sources in table_suggestions:
+            statement = create_index_statement(table, columns)
+            if statement not in existing:
+                lines.append(f"-- {', '.join(sources)}")
+                lines.append(statement)
+        if not lines:
+            continue
+        new_file = not os.path.exists(path)
+        with open(path, 'a') as migration_file:
+            if new_file:
+                migration_file.write(
+                    f'-- Indexes of {table}, applied by its create_table task (utils.indexes).\n')
+            migration_file.write('\n'.join(lines) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dsn', help='result database to read indexes and pg_stat_user_tables from')
+    parser.add_argument('--min-seq-scans', type=int, default=100)
+    parser.add_argument('--min-rows', type=int, default=10000)
+    parser.add_argument('--table', nargs='+', help='only these result tables')
+    parser.add_argument('--write', action='store_true', help='append the suggestions to dags/index_migrations')
+    args = parser.parse_args()
+
+    statements = collect_sql()
+    tables = declared_tables(statements)
+    if args.table:
+        tables = {table: tables[table] for table in args.table if table in tables}
+    found = candidates(statements, tables)
+
+    stats = None
+    invalid = []
+    if args.dsn:
+        import psycopg2
+
+        pg_conn = psycopg2.connect(args.dsn)
+        try:
+            pg_cursor = pg_conn.cursor()
+            indexes, invalid = existing_indexes_from_database(pg_cursor)
+            stats = table_stats(pg_cursor)
+        finally:
+            pg_conn.close()
+        suggestions = advise(found, indexes, stats, args.min_seq_scans, args.min_rows)
+    else:
+        suggestions = advise(found, existing_indexes_from_files(tables))
+
+    for table, index in invalid:
+        print(f'-- invalid index on {table}, drop it so IF NOT EXISTS can rebuild it:')
+        print(f'DROP INDEX CONCURRENTLY IF EXISTS {index};')
+    for table, columns, sources in suggestions:
+        table_stat = (stats or {}).get(table)
+        if table_stat:
+            print(f"-- {table}: {table_stat['seq_scan']} seq scans, {table_stat['seq_tup_read']} rows read "
+                  f"sequentially, {table_stat['idx_scan']} index scans, {table_stat['n_live_tup']} rows")
+        print(f"-- {', '.join(sources)}")
+        print(create_index_statement(table, columns))
+    if args.write:
+        write_migrations(suggestions)
+
+
+if __name__ == '__main__':
+    main()
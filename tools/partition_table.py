@@ -0,0 +1,52 @@
+"""
+Convert an existing unpartitioned result table into the range partitioned table its create_table
+task now declares (see utils.partitions.convert_to_partitioned).
+
+The create_table tasks never convert a table themselves: they fail while it is unpartitioned.
+Pause the DAGs writing to the table, run this once, then unpause them; the next create_table run
+adds the table's indexes. The conversion is one transaction holding an ACCESS EXCLUSIVE lock on
+the table while its rows are copied. It refuses to start when views, foreign keys, triggers or
+policies depend on the table, listing them, and it gives up rather than queue behind a running
+load when the lock is not granted within --lock-timeout.
+
+    python tools/partition_table.py --dsn postgresql://... --table lecture_engagement_time --column join_time
+        [--lock-timeout 10s]
+"""
+import argparse
+import logging
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'dags'))
+
+from utils.partitions import convert_to_partitioned, partition_key  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dsn', required=True, help='result database')
+    parser.add_argument('--table', required=True)
+    parser.add_argument('--column', required=True, help='partition key, as in the PARTITION BY RANGE of create_table')
+    parser.add_argument('--lock-timeout', default='10s')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    import psycopg2
+
+    pg_conn = psycopg2.connect(args.dsn)
+    try:
+        pg_cursor = pg_conn.cursor()
+        pg_cursor.execute("select set_config('lock_timeout', %s, true);", (args.lock_timeout,))
+        if partition_key(pg_cursor, args.table) is not None:
+            sys.exit(f'{args.table} is already partitioned')
+        convert_to_partitioned(pg_cursor, args.table, args.column)
+        pg_conn.commit()
+    except ValueError as error:
+        sys.exit(str(error))
+    finally:
+        pg_conn.close()
+
+
+if __name__ == '__main__':
+    main()